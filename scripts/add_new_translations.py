@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
 """
 批量添加新的翻译键到所有语言文件
+
+prune_keys.py 删掉、英文也没有再加回的键会被跳过。
 """
 
 import os
 import re
 
+from translation_sources import load_pruned_keys, skip_pruned, source_keys
+
 # 新增的翻译键
 NEW_TRANSLATIONS = {
     'socialShare': {
@@ -475,11 +479,11 @@ def format_section(section_name, translations):
     lines.append("  },")
     return '\n'.join(lines)
 
-def add_translations_to_file(filepath, lang):
+def add_translations_to_file(filepath, lang, new_translations=NEW_TRANSLATIONS):
     """Add new translations to a language file"""
     content = read_file(filepath)
     
-    for section_name, section_data in NEW_TRANSLATIONS.items():
+    for section_name, section_data in new_translations.items():
         if lang not in section_data:
             continue
         
@@ -517,10 +521,20 @@ def main():
     base_path = '/home/ubuntu/follow-ai-source/follow.ai/src/i18n/locales'
     languages = ['en', 'zh', 'ja', 'ko', 'es', 'fr', 'de', 'pt', 'ru', 'ar']
     
+    # Skip keys prune_keys.py removed, unless en has them again
+    pruned = load_pruned_keys()
+    present = source_keys(os.path.join(base_path, 'en.ts'))
+    new_translations = {}
+    for section_name, section_data in NEW_TRANSLATIONS.items():
+        for lang, keys in section_data.items():
+            kept = skip_pruned(keys, section_name, pruned, present)
+            if kept:
+                new_translations.setdefault(section_name, {})[lang] = kept
+    
     for lang in languages:
         filepath = os.path.join(base_path, f'{lang}.ts')
         if os.path.exists(filepath):
-            add_translations_to_file(filepath, lang)
+            add_translations_to_file(filepath, lang, new_translations)
         else:
             print(f"File not found: {filepath}")
 
@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
 """
 批量添加翻译到所有语言文件
+
+prune_keys.py 删掉、英文也没有再加回的键会被跳过。
 """
 
 import os
 import re
 
+from translation_sources import load_pruned_keys, skip_pruned, source_keys
+
 # 翻译数据 - 所有需要添加的翻译键
 TRANSLATIONS = {
     # NotificationCenter 组件
@@ -2063,10 +2067,20 @@ def main():
     
     print("开始批量添加翻译...")
     
+    # 去掉已被 prune_keys.py 删除的键，空的部分整个跳过
+    pruned = load_pruned_keys()
+    present = source_keys(os.path.join(base_path, LANG_FILES["en"]))
+    translations = {}
+    for section_name, section_data in TRANSLATIONS.items():
+        for lang, keys in section_data.items():
+            kept = skip_pruned(keys, section_name, pruned, present)
+            if kept:
+                translations.setdefault(section_name, {})[lang] = kept
+    
     for lang, file_name in LANG_FILES.items():
         file_path = os.path.join(base_path, file_name)
         print(f"\n处理语言: {lang}")
-        add_translations_to_file(file_path, lang, TRANSLATIONS)
+        add_translations_to_file(file_path, lang, translations)
     
     print("\n翻译添加完成！")
 
@@ -1,11 +1,27 @@
 #!/usr/bin/env python3
 """
 批量为组件添加翻译支持
+
+用法:
+    python scripts/batch_translate_components.py
+    python scripts/batch_translate_components.py --since origin/main   # 只处理改动过的组件
+    python scripts/batch_translate_components.py --shard 2/4   # CI 分片：处理并索引第 2 片的文件
+    python scripts/batch_translate_components.py merge         # 合并各分片的部分索引为全局调用位置索引
+
+分片按文件路径的稳定哈希划分，与机器和文件列出顺序无关；每个分片写出一个部分索引，
+收集齐后由 merge 合并。
 """
 
+import argparse
 import os
 import re
 
+from git_changes import changed_since
+from i18n_config import REPO_ROOT, SRC_DIR
+from key_index import KeyIndex, load_partials, merge_partials, shard_of, write_partial
+from scan_cache import ScanCache, find_source_files
+from tsx_scanner import calls_t, find_components, has_translator, match_brackets, tokenize
+
 def read_file(filepath):
     with open(filepath, 'r', encoding='utf-8') as f:
         return f.read()
@@ -16,7 +32,7 @@ def write_file(filepath, content):
 
 def add_translation_import(content):
     """Add useLanguage import if not present"""
-    if 'useLanguage' in content:
+    if re.search(r"import\s*\{[^}]*\buseLanguage\b", content):
         return content
     
     # Find the last import statement
@@ -31,67 +47,147 @@ def add_translation_import(content):
     
     return content
 
+HOOK = "const { t } = useLanguage();"
+BODY_INDENT = re.compile(r'[ \t]*\n([ \t]+)\S')
+
+def body_indent(content, pos):
+    """Indentation of the first non-blank line after pos, default two spaces"""
+    match = BODY_INDENT.match(content, pos)
+    return match.group(1) if match else '  '
+
 def add_translation_hook(content):
-    """Add useLanguage hook in component if not present"""
-    if "const { t } = useLanguage();" in content:
-        return content
+    """Add useLanguage hook to every component that calls t() without one
+
+    Uses a bracket-aware token scan, so helpers declared before the
+    component and several components per file are handled.
+    """
+    tokens = tokenize(content)
+    matches = match_brackets(tokens)
+    edits = []
+    
+    for component in find_components(tokens, matches):
+        if not calls_t(tokens, component.start, component.end) or has_translator(tokens, component):
+            continue
+        
+        if component.body_open is not None:
+            brace = tokens[component.body_open]
+            indent = body_indent(content, brace.end)
+            edits.append((brace.end, brace.end, f"\n{indent}{HOOK}"))
+            continue
+        
+        # 表达式体的箭头函数 `=> ( ... )`：改写成带 return 的函数体
+        paren = component.body_start
+        if tokens[paren].value != '(' or paren not in matches:
+            print(f"  Needs manual hook: expression-bodied {component.name} without parentheses")
+            continue
+        open_pos = tokens[paren].start
+        close_pos = tokens[matches[paren]].end
+        edits.append((open_pos, open_pos, f"{{\n  {HOOK}\n  return "))
+        edits.append((close_pos, close_pos, ";\n}"))
     
-    # Find the component function and add hook after first line
-    # Look for patterns like: const ComponentName: React.FC = () => {
-    # or: const ComponentName = () => {
-    # or: function ComponentName() {
-    
-    patterns = [
-        r'(const \w+:\s*React\.FC[^=]*=\s*\([^)]*\)\s*=>\s*\{)',
-        r'(const \w+\s*=\s*\([^)]*\)\s*=>\s*\{)',
-        r'(function \w+\([^)]*\)\s*\{)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, content)
-        if match:
-            insert_pos = match.end()
-            hook = "\n  const { t } = useLanguage();"
-            content = content[:insert_pos] + hook + content[insert_pos:]
-            break
+    for start, end, text in sorted(edits, reverse=True):
+        content = content[:start] + text + content[end:]
     
     return content
 
 def process_component(filepath):
     """Process a single component file"""
-    content = read_file(filepath)
+    original = read_file(filepath)
     
-    # Skip if already has useLanguage
-    if 'useLanguage' in content:
-        print(f"Skipped (already has i18n): {filepath}")
+    # Add hook to each component that needs it
+    content = add_translation_hook(original)
+    
+    # Skip if no hook could be injected
+    if content == original:
+        print(f"Skipped (needs manual hook): {filepath}")
         return False
     
     # Add import
     content = add_translation_import(content)
     
-    # Add hook
-    content = add_translation_hook(content)
-    
     write_file(filepath, content)
     print(f"Updated: {filepath}")
     return True
 
+COMPONENTS_DIR = os.path.join(SRC_DIR, 'components')
+
+def shard_spec(text):
+    """Parse 'i/N' (1-based) for --shard"""
+    try:
+        shard, count = (int(part) for part in text.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected i/N, got {text!r}")
+    if not 1 <= shard <= count:
+        raise argparse.ArgumentTypeError(f"shard must be between 1 and N, got {text!r}")
+    return shard, count
+
+def in_shard(filepath, shard):
+    return shard is None or shard_of(os.path.relpath(filepath, REPO_ROOT), shard[1]) == shard[0]
+
+def index_shard(cache, shard):
+    """Index this shard's share of src and write it as a partial index"""
+    shard_paths = [path for path in find_source_files() if in_shard(path, shard)]
+    index = KeyIndex()
+    index.update(cache, shard_paths)
+    filepath = write_partial(index, *shard)
+    print(f"Partial index for shard {shard[0]}/{shard[1]}: {len(index.files)} files -> {filepath}")
+
+def merge(filepaths):
+    index = merge_partials(load_partials(filepaths))
+    index.save()
+    index.export()
+    print(f"Merged: {len(index.sites)} keys in {len(index.files)} files")
+
 def main():
-    components_dir = '/home/ubuntu/follow-ai-source/follow.ai/src/components'
+    parser = argparse.ArgumentParser(description='Add useLanguage to components that call t()')
+    parser.add_argument('--since', metavar='REF', help='only components changed since this git ref')
+    parser.add_argument('--shard', type=shard_spec, metavar='i/N', help='only this shard of the files (CI)')
+    sub = parser.add_subparsers(dest='command')
+    merge_parser = sub.add_parser('merge', help='merge the partial indexes of all shards into the key index')
+    merge_parser.add_argument('partials', nargs='*', help='partial index files (default: all in the cache)')
+    args = parser.parse_args()
+    
+    if args.command == 'merge':
+        merge(args.partials)
+        return
+    
+    components_dir = COMPONENTS_DIR
     
     # Get all tsx files
-    files = [f for f in os.listdir(components_dir) if f.endswith('.tsx')]
+    if args.since:
+        # 只取组件目录下一层、且自 ref 以来改动过的文件
+        changed = changed_since(args.since, ('.tsx',), components_dir)[0]
+        files = [os.path.basename(path) for path in changed if os.path.dirname(path) == components_dir]
+    else:
+        files = [f for f in os.listdir(components_dir) if f.endswith('.tsx')]
+    files = [f for f in files if in_shard(os.path.join(components_dir, f), args.shard)]
     
     updated = 0
     skipped = 0
+    cache = ScanCache()
     
     for filename in sorted(files):
         filepath = os.path.join(components_dir, filename)
+        # 缓存的扫描结果显示没有组件需要 hook 时，不必重新读取和改写
+        facts = cache.facts(filepath)
+        for line in facts['stray_t']:
+            print(f"  Needs manual hook: {filepath}:{line}: t() outside a recognised component")
+        components = facts['components']
+        if not any(component['needs_hook'] for component in components):
+            reason = 'already has i18n' if any(component['calls_t'] for component in components) else 'no t() calls'
+            print(f"Skipped ({reason}): {filepath}")
+            skipped += 1
+            continue
         if process_component(filepath):
             updated += 1
         else:
             skipped += 1
     
+    # 改写之后再索引，部分索引反映的是 codemod 后的文件
+    if args.shard:
+        index_shard(cache, args.shard)
+    cache.save()
+    
     print(f"\nSummary: {updated} updated, {skipped} skipped")
 
 if __name__ == '__main__':
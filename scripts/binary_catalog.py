@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+把语言文件导出为可 mmap 的二进制目录，查询时二分查找键，无需重新解析 TypeScript
+
+文件布局（小端）：
+    header   magic 'FAIC' | version u32 | count u32 | source hash 16 bytes
+    table    count × (key_off u32, key_len u32, value_off u32, value_len u32)，按键的 UTF-8 字节排序
+    blob     所有键和值的 UTF-8 字节，偏移量相对 blob 起点
+"""
+
+import argparse
+import mmap
+import os
+import struct
+
+from i18n_config import LANGUAGES, cache_path, locale_path
+from locale_parser import file_hash, read_locale
+
+MAGIC = b'FAIC'
+VERSION = 1
+HEADER = struct.Struct('<4sII16s')
+RECORD = struct.Struct('<IIII')
+
+
+def binary_path(lang):
+    return cache_path('bin', f'{lang}.bin')
+
+
+def write_binary(filepath, flat, source_hash):
+    """Write a {path: value} map as a sorted binary catalog"""
+    items = sorted((path.encode('utf-8'), value.encode('utf-8')) for path, value in flat.items())
+
+    table = bytearray()
+    blob = bytearray()
+    for key, value in items:
+        key_off = len(blob)
+        blob += key
+        value_off = len(blob)
+        blob += value
+        table += RECORD.pack(key_off, len(key), value_off, len(value))
+
+    header = HEADER.pack(MAGIC, VERSION, len(items), bytes.fromhex(source_hash))
+    tmp_path = filepath + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(table)
+        f.write(blob)
+    os.replace(tmp_path, filepath)
+
+
+def read_header(filepath):
+    """Return (count, source hash) or None if the file is missing or not a catalog"""
+    try:
+        with open(filepath, 'rb') as f:
+            data = f.read(HEADER.size)
+    except FileNotFoundError:
+        return None
+    if len(data) < HEADER.size:
+        return None
+    magic, version, count, digest = HEADER.unpack(data)
+    if magic != MAGIC or version != VERSION:
+        return None
+    return count, digest.hex()
+
+
+def ensure_binary(lang):
+    """Regenerate lang's binary catalog if the locale file hash changed; return its path"""
+    source = locale_path(lang)
+    target = binary_path(lang)
+    source_hash = file_hash(source)
+    header = read_header(target)
+    if header is None or header[1] != source_hash:
+        write_binary(target, read_locale(source).flat(), source_hash)
+        print(f"Rebuilt: {target}")
+    return target
+
+
+class BinaryCatalog:
+    """Read-only mmap view of a binary catalog; keys are binary-searched, values decoded on demand"""
+
+    def __init__(self, filepath):
+        self.file = open(filepath, 'rb')
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count, digest = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"not a binary catalog: {filepath}")
+        self.source_hash = digest.hex()
+        self.blob_start = HEADER.size + self.count * RECORD.size
+
+    @classmethod
+    def open(cls, lang):
+        return cls(ensure_binary(lang))
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def _record(self, index):
+        return RECORD.unpack_from(self.data, HEADER.size + index * RECORD.size)
+
+    def _bytes(self, offset, length):
+        start = self.blob_start + offset
+        return self.data[start:start + length]
+
+    def _search(self, key):
+        """Index of the first record whose key is >= key"""
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            key_off, key_len, _, _ = self._record(mid)
+            if self._bytes(key_off, key_len) < key:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def get(self, path, default=None):
+        key = path.encode('utf-8')
+        index = self._search(key)
+        if index < self.count:
+            key_off, key_len, value_off, value_len = self._record(index)
+            if self._bytes(key_off, key_len) == key:
+                return self._bytes(value_off, value_len).decode('utf-8')
+        return default
+
+    def __contains__(self, path):
+        return self.get(path) is not None
+
+    def keys(self, prefix=''):
+        """Key paths in sorted order, optionally limited to a prefix"""
+        key = prefix.encode('utf-8')
+        index = self._search(key)
+        while index < self.count:
+            key_off, key_len, _, _ = self._record(index)
+            raw = self._bytes(key_off, key_len)
+            if not raw.startswith(key):
+                break
+            yield raw.decode('utf-8')
+            index += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Binary locale catalogs')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('build', help='rebuild catalogs whose locale file changed')
+    get = sub.add_parser('get', help='look up one key')
+    get.add_argument('lang')
+    get.add_argument('path')
+    keys = sub.add_parser('keys', help='list keys under a prefix')
+    keys.add_argument('lang')
+    keys.add_argument('prefix', nargs='?', default='')
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        for lang in LANGUAGES:
+            if os.path.exists(locale_path(lang)):
+                ensure_binary(lang)
+    elif args.command == 'get':
+        with BinaryCatalog.open(args.lang) as catalog:
+            value = catalog.get(args.path)
+            print(value if value is not None else f"Missing: {args.path}")
+    else:
+        with BinaryCatalog.open(args.lang) as catalog:
+            for path in catalog.keys(args.prefix):
+                print(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+生成发布用的语言包：把回退链预先合并进每个语言
+
+缺失（或为空）的键按 i18n_config.FALLBACKS 的顺序从回退语言取值，
+产物里的每个语言包都是完整的，读取方不需要再链式查第二个语言。
+输出按顶层分区切块：BUNDLE_DIR/{lang}/{section}.json（嵌套结构，各块合并后与
+getNestedTranslation 兼容）及 manifest.json。与上次构建结果做 locale_diff，
+只重写有键变化的分块。
+
+这里只生成产物，应用本身的 t()（LanguageContext）仍然直接读取 src/i18n 打包进来的
+TS 语言对象、只回退到 en。产物供按需加载的读取方使用：BUNDLE_DIR 在 public/ 下，
+由静态服务器发布为 /locales/，读取方先取 manifest.json（含各分块哈希，可用于缓存失效），
+再按需取 /locales/{lang}/{section}.json 并合并。LanguageContext 接入这套加载是待办项，
+见 todo.md 的 Phase 19。
+
+用法:
+    python scripts/build_bundles.py
+    python scripts/build_bundles.py --fallback pt=es,en --out dist/locales
+    python scripts/build_bundles.py --full     # 忽略上次结果，重写所有分块
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+
+from i18n_config import BUNDLE_DIR, LANGUAGES, REPO_ROOT, SOURCE_LANG, cache_path, fallback_chain
+from locale_diff import changed_paths, diff_flats
+from locale_parser import load_locales, unflatten
+
+STATE_VERSION = 1
+ROOT_CHUNK = '_root'
+
+
+def merge_fallbacks(flats, lang, chain):
+    """(merged flat map, {fallback lang: values taken}) for one locale
+
+    Keys follow the source language's order; keys only lang has come last.
+    """
+    own = flats.get(lang, {})
+    order = list(flats.get(SOURCE_LANG, {}))
+    order.extend(path for path in own if path not in flats.get(SOURCE_LANG, {}))
+
+    merged = {}
+    used = {}
+    for path in order:
+        value = own.get(path)
+        if not value:
+            for fallback in chain:
+                value = flats.get(fallback, {}).get(path)
+                if value:
+                    used[fallback] = used.get(fallback, 0) + 1
+                    break
+        if value:
+            merged[path] = value
+    return merged, used
+
+
+def render_bundle(flat):
+    return json.dumps(unflatten(flat), ensure_ascii=False, separators=(',', ':')) + '\n'
+
+
+def chunk_of(path):
+    section, dot, _ = path.partition('.')
+    return section if dot else ROOT_CHUNK
+
+
+def split_chunks(flat):
+    chunks = {}
+    for path, value in flat.items():
+        chunks.setdefault(chunk_of(path), {})[path] = value
+    return chunks
+
+
+def write_if_changed(filepath, content):
+    """Write content unless the file already holds it; returns True if written"""
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            if f.read() == content:
+                return False
+    except FileNotFoundError:
+        pass
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return True
+
+
+def state_path():
+    return cache_path('bundle-state.pickle')
+
+
+def load_state(out_dir):
+    """Merged flats and chunk hashes of the last build into out_dir"""
+    try:
+        with open(state_path(), 'rb') as f:
+            state = pickle.load(f)
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+        return {}
+    if state.get('version') != STATE_VERSION or state.get('out_dir') != os.path.abspath(out_dir):
+        return {}
+    return state['bundles']
+
+
+def save_state(out_dir, bundles):
+    tmp_path = state_path() + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(
+            {'version': STATE_VERSION, 'out_dir': os.path.abspath(out_dir), 'bundles': bundles},
+            f, protocol=pickle.HIGHEST_PROTOCOL,
+        )
+    os.replace(tmp_path, state_path())
+
+
+def write_chunks(lang_dir, merged, previous, full=False):
+    """Rewrite the chunks whose keys changed since previous; returns ({chunk: hash}, rewritten count)"""
+    chunks = split_chunks(merged)
+    if previous is None or full or not os.path.isdir(lang_dir):
+        dirty = set(chunks) | set(previous['hashes'] if previous else ())
+        hashes = {}
+    else:
+        dirty = {chunk_of(path) for path in changed_paths(diff_flats(previous['flat'], merged))}
+        hashes = dict(previous['hashes'])
+    os.makedirs(lang_dir, exist_ok=True)
+
+    rewritten = 0
+    # 之前构建留下、本次已不存在的分块
+    for filename in os.listdir(lang_dir):
+        if filename.endswith('.json') and filename[:-len('.json')] not in chunks:
+            dirty.add(filename[:-len('.json')])
+    for chunk in dirty:
+        filepath = os.path.join(lang_dir, f'{chunk}.json')
+        if chunk not in chunks:
+            hashes.pop(chunk, None)
+            if os.path.exists(filepath):
+                os.remove(filepath)
+            continue
+        content = render_bundle(chunks[chunk])
+        hashes[chunk] = hashlib.blake2b(content.encode('utf-8'), digest_size=8).hexdigest()
+        rewritten += write_if_changed(filepath, content)
+    return hashes, rewritten
+
+
+def build(out_dir=BUNDLE_DIR, chains=None, full=False):
+    """Emit every locale's chunks; returns {lang: (own values, {fallback lang: count}, chunks rewritten)}"""
+    chains = chains or {}
+    flats = {lang: parsed.flat() for lang, parsed in load_locales().items()}
+    previous = load_state(out_dir)
+    os.makedirs(out_dir, exist_ok=True)
+
+    report = {}
+    manifest = {}
+    bundles = {}
+    for lang in LANGUAGES:
+        if lang not in flats:
+            continue
+        chain = chains.get(lang, fallback_chain(lang))
+        merged, used = merge_fallbacks(flats, lang, chain)
+        hashes, rewritten = write_chunks(os.path.join(out_dir, lang), merged, previous.get(lang), full)
+        legacy = os.path.join(out_dir, f'{lang}.json')
+        if os.path.exists(legacy):
+            # 分块之前的单文件语言包
+            os.remove(legacy)
+            rewritten += 1
+        bundles[lang] = {'flat': merged, 'hashes': hashes}
+        manifest[lang] = {
+            'keys': len(merged),
+            'fallback': chain,
+            'chunks': dict(sorted(hashes.items())),
+        }
+        report[lang] = (len(merged) - sum(used.values()), used, rewritten)
+
+    write_if_changed(
+        os.path.join(out_dir, 'manifest.json'),
+        json.dumps(manifest, ensure_ascii=False, indent=2) + '\n',
+    )
+    save_state(out_dir, bundles)
+    return report
+
+
+def parse_chains(specs):
+    chains = {}
+    for spec in specs:
+        lang, sep, chain = spec.partition('=')
+        if not sep or lang not in LANGUAGES:
+            raise SystemExit(f"Invalid fallback (expected lang=a,b): {spec}")
+        chain = [fallback for fallback in chain.split(',') if fallback]
+        chains[lang] = chain if SOURCE_LANG in chain or lang == SOURCE_LANG else chain + [SOURCE_LANG]
+    return chains
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build locale bundles with fallbacks pre-merged')
+    parser.add_argument('--out', default=BUNDLE_DIR, help='output directory')
+    parser.add_argument('--fallback', action='append', default=[], metavar='LANG=A,B',
+                        help='override the fallback chain of one language (repeatable)')
+    parser.add_argument('--full', action='store_true', help='rewrite every chunk')
+    args = parser.parse_args()
+
+    report = build(args.out, parse_chains(args.fallback), args.full)
+    total = 0
+    for lang, (own, used, rewritten) in report.items():
+        taken = sum(used.values())
+        total += taken
+        detail = ', '.join(f'{count} from {fallback}' for fallback, count in used.items())
+        status = f'Updated {rewritten} chunks' if rewritten else 'Unchanged'
+        print(f"{status}: {lang} — {own} own values{', ' + detail if detail else ''}")
+    print(f"{total} values filled from fallback locales ({os.path.relpath(args.out, REPO_ROOT)})")
+
+
+if __name__ == '__main__':
+    main()
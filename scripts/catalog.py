@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+紧凑的内存翻译目录 - 键路径只驻留一次，每个语言的值按键序号对齐存放在列表里
+"""
+
+import sys
+
+
+class CatalogEntry:
+    """A lightweight handle on one key of a Catalog"""
+
+    __slots__ = ('catalog', 'index')
+
+    def __init__(self, catalog, index):
+        self.catalog = catalog
+        self.index = index
+
+    @property
+    def path(self):
+        return self.catalog.paths[self.index]
+
+    def get(self, lang):
+        return self.catalog.columns[lang][self.index]
+
+    def values(self):
+        """All languages for this key, skipping the ones that lack it"""
+        return self.catalog.column(self.path)
+
+    def __repr__(self):
+        return f"CatalogEntry({self.path!r})"
+
+
+class Catalog:
+    """Key paths interned once, values stored per language aligned by key index
+
+    row(lang) gives every key of one language, column(path) gives every
+    language of one key. Missing values are stored as None.
+    """
+
+    __slots__ = ('paths', 'index', 'columns')
+
+    def __init__(self, languages=()):
+        self.paths = []
+        self.index = {}
+        self.columns = {}
+        for lang in languages:
+            self.add_language(lang)
+
+    @classmethod
+    def from_slices(cls, slices):
+        """Build from a {lang: {'section.key': value}} map (see translation_sources)"""
+        catalog = cls(slices)
+        for lang, entries in slices.items():
+            for path, value in entries.items():
+                catalog.set(path, lang, value)
+        return catalog
+
+    @property
+    def languages(self):
+        return list(self.columns)
+
+    def add_language(self, lang):
+        if lang not in self.columns:
+            self.columns[lang] = [None] * len(self.paths)
+        return self.columns[lang]
+
+    def key_index(self, path):
+        """Return the index of path, interning it if it is new"""
+        index = self.index.get(path)
+        if index is None:
+            index = len(self.paths)
+            path = sys.intern(path)
+            self.paths.append(path)
+            self.index[path] = index
+            for values in self.columns.values():
+                values.append(None)
+        return index
+
+    def set(self, path, lang, value):
+        index = self.key_index(path)
+        self.add_language(lang)[index] = sys.intern(value) if value is not None else None
+
+    def get(self, path, lang, default=None):
+        index = self.index.get(path)
+        if index is None or lang not in self.columns:
+            return default
+        value = self.columns[lang][index]
+        return default if value is None else value
+
+    def entry(self, path):
+        index = self.index.get(path)
+        return None if index is None else CatalogEntry(self, index)
+
+    def column(self, path):
+        """All languages for one key: {lang: value}"""
+        index = self.index.get(path)
+        if index is None:
+            return {}
+        return {
+            lang: values[index]
+            for lang, values in self.columns.items()
+            if values[index] is not None
+        }
+
+    def row(self, lang):
+        """All keys for one language, in key order: iterator of (path, value)"""
+        values = self.columns.get(lang, ())
+        return ((path, value) for path, value in zip(self.paths, values) if value is not None)
+
+    def missing(self, lang):
+        """Key paths that have no value in lang"""
+        values = self.columns.get(lang)
+        if values is None:
+            return list(self.paths)
+        return [path for path, value in zip(self.paths, values) if value is None]
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __contains__(self, path):
+        return path in self.index
+
+    def __iter__(self):
+        return (CatalogEntry(self, index) for index in range(len(self.paths)))
+
+
+def main():
+    from translation_sources import load_language_slices
+
+    catalog = Catalog.from_slices(load_language_slices())
+    print(f"{len(catalog)} keys, {len(catalog.languages)} languages")
+    for lang in catalog.languages:
+        print(f"  {lang}: {len(catalog.missing(lang))} missing")
+
+
+if __name__ == '__main__':
+    main()
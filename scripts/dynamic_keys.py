@@ -0,0 +1,613 @@
+#!/usr/bin/env python3
+"""
+动态翻译键的静态分析：t(`reviews.${cat}`)、t(rarityKey)、t(tab.labelKey) 等
+
+在单个文件内做轻量的常量传播：
+  - const X = 'a' / `p.${y}` / ['a', 'b'] / { k: 'a' }，以及之后的 X = … 重新赋值
+  - type X = 'a' | 'b'，以及参数 cat: X
+  - ARRAY.map((x) => …) 和 for (const x of ARRAY) 的元素
+  - 本地对象字面量或其数组元素的属性 item.prop（对象里不能有展开）
+  - 其余的 item.prop：文件内的类型只把 prop 声明为字面量联合（prop: 'a' | 'b'）时取该联合
+能枚举出来的得到确定的键集合，只能确定前缀的得到键路径前缀，都不能的记为未解析。
+
+绑定按名字而不是按作用域记录，因此宁可少解析也不能漏报：同名的普通参数、解构、
+x += … 等无法追踪的绑定会让这个名字整体不可解析；任一取值不是字面量的数组、对象
+或属性也不可解析；item.prop 只在 item 确定绑定到本地字面量、或 prop 的每一处出现都是
+字面量联合类型声明（或联合内的字面量）时才解析，不按对象里的 prop: 值全文件匹配。
+模板字符串此时退化为它的静态前缀。
+"""
+
+import re
+
+from tsx_scanner import OPENERS, match_brackets, string_value, t_calls, template_parts
+
+IDENT_EXPR = re.compile(r'^[A-Za-z_$][\w$]*$')
+MEMBER_EXPR = re.compile(r'^([A-Za-z_$][\w$]*)\??\.([A-Za-z_$][\w$]*)$')
+INDEX_EXPR = re.compile(r'^([A-Za-z_$][\w$]*)\[.*\]$', re.S)
+ITERATORS = frozenset(['map', 'forEach', 'filter', 'flatMap', 'some', 'every', 'find'])
+DECLARATIONS = ('const', 'let', 'var')
+CONTROL_KEYWORDS = frozenset(['if', 'for', 'while', 'switch', 'catch', 'with', 'return', 'typeof', 'await', 'function'])
+COMPOUND_OPERATORS = frozenset('+-*/%&|^?')
+# 字面量之后出现这些记号说明表达式到此为止
+TERMINATORS = frozenset([';', ',', ')', ']', '}', ':'])
+
+# 枚举组合的上限，超过后退化为前缀
+MAX_EXPANSION = 256
+
+
+class Resolved:
+    """Possible string values of an expression: exact values and key-path prefixes"""
+
+    __slots__ = ('values', 'prefixes')
+
+    def __init__(self, values=(), prefixes=()):
+        self.values = set(values)
+        self.prefixes = set(prefixes)
+
+    def merge(self, other):
+        self.values |= other.values
+        self.prefixes |= other.prefixes
+        return self
+
+    def __bool__(self):
+        return bool(self.values or self.prefixes)
+
+
+def is_ternary(arg, position):
+    """Whether arg[position] is the '?' of a conditional (not ?. or ??)"""
+    if arg[position].value != '?':
+        return False
+    before = arg[position - 1].value if position else ''
+    after = arg[position + 1].value if position + 1 < len(arg) else ''
+    return before != '?' and after not in ('.', '?')
+
+
+def argument_tokens(tokens, matches, open_index):
+    """Tokens of the first argument of the call whose '(' is at open_index"""
+    close = matches.get(open_index)
+    if close is None:
+        return []
+    end = open_index + 1
+    while end < close and tokens[end].value != ',':
+        end = matches.get(end, end) + 1 if tokens[end].value in OPENERS else end + 1
+    # 模板字符串内部表达式的 token 紧跟在模板 token 之后，这里去掉
+    arg = []
+    for token in tokens[open_index + 1:end]:
+        if not (arg and arg[-1].kind == 'template' and token.start < arg[-1].end):
+            arg.append(token)
+    return arg
+
+
+class _Analyzer:
+    def __init__(self, tokens, matches):
+        self.tokens = tokens
+        self.matches = matches
+        self.bindings = {}   # name → [token index of the bound expression | Resolved | (kind, name or index)]
+        self.openers = {close: open_index for open_index, close in matches.items()}
+        self.opaque = set()  # names also bound where values cannot be followed (parameters, destructuring, x += …)
+        self.elements = set()  # token indexes of .map((x) => …) / for-of parameters
+        self.resolving = set()
+        self.collect()
+        self.collect_opaque()
+
+    def bind(self, name, source):
+        self.bindings.setdefault(name, []).append(source)
+
+    def skip(self, index):
+        """Index after the token at index, jumping over a bracketed group"""
+        if self.tokens[index].value in OPENERS and index in self.matches:
+            return self.matches[index] + 1
+        return index + 1
+
+    def item_end(self, index, close, stops=(',',)):
+        """Index of the first top-level token in stops (or close) from index on"""
+        while index < close and self.tokens[index].value not in stops:
+            index = self.skip(index)
+        return min(index, close)
+
+    def collect(self):
+        tokens = self.tokens
+        for index, token in enumerate(tokens[:-2]):
+            nxt = tokens[index + 1]
+            if token.kind != 'name':
+                continue
+
+            if token.value in DECLARATIONS and nxt.kind == 'name':
+                after = tokens[index + 2]
+                if after.value == '=':
+                    self.bind(nxt.value, index + 3)
+                elif after.value == ':' and index + 4 < len(tokens) and tokens[index + 4].value == '=':
+                    # const x: Kind = …
+                    self.bind(nxt.value, index + 5)
+                elif after.value == 'of' and tokens[index + 3].kind == 'name':
+                    # for (const x of ARRAY)
+                    self.bind(nxt.value, ('element', tokens[index + 3].value))
+                    self.elements.add(index + 1)
+            elif token.value == 'type' and nxt.kind == 'name':
+                if tokens[index + 2].value == '=':
+                    union = self.string_union(index + 3)
+                    if union:
+                        self.bind(nxt.value, Resolved(union))
+            elif nxt.value == ':':
+                # 参数/变量类型 name: Alias / name: 'a' | 'b'
+                value = tokens[index + 2]
+                if value.kind == 'string' and index + 3 < len(tokens) and tokens[index + 3].value == '|':
+                    self.bind(token.value, Resolved(self.string_union(index + 2)))
+                elif value.kind == 'name' and value.value[:1].isupper():
+                    self.bind(token.value, ('alias', value.value))
+            elif token.value in ITERATORS and index > 1 and tokens[index - 1].value == '.' and nxt.value == '(':
+                # ARRAY.map((x) => …) 或 [ … ].map((x) => …)
+                receiver = tokens[index - 2]
+                if receiver.kind == 'name':
+                    source = ('element', receiver.value)
+                elif receiver.value == ']' and index - 2 in self.openers:
+                    source = ('element_at', self.openers[index - 2])
+                else:
+                    continue
+                param = index + 2
+                if tokens[param].value == '(' and param + 1 < len(tokens):
+                    param += 1
+                if tokens[param].kind == 'name':
+                    self.bind(tokens[param].value, source)
+                    self.elements.add(param)
+            elif nxt.value == '=' and tokens[index + 2].value not in ('=', '>') \
+                    and not (index and tokens[index - 1].value in ('.', ':', '<', 'type') + DECLARATIONS):
+                # 重新赋值 x = …：再多一个取值来源
+                self.bind(token.value, index + 2)
+
+    def collect_opaque(self):
+        """Mark names that are also bound in ways the analysis cannot follow
+
+        Bindings are per file, not per scope, so a plain parameter or a
+        destructured name makes every same-named binding in the file unresolvable.
+        """
+        tokens = self.tokens
+        for index, token in enumerate(tokens):
+            if token.kind == 'punct' and token.value == '(' and index in self.matches:
+                if self.is_parameter_list(index):
+                    self.opaque_parameters(index + 1, self.matches[index])
+            elif token.kind != 'name' or index + 1 >= len(tokens):
+                continue
+            elif tokens[index + 1].value == '=>' and index not in self.elements:
+                self.opaque.add(token.value)
+            elif token.value in DECLARATIONS:
+                nxt = index + 1
+                if tokens[nxt].value in ('{', '[') and nxt in self.matches:
+                    self.opaque_pattern(nxt)
+                elif tokens[nxt].kind == 'name' and nxt not in self.elements and (
+                        nxt + 1 >= len(tokens) or tokens[nxt + 1].value not in ('=', ':')):
+                    # let x; / for (const k in obj)
+                    self.opaque.add(tokens[nxt].value)
+            elif token.value == 'import' and tokens[index + 1].value != '(':
+                end = index + 1
+                while end < len(tokens) and tokens[end].value not in ('from', ';'):
+                    if tokens[end].kind == 'name':
+                        self.opaque.add(tokens[end].value)
+                    end += 1
+            elif index + 2 < len(tokens) and tokens[index + 1].value in COMPOUND_OPERATORS \
+                    and not (index and tokens[index - 1].value == '.'):
+                # x += …、x ??= …
+                end = index + 1
+                while end < len(tokens) and tokens[end].value in COMPOUND_OPERATORS:
+                    end += 1
+                if end < len(tokens) and tokens[end].value == '=' and end + 1 < len(tokens) \
+                        and tokens[end + 1].value != '=':
+                    self.opaque.add(token.value)
+
+    def is_parameter_list(self, open_index):
+        tokens = self.tokens
+        close = self.matches[open_index]
+        after = tokens[close + 1].value if close + 1 < len(tokens) else ''
+        if after == '=>':
+            return True
+        before = tokens[open_index - 1] if open_index else None
+        if before is not None and (before.value == 'function' or (
+                open_index > 1 and tokens[open_index - 2].value == 'function')):
+            return True
+        if after == ':':
+            # (…): ReturnType => …
+            index = close + 2
+            while index < len(tokens) and tokens[index].value not in ('=>', '{', ';', '=', ')', ','):
+                index = self.skip(index)
+            return index < len(tokens) and tokens[index].value == '=>'
+        # 方法简写 name(…) { … }
+        return after == '{' and before is not None and before.kind == 'name' and before.value not in CONTROL_KEYWORDS
+
+    def opaque_parameters(self, start, close):
+        tokens = self.tokens
+        while start < close:
+            end = self.item_end(start, close)
+            index = start
+            while index < end and tokens[index].value == '.':
+                index += 1
+            if index < end:
+                first = tokens[index]
+                if first.value in ('{', '[') and index in self.matches:
+                    self.opaque_pattern(index)
+                elif first.kind == 'name' and index not in self.elements and first.value != 'this':
+                    # 只有标注为字面量联合或类型别名、且没有默认值的参数才能追踪
+                    typed = index + 2 < end and tokens[index + 1].value == ':' and (
+                        tokens[index + 2].kind == 'string'
+                        or (tokens[index + 2].kind == 'name' and tokens[index + 2].value[:1].isupper()))
+                    defaulted = any(tokens[inner].value == '=' for inner in range(index + 1, end))
+                    if not typed or defaulted:
+                        self.opaque.add(first.value)
+            start = end + 1
+
+    def opaque_pattern(self, open_index):
+        for token in self.tokens[open_index + 1:self.matches[open_index]]:
+            if token.kind == 'name':
+                self.opaque.add(token.value)
+
+    def string_union(self, index):
+        """Strings of a `'a' | 'b' | …` sequence starting at index"""
+        tokens = self.tokens
+        values = set()
+        if index < len(tokens) and tokens[index].value == '|':
+            index += 1
+        while index < len(tokens) and tokens[index].kind == 'string':
+            values.add(string_value(tokens[index].value))
+            if index + 1 < len(tokens) and tokens[index + 1].value == '|':
+                index += 2
+            else:
+                break
+        return values
+
+    def ends_expression(self, index):
+        """Whether an expression may end right before token index (nothing like + x or .y follows)"""
+        if index >= len(self.tokens):
+            return True
+        token = self.tokens[index]
+        return token.kind != 'punct' or token.value in TERMINATORS
+
+    def literal_at(self, index):
+        """Resolve the expression starting at token index, if it is just that one literal or name"""
+        tokens = self.tokens
+        if index >= len(tokens):
+            return None
+        token = tokens[index]
+        end = index + 1
+        if token.kind == 'string':
+            resolved = Resolved([string_value(token.value)])
+        elif token.kind == 'template':
+            # 跳过模板内部表达式的 token
+            while end < len(tokens) and tokens[end].start < token.end:
+                end += 1
+            resolved = self.template(token.value)
+        elif token.kind == 'name':
+            resolved = self.name(token.value)
+            if end < len(tokens) and tokens[end].value == '[' and end in self.matches:
+                # LABELS[kind]
+                end = self.matches[end] + 1
+        elif token.value in ('[', '{') and index in self.matches:
+            end = self.matches[index] + 1
+            resolved = self.leaves(index)
+        else:
+            return None
+        return resolved if resolved and self.ends_expression(end) else None
+
+    def leaves(self, open_index):
+        """Values of an array or object literal; None if any element is not a literal"""
+        tokens = self.tokens
+        close = self.matches[open_index]
+        is_object = tokens[open_index].value == '{'
+        result = Resolved()
+        item = open_index + 1
+        while item < close:
+            value = item
+            if is_object:
+                value = self.item_end(item, close, (':', ','))
+                if value >= close or tokens[value].value != ':':
+                    # 简写属性、方法、展开
+                    return None
+                value += 1
+            resolved = self.literal_at(value)
+            if not resolved:
+                return None
+            result.merge(resolved)
+            item = self.item_end(value, close) + 1
+        return result or None
+
+    def name(self, name):
+        if name in self.opaque or name in self.resolving or name not in self.bindings:
+            return None
+        self.resolving.add(name)
+        result = Resolved()
+        try:
+            for source in self.bindings[name]:
+                if isinstance(source, Resolved):
+                    resolved = source
+                elif isinstance(source, tuple):
+                    resolved = self.literal_at(source[1]) if source[0] == 'element_at' else self.name(source[1])
+                else:
+                    resolved = self.literal_at(source)
+                if not resolved:
+                    return None
+                result.merge(resolved)
+        finally:
+            self.resolving.discard(name)
+        return result
+
+    def object_literals(self, name, element=False):
+        """Token indexes of the '{' of every object literal name is bound to
+
+        With element, of the objects in the array literals it is bound to
+        (for the parameter of ARRAY.map). None unless every binding is such
+        a literal with nothing spread into it.
+        """
+        if name in self.opaque or name in self.resolving or name not in self.bindings:
+            return None
+        self.resolving.add(name)
+        objects = []
+        try:
+            for source in self.bindings[name]:
+                if isinstance(source, int):
+                    found = self.literal_objects(source, element)
+                elif isinstance(source, tuple) and not element and source[0] == 'element':
+                    found = self.object_literals(source[1], element=True)
+                elif isinstance(source, tuple) and not element and source[0] == 'element_at':
+                    found = self.literal_objects(source[1], element=True, receiver=True)
+                else:
+                    found = None
+                if found is None:
+                    return None
+                objects.extend(found)
+        finally:
+            self.resolving.discard(name)
+        return objects
+
+    def literal_objects(self, index, element, receiver=False):
+        """['{' index] of the object literal at index, or of the elements of the array literal at index
+
+        receiver is set for `[ … ].map(…)`, where the literal is followed by the call.
+        """
+        tokens = self.tokens
+        opener = '[' if element else '{'
+        if index >= len(tokens) or tokens[index].value != opener or index not in self.matches:
+            return None
+        close = self.matches[index]
+        if not receiver and not self.ends_expression(close + 1):
+            return None
+        if not element:
+            return [index]
+        objects = []
+        item = index + 1
+        while item < close:
+            end = self.item_end(item, close)
+            if tokens[item].value != '{' or self.skip(item) != end:
+                # 展开、变量等非字面量元素
+                return None
+            objects.append(item)
+            item = end + 1
+        return objects
+
+    def properties(self, open_index):
+        """{property name: token index of its value} of an object literal; None if anything is spread"""
+        tokens = self.tokens
+        close = self.matches[open_index]
+        values = {}
+        item = open_index + 1
+        while item < close:
+            colon = self.item_end(item, close, (':', ','))
+            if colon >= close or tokens[colon].value != ':' or colon != item + 1:
+                # 展开、简写属性、方法、计算属性
+                return None
+            key = tokens[item]
+            name = string_value(key.value) if key.kind == 'string' else key.value
+            values[name] = colon + 1
+            item = self.item_end(colon + 1, close) + 1
+        return values
+
+    def field_union(self, prop):
+        """Values of a property the file's types declare only as string-literal unions
+
+        None unless some `prop: 'a' | 'b'` declaration exists and every other
+        `prop:` in the file is such a union or a single string literal; another
+        type (prop: string), a computed value or a shorthand `{ prop }` makes the
+        property unresolvable.
+        """
+        tokens = self.tokens
+        result = Resolved()
+        declared = False
+        for index, token in enumerate(tokens[:-1]):
+            if token.kind != 'name' or token.value != prop or (index and tokens[index - 1].value == '.'):
+                continue
+            colon = index + 2 if tokens[index + 1].value == '?' else index + 1
+            if colon < len(tokens) and tokens[colon].value == ':':
+                value = colon + 1
+                if value < len(tokens) and tokens[value].value == '|':
+                    value += 1
+                if value >= len(tokens) or tokens[value].kind != 'string':
+                    return None
+                if value + 1 < len(tokens) and tokens[value + 1].value == '|':
+                    result.merge(Resolved(self.string_union(value)))
+                    declared = True
+                else:
+                    resolved = self.literal_at(value)
+                    if not resolved:
+                        return None
+                    result.merge(resolved)
+            elif index and tokens[index - 1].value in ('{', ',') and tokens[index + 1].value in (',', '}'):
+                # 简写属性 { prop }：值来自同名变量
+                return None
+        return result if declared else None
+
+    def member(self, name, prop):
+        """Values of name.prop
+
+        From the object literals name is bound to when it is a local object or an
+        element of a local array of them; otherwise from the property's declared
+        string-literal union type, if the file has one.
+        """
+        objects = self.object_literals(name)
+        if objects is None:
+            return self.field_union(prop)
+        if not objects:
+            return None
+        result = Resolved()
+        for open_index in objects:
+            values = self.properties(open_index)
+            if values is None:
+                return None
+            if prop not in values:
+                continue
+            resolved = self.literal_at(values[prop])
+            if not resolved:
+                return None
+            result.merge(resolved)
+        return result or None
+
+    def expression(self, text):
+        text = text.strip()
+        if IDENT_EXPR.match(text):
+            return self.name(text)
+        match = MEMBER_EXPR.match(text)
+        if match:
+            return self.member(match.group(1), match.group(2))
+        match = INDEX_EXPR.match(text)
+        if match:
+            return self.name(match.group(1))
+        return None
+
+    def template(self, raw):
+        partials = ['']
+        for is_expression, text in template_parts(raw):
+            if not is_expression:
+                partials = [partial + text for partial in partials]
+                continue
+            resolved = self.expression(text)
+            if resolved and not resolved.prefixes and len(partials) * len(resolved.values) <= MAX_EXPANSION:
+                partials = [partial + value for partial in partials for value in resolved.values]
+                continue
+            prefixes = {partial for partial in partials if partial}
+            if resolved:
+                prefixes |= {partial + prefix for partial in partials for prefix in resolved.prefixes}
+            return Resolved(prefixes=prefixes) if prefixes else None
+        return Resolved(partials)
+
+    def argument(self, open_index):
+        """Resolve the first argument of the call whose '(' is at open_index"""
+        tokens = self.tokens
+        arg = argument_tokens(tokens, self.matches, open_index)
+        if not arg:
+            return None
+        # `x as const` / `x as TranslationKey`
+        if len(arg) >= 3 and arg[-2].value == 'as':
+            arg = arg[:-2]
+
+        if len(arg) == 1:
+            return self.literal_at(open_index + 1)
+        if any(is_ternary(arg, position) for position in range(len(arg))):
+            return self.ternary(arg)
+        source = ''.join(token.value for token in arg)
+        return self.expression(source)
+
+    def ternary(self, arg):
+        """Union of every branch of `a ? 'x' : b ? 'y' : z`; None if one branch is unknown"""
+        segments = [[]]
+        separators = []
+        depth = 0
+        for position, token in enumerate(arg):
+            if token.value in OPENERS:
+                depth += 1
+            elif token.value in (')', ']', '}'):
+                depth -= 1
+            if depth == 0 and (is_ternary(arg, position) or token.value == ':'):
+                separators.append(token.value)
+                segments.append([])
+            else:
+                segments[-1].append(token)
+        result = Resolved()
+        for position, segment in enumerate(segments):
+            # '?' 之前的是条件，不是取值
+            if position < len(separators) and separators[position] == '?':
+                continue
+            if len(segment) == 1:
+                resolved = self.literal_at(self.tokens.index(segment[0]))
+            else:
+                resolved = self.expression(''.join(token.value for token in segment))
+            if not resolved:
+                return None
+            result.merge(resolved)
+        return result or None
+
+
+def resolve_sites(tokens, matches=None):
+    """Yield (token index of the t, first argument token, Resolved or None) for every non-literal t() call"""
+    if matches is None:
+        matches = match_brackets(tokens)
+    analyzer = None
+    for index, arg in t_calls(tokens):
+        if arg.kind == 'string':
+            continue
+        if analyzer is None:
+            analyzer = _Analyzer(tokens, matches)
+        yield index, arg, analyzer.argument(index + 1)
+
+
+def analyze_dynamic_keys(tokens, lines, matches=None):
+    """Resolve every non-literal t() argument in a tokenized file
+
+    Returns {'keys': [...], 'prefixes': [...], 'unresolved': [(line, column, source)]}.
+    """
+    if matches is None:
+        matches = match_brackets(tokens)
+    keys = set()
+    prefixes = set()
+    unresolved = []
+
+    for index, arg, resolved in resolve_sites(tokens, matches):
+        if resolved:
+            keys |= resolved.values
+            prefixes |= resolved.prefixes
+        else:
+            line, column = lines.line_col(arg.start)
+            source = ' '.join(token.value for token in argument_tokens(tokens, matches, index + 1))
+            unresolved.append((line, column, source))
+
+    return {'keys': sorted(keys), 'prefixes': sorted(prefixes), 'unresolved': unresolved}
+
+
+def live_keys(results):
+    """Combine scan facts into (exact keys, key prefixes, unresolved sites) for the whole tree"""
+    keys = set()
+    prefixes = set()
+    unresolved = []
+    for relpath, facts in results.items():
+        keys.update(key for key, _, _ in facts['keys'])
+        keys.update(facts['dynamic']['keys'])
+        prefixes.update(facts['dynamic']['prefixes'])
+        unresolved.extend((relpath,) + site for site in facts['dynamic']['unresolved'])
+    return keys, prefixes, unresolved
+
+
+def is_live(path, keys, prefixes):
+    return path in keys or any(path.startswith(prefix) for prefix in prefixes)
+
+
+def main():
+    # 延迟导入：scan_cache 在扫描时会导入本模块
+    from scan_cache import ScanCache, find_source_files
+
+    cache = ScanCache()
+    results = cache.scan_many(find_source_files())
+    cache.save()
+
+    for relpath, facts in sorted(results.items()):
+        dynamic = facts['dynamic']
+        if not (dynamic['keys'] or dynamic['prefixes'] or dynamic['unresolved']):
+            continue
+        print(relpath)
+        for key in dynamic['keys']:
+            print(f"  key     {key}")
+        for prefix in dynamic['prefixes']:
+            print(f"  prefix  {prefix}*")
+        for line, column, source in dynamic['unresolved']:
+            print(f"  ??      {line}:{column} t({source})")
+
+    keys, prefixes, unresolved = live_keys(results)
+    print(f"\n{len(keys)} keys, {len(prefixes)} prefixes, {len(unresolved)} unresolved call sites")
+
+
+if __name__ == '__main__':
+    main()
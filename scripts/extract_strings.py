@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+找出组件里仍然硬编码的界面文字（JSX 文本节点和 placeholder / title / aria-label 等字符串属性），
+按组件分组并给出建议的翻译键。
+
+多进程并行扫描，结果通过 scan_cache 按文件内容哈希缓存。
+"""
+
+import argparse
+import json
+import os
+import re
+
+from git_changes import changed_since
+from i18n_config import SRC_DIR
+from scan_cache import ScanCache, find_source_files
+
+WORD = re.compile(r'[A-Za-z0-9]+')
+MAX_KEY_WORDS = 4
+
+
+def lower_camel(name):
+    return name[:1].lower() + name[1:]
+
+
+def propose_key(text, taken):
+    """camelCase key from the first few ASCII words of text, unique within taken"""
+    words = WORD.findall(text)[:MAX_KEY_WORDS]
+    base = ''.join(word.capitalize() if i else word.lower() for i, word in enumerate(words)) or 'text'
+    if base[0].isdigit():
+        base = 'text' + base
+    key = base
+    suffix = 2
+    while key in taken and taken[key] != text:
+        key = f'{base}{suffix}'
+        suffix += 1
+    taken[key] = text
+    return key
+
+
+def scan(paths, workers=None, untranslated=False):
+    """Hardcoded strings for every path via the shared scan cache: {relpath: [strings]}
+
+    untranslated keeps only files that do not import useLanguage.
+    """
+    cache = ScanCache()
+    results = cache.scan_many(paths, workers)
+    cache.save()
+    return {
+        relpath: facts['strings'] for relpath, facts in results.items()
+        if not (untranslated and facts['imports_use_language'])
+    }
+
+
+def group_proposals(results):
+    """{relpath: {component: {key: text}}} with keys proposed per component section"""
+    proposals = {}
+    for relpath in sorted(results):
+        components = {}
+        for item in results[relpath]:
+            component = item['component'] or os.path.splitext(os.path.basename(relpath))[0]
+            section = components.setdefault(component, {})
+            propose_key(item['text'], section)
+        if components:
+            proposals[relpath] = {
+                lower_camel(component): keys for component, keys in components.items()
+            }
+    return proposals
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find hardcoded UI strings in .tsx files')
+    parser.add_argument('paths', nargs='*', help='files to scan (default: all .tsx under src)')
+    parser.add_argument('--untranslated', action='store_true', help='only files that do not use useLanguage')
+    parser.add_argument('--json', help='write proposals to this JSON file')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--since', metavar='REF', help='only files changed since this git ref')
+    args = parser.parse_args()
+
+    if args.since:
+        paths = changed_since(args.since, ('.tsx',), SRC_DIR)[0]
+    else:
+        paths = [os.path.abspath(path) for path in args.paths] or find_source_files(extensions=('.tsx',))
+
+    proposals = group_proposals(scan(paths, args.workers, args.untranslated))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(proposals, f, ensure_ascii=False, indent=2)
+        print(f"Wrote: {args.json}")
+    else:
+        for relpath, sections in proposals.items():
+            print(relpath)
+            for section, keys in sections.items():
+                for key, text in keys.items():
+                    print(f"  {section}.{key}: {text!r}")
+
+    total = sum(len(keys) for sections in proposals.values() for keys in sections.values())
+    print(f"\n{total} strings in {len(proposals)} files")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+翻译记忆的模糊匹配：字符三元组倒排索引 + Dice 相似度
+
+'Start task' / 'Start Task'、'{count} minutes ago' / '{count} min ago' 这类近似原文，
+精确哈希查不到，这里按三元组重合度找出最接近的已有译文（前 k 个，高于阈值）。
+NumPy 是可选依赖：装了时用 bincount 向量化计分，否则退回纯 Python 计数，两种方式结果相同。
+
+用法:
+    python scripts/fuzzy_memory.py "Start Task" --lang de
+    python scripts/fuzzy_memory.py "{count} minutes ago" --lang pt -k 3 --threshold 0.4
+"""
+
+import argparse
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 是可选依赖
+    np = None
+
+from translation_memory import TranslationMemory
+
+
+def trigrams(text):
+    padded = f'  {" ".join(text.lower().split())} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class FuzzyIndex:
+    """Character-trigram index over source texts, scored by Dice coefficient"""
+
+    def __init__(self, texts):
+        self.texts = list(dict.fromkeys(texts))
+        self.vocabulary = {}
+        postings = []
+        sizes = []
+        for doc, text in enumerate(self.texts):
+            grams = trigrams(text)
+            sizes.append(len(grams))
+            for gram in grams:
+                gram_id = self.vocabulary.setdefault(gram, len(postings))
+                if gram_id == len(postings):
+                    postings.append([])
+                postings[gram_id].append(doc)
+
+        if np is not None:
+            self.postings = [np.asarray(docs, dtype=np.int32) for docs in postings]
+            self.sizes = np.asarray(sizes, dtype=np.float64)
+        else:
+            self.postings = postings
+            self.sizes = sizes
+
+    def __len__(self):
+        return len(self.texts)
+
+    def search(self, query, k=5, threshold=0.5, allowed=None):
+        """[(score, text)] for the k best matches scoring at least threshold
+
+        allowed optionally restricts results to a set of document indexes.
+        """
+        grams = [self.vocabulary[gram] for gram in trigrams(query) if gram in self.vocabulary]
+        query_size = len(trigrams(query))
+        if not grams or not self.texts:
+            return []
+
+        if np is not None:
+            overlap = np.bincount(np.concatenate([self.postings[g] for g in grams]), minlength=len(self.texts))
+            scores = 2.0 * overlap / (self.sizes + query_size)
+            # 与纯 Python 路径一致：只有共享三元组、且在 allowed 里的文档才算候选
+            mask = overlap > 0
+            if allowed is not None:
+                allowed_mask = np.zeros(len(self.texts), dtype=bool)
+                allowed_mask[list(allowed)] = True
+                mask &= allowed_mask
+            candidates = np.flatnonzero(mask & (scores >= threshold))
+            # 按分数、再按文档序号降序，平分时与 sorted(reverse=True) 取同样的前 k 个
+            candidates = candidates[np.lexsort((-candidates, -scores[candidates]))[:k]]
+            ranked = [(float(scores[doc]), int(doc)) for doc in candidates]
+        else:
+            overlap = Counter()
+            for gram in grams:
+                overlap.update(self.postings[gram])
+            ranked = sorted(
+                (
+                    (2.0 * count / (self.sizes[doc] + query_size), doc)
+                    for doc, count in overlap.items()
+                    if allowed is None or doc in allowed
+                ),
+                reverse=True,
+            )
+            ranked = [(score, doc) for score, doc in ranked[:k] if score >= threshold]
+
+        return [(score, self.texts[doc]) for score, doc in ranked]
+
+
+class FuzzyMemory:
+    """Fuzzy lookups over the translation memory: closest existing translations per target"""
+
+    def __init__(self, memory):
+        self.translations = {}
+        for source, target, translation in memory.entries():
+            self.translations.setdefault(source, {})[target] = translation
+        self.index = FuzzyIndex(self.translations)
+        self.by_target = {}
+        for doc, source in enumerate(self.index.texts):
+            for target in self.translations[source]:
+                self.by_target.setdefault(target, set()).add(doc)
+
+    def suggest(self, text, target, k=5, threshold=0.5):
+        """[(score, source, translation)] closest to text that have a translation in target"""
+        allowed = self.by_target.get(target)
+        if not allowed:
+            return []
+        return [
+            (score, source, self.translations[source][target])
+            for score, source in self.index.search(text, k, threshold, allowed)
+        ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fuzzy translation-memory suggestions')
+    parser.add_argument('text')
+    parser.add_argument('--lang', required=True)
+    parser.add_argument('-k', type=int, default=5)
+    parser.add_argument('--threshold', type=float, default=0.5)
+    args = parser.parse_args()
+
+    with TranslationMemory() as memory:
+        fuzzy = FuzzyMemory(memory)
+    print(f"{len(fuzzy.index)} source texts indexed ({'numpy' if np is not None else 'pure Python'})")
+    suggestions = fuzzy.suggest(args.text, args.lang, args.k, args.threshold)
+    for score, source, translation in suggestions:
+        print(f"  {score:.2f}  {source}  →  {translation}")
+    if not suggestions:
+        print(f"No suggestions above {args.threshold}")
+
+
+if __name__ == '__main__':
+    main()
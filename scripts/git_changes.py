@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+--since <ref> 增量模式的公共部分：列出自某个 git 版本以来改动过的文件
+
+已提交的改动从 ref 与 HEAD 的合并基点算起（ref...HEAD），只包含本分支自己的提交，
+ref 之后在别的分支上的改动不算；再加上未提交的改动和未跟踪的新文件。已删除的文件单独返回，
+调用方据此只更新缓存索引里对应的条目，而不是重新扫描整个 src。
+"""
+
+import os
+import subprocess
+
+from i18n_config import REPO_ROOT
+
+
+def _git_paths(*args):
+    output = subprocess.run(
+        ['git', *args], cwd=REPO_ROOT, capture_output=True, check=True,
+    ).stdout.decode('utf-8')
+    return [path for path in output.split('\0') if path]
+
+
+def changed_since(ref, extensions=None, under=None):
+    """(changed paths, deleted paths) on this branch since ref, as absolute paths
+
+    Committed changes are taken from the merge base of ref and HEAD, plus the
+    uncommitted and untracked files of the working tree.
+
+    extensions filters by file suffix, under by directory.
+    """
+    try:
+        relpaths = _git_paths('diff', '--name-only', '-z', '--no-renames', f'{ref}...HEAD')
+        relpaths += _git_paths('diff', '--name-only', '-z', '--no-renames', 'HEAD')
+        relpaths += _git_paths('ls-files', '--others', '--exclude-standard', '-z')
+    except subprocess.CalledProcessError as error:
+        raise SystemExit(f"git diff against {ref} failed: {error.stderr.decode('utf-8').strip()}")
+
+    changed = []
+    deleted = []
+    for relpath in dict.fromkeys(relpaths):
+        path = os.path.join(REPO_ROOT, relpath)
+        if extensions and not path.endswith(tuple(extensions)):
+            continue
+        if under and not path.startswith(os.path.join(under, '')):
+            continue
+        (changed if os.path.exists(path) else deleted).append(path)
+    return changed, deleted
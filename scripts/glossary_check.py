@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+术语表检查 - 英文里出现的品牌名/术语（Follow-ai、Product Hunt、XP 等）在其他语言中必须原样保留
+
+用 Aho-Corasick 自动机一次线性扫描每个值，术语表增长到几百条时成本基本不变。
+"""
+
+import argparse
+import sys
+from collections import deque
+
+from i18n_config import LANGUAGES, LOCALES_DIR, SOURCE_LANG
+from locale_parser import load_locales
+
+# 不翻译的术语
+DO_NOT_TRANSLATE = [
+    'Follow-ai',
+    'Follow.ai',
+    'Product Hunt',
+    'XP',
+    'GitHub',
+    'Google',
+    'Stripe',
+    'PayPal',
+]
+
+
+class AhoCorasick:
+    """Multi-pattern matcher: find every term in a text in one pass"""
+
+    def __init__(self, terms):
+        self.terms = list(terms)
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [()]
+
+        for index, term in enumerate(self.terms):
+            node = 0
+            for char in term:
+                nxt = self.goto[node].get(char)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][char] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(())
+                node = nxt
+            self.output[node] += (index,)
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and char not in self.goto[state]:
+                    state = self.fail[state]
+                self.fail[child] = self.goto[state].get(char, 0)
+                self.output[child] += self.output[self.fail[child]]
+
+    def finditer(self, text):
+        """Yield (start, term index) for every occurrence"""
+        goto, fail, output, terms = self.goto, self.fail, self.output, self.terms
+        node = 0
+        for pos, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for index in output[node]:
+                yield pos - len(terms[index]) + 1, index
+
+
+def is_word_char(char):
+    return char.isascii() and (char.isalnum() or char == '_')
+
+
+def find_terms(matcher, text):
+    """Set of term indices that occur in text as whole words"""
+    found = set()
+    for start, index in matcher.finditer(text):
+        end = start + len(matcher.terms[index])
+        if start > 0 and is_word_char(text[start - 1]):
+            continue
+        if end < len(text) and is_word_char(text[end]):
+            continue
+        found.add(index)
+    return found
+
+
+def check_glossary(flats, terms=DO_NOT_TRANSLATE, source_lang=SOURCE_LANG):
+    """Return (lang, path, missing terms) for translations that dropped a glossary term"""
+    matcher = AhoCorasick(terms)
+    source = flats.get(source_lang, {})
+    issues = []
+
+    for path, value in source.items():
+        expected = find_terms(matcher, value)
+        if not expected:
+            continue
+        for lang, flat in flats.items():
+            if lang == source_lang or path not in flat:
+                continue
+            missing = expected - find_terms(matcher, flat[path])
+            if missing:
+                issues.append((lang, path, sorted(matcher.terms[index] for index in missing)))
+
+    return issues
+
+
+def load_terms(filepath):
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check do-not-translate terms across locales')
+    parser.add_argument('--glossary', help='file with one term per line (default: built-in list)')
+    parser.add_argument('--locales', default=LOCALES_DIR)
+    args = parser.parse_args()
+
+    terms = load_terms(args.glossary) if args.glossary else DO_NOT_TRANSLATE
+    locales = load_locales(LANGUAGES, args.locales)
+    issues = check_glossary({lang: parsed.flat() for lang, parsed in locales.items()}, terms)
+
+    for lang, path, missing in issues:
+        print(f"{lang}: {path}: missing {', '.join(missing)}")
+    print(f"\n{len(issues)} glossary violations")
+    sys.exit(1 if issues else 0)
+
+
+if __name__ == '__main__':
+    main()
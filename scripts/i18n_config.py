@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+i18n 工具脚本共用的路径与语言配置
+"""
+
+import os
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(REPO_ROOT, 'src')
+LOCALES_DIR = os.path.join(SRC_DIR, 'i18n', 'locales')
+
+# 生成的索引、缓存文件都放在这里（已加入 .gitignore）
+CACHE_DIR = os.path.join(REPO_ROOT, '.i18n-cache')
+
+SOURCE_LANG = 'en'
+LANGUAGES = ['en', 'zh', 'ja', 'ko', 'es', 'fr', 'de', 'pt', 'ru', 'ar']
+
+# 构建语言包时缺失键的回退链，按顺序查找；未列出的语言直接回退到 SOURCE_LANG
+FALLBACKS = {
+    'pt': ['en'],
+    'ar': ['en'],
+}
+
+# 每个译文对应的英文原文指纹（source_fingerprints.py 维护，需要提交）
+FINGERPRINTS_PATH = os.path.join(SRC_DIR, 'i18n', 'source-fingerprints.json')
+
+# prune_keys.py 删掉的键（需要提交）；英文没有重新加回这些键之前，同步脚本不再添加它们
+PRUNED_KEYS_PATH = os.path.join(SRC_DIR, 'i18n', 'pruned-keys.json')
+
+# build_bundles.py 生成的语言包（已加入 .gitignore）
+BUNDLE_DIR = os.path.join(REPO_ROOT, 'public', 'locales')
+
+
+def locale_path(lang):
+    return os.path.join(LOCALES_DIR, f'{lang}.ts')
+
+
+def fallback_chain(lang):
+    """Languages to try, in order, for keys missing in lang"""
+    if lang == SOURCE_LANG:
+        return []
+    chain = FALLBACKS.get(lang, [SOURCE_LANG])
+    return chain if SOURCE_LANG in chain else chain + [SOURCE_LANG]
+
+
+def cache_path(*parts):
+    """Path inside CACHE_DIR, creating the parent directory"""
+    path = os.path.join(CACHE_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def cache_dir(*parts):
+    """Directory inside CACHE_DIR, created if missing"""
+    path = os.path.join(CACHE_DIR, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
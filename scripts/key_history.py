@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+翻译键的修改历史：每个键在每个语言里最后一次被修改的提交
+
+只启动两个 git 进程：git log --raw 列出改动过语言文件的提交及其新旧 blob，
+再由一个常驻的 git cat-file --batch 读出 blob 内容（按 sha 缓存解析结果）；
+每个提交把文件的旧 blob 与新 blob 做键级 diff，因此多分支历史里改动也归到真正做出它的提交。
+合并提交本身不产生 raw 记录，分支上的改动由分支上的提交记录。结果按 HEAD 提交缓存。
+
+用法:
+    python scripts/key_history.py --max-count 500 build
+    python scripts/key_history.py show tasks.unlockMessage
+    python scripts/key_history.py show tasks. --prefix
+"""
+
+import argparse
+import os
+import pickle
+import subprocess
+import time
+
+from i18n_config import LOCALES_DIR, REPO_ROOT, cache_path
+from locale_diff import diff_flats
+from locale_parser import LocaleParseError, parse_locale
+
+INDEX_VERSION = 2
+NULL_SHA = '0' * 40
+
+
+class Change:
+    """One key change: the commit, its time and subject, and what happened"""
+
+    __slots__ = ('commit', 'timestamp', 'subject', 'action')
+
+    def __init__(self, commit, timestamp, subject, action):
+        self.commit = commit
+        self.timestamp = timestamp
+        self.subject = subject
+        self.action = action
+
+
+class BlobReader:
+    """Read many blobs through one `git cat-file --batch` process"""
+
+    def __init__(self, repo=REPO_ROOT):
+        self.process = subprocess.Popen(
+            ['git', 'cat-file', '--batch'], cwd=repo, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+        )
+
+    def read(self, sha):
+        self.process.stdin.write(f'{sha}\n'.encode('ascii'))
+        self.process.stdin.flush()
+        header = self.process.stdout.readline().decode('ascii').split()
+        if len(header) < 3 or header[1] == 'missing':
+            return None
+        data = self.process.stdout.read(int(header[2]))
+        self.process.stdout.read(1)
+        return data.decode('utf-8')
+
+    def close(self):
+        self.process.stdin.close()
+        self.process.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def locale_commits(rev='HEAD', max_count=None, repo=REPO_ROOT):
+    """[(commit, timestamp, subject, [(relpath, old blob sha, new blob sha)])] oldest first"""
+    relpath = os.path.relpath(LOCALES_DIR, REPO_ROOT).replace(os.sep, '/')
+    command = ['git', 'log', '--format=%x00%H %ct %s', '--raw', '--no-abbrev', '--no-renames', rev]
+    if max_count:
+        command.insert(2, f'--max-count={max_count}')
+    output = subprocess.run(
+        command + ['--', relpath], cwd=repo, capture_output=True, check=True,
+    ).stdout.decode('utf-8')
+
+    commits = []
+    for block in output.split('\0')[1:]:
+        header, _, body = block.partition('\n')
+        commit, timestamp, subject = (header.split(' ', 2) + [''])[:3]
+        blobs = []
+        for line in body.splitlines():
+            if not line.startswith(':'):
+                continue
+            meta, _, path = line.partition('\t')
+            fields = meta.split()
+            if path.endswith('.ts'):
+                blobs.append((path, fields[2], fields[3]))
+        if blobs:
+            # 合并提交不带 raw 记录，改动已由各分支上的提交给出
+            commits.append((commit, int(timestamp), subject, blobs))
+    commits.reverse()
+    return commits
+
+
+def parse_blob(content):
+    try:
+        return parse_locale(content).flat() if content is not None else {}
+    except LocaleParseError:
+        return None
+
+
+class BlobCache:
+    """Parsed locale blobs by sha; each blob is usually read as one commit's new and the next one's old"""
+
+    def __init__(self, reader):
+        self.reader = reader
+        self.flats = {}
+
+    def flat(self, sha):
+        if sha == NULL_SHA:
+            return {}
+        if sha not in self.flats:
+            self.flats[sha] = parse_blob(self.reader.read(sha))
+        return self.flats[sha]
+
+
+def build_history(rev='HEAD', max_count=None, repo=REPO_ROOT):
+    """({path: {lang: Change}} with the last change of every key in every locale, commits read)"""
+    history = {}
+    commits = locale_commits(rev, max_count, repo)
+    with BlobReader(repo) as reader:
+        blobs = BlobCache(reader)
+        for commit, timestamp, subject, changes in commits:
+            for relpath, old_sha, new_sha in changes:
+                lang = os.path.splitext(os.path.basename(relpath))[0]
+                old = blobs.flat(old_sha)
+                new = blobs.flat(new_sha)
+                if old is None or new is None:
+                    # 历史版本可能无法解析，跳过该提交的这个文件
+                    continue
+                diff = diff_flats(old, new)
+                for action in ('added', 'changed', 'removed'):
+                    for path in diff[action]:
+                        history.setdefault(path, {})[lang] = Change(commit, timestamp, subject, action)
+    return history, len(commits)
+
+
+def head_commit(rev='HEAD', repo=REPO_ROOT):
+    return subprocess.run(
+        ['git', 'rev-parse', rev], cwd=repo, capture_output=True, check=True,
+    ).stdout.decode('ascii').strip()
+
+
+def load_history(rev='HEAD', max_count=None):
+    """Cached history for the commit rev points at, rebuilt when it moved"""
+    filepath = cache_path('key_history.pickle')
+    head = head_commit(rev)
+    try:
+        with open(filepath, 'rb') as f:
+            data = pickle.load(f)
+        if data.get('version') == INDEX_VERSION and data['head'] == head and data['max_count'] == max_count:
+            return data['history'], data['commits'], False
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+        pass
+
+    history, commits = build_history(head, max_count)
+    tmp_path = filepath + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(
+            {'version': INDEX_VERSION, 'head': head, 'max_count': max_count, 'history': history, 'commits': commits},
+            f, protocol=pickle.HIGHEST_PROTOCOL,
+        )
+    os.replace(tmp_path, filepath)
+    return history, commits, True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='When did each translation key last change, per locale')
+    parser.add_argument('--rev', default='HEAD')
+    parser.add_argument('--max-count', type=int, help='only read this many most recent locale commits')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('build', help='build or refresh the history index')
+    show = sub.add_parser('show', help='last change of a key in every locale')
+    show.add_argument('key')
+    show.add_argument('--prefix', action='store_true', help='treat key as a prefix')
+    args = parser.parse_args()
+
+    started = time.monotonic()
+    history, commits, rebuilt = load_history(args.rev, args.max_count)
+    if args.command == 'build':
+        status = 'Read' if rebuilt else 'Cached'
+        print(f"{status}: {commits} commits, {len(history)} keys in {time.monotonic() - started:.2f}s")
+        return
+
+    keys = sorted(key for key in history if key.startswith(args.key)) if args.prefix else [args.key]
+    found = False
+    for key in keys:
+        for lang, change in sorted(history.get(key, {}).items()):
+            date = time.strftime('%Y-%m-%d', time.localtime(change.timestamp))
+            print(f"{key}\t{lang}\t{change.action}\t{date}\t{change.commit[:10]}\t{change.subject}")
+            found = True
+    if not found:
+        print(f"No history for: {args.key}")
+
+
+if __name__ == '__main__':
+    main()
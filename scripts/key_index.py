@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+翻译键 → 调用位置 的倒排索引
+
+记录 src 下每个 t('…') 调用的 (文件, 行, 列)，按文件哈希增量更新，
+并导出为 binary_catalog 格式，其他工具 mmap 打开即可查询，无需加载整个索引。
+
+用法:
+    python scripts/key_index.py build
+    python scripts/key_index.py build --since origin/main
+    python scripts/key_index.py who tasks.bounty
+    python scripts/key_index.py who tasks. --prefix
+
+分片构建（batch_translate_components.py --shard i/N）时，每个分片只索引按路径哈希
+分给自己的文件，写出按 (键, 文件, 行, 列) 排序的部分索引；merge 对这些有序列表做 k 路归并，
+一遍得到与整体构建相同的全局索引。
+"""
+
+import argparse
+import glob
+import hashlib
+import heapq
+import os
+import pickle
+
+from binary_catalog import BinaryCatalog, write_binary
+from git_changes import changed_since
+from i18n_config import REPO_ROOT, SRC_DIR, cache_path
+from scan_cache import ScanCache, find_source_files
+
+INDEX_VERSION = 1
+PARTIAL_VERSION = 1
+
+
+def index_path():
+    return cache_path('key_index.pickle')
+
+
+def export_path():
+    return cache_path('key_index.bin')
+
+
+def partial_path(shard, count):
+    return cache_path('shards', f'key_index-{shard}-of-{count}.pickle')
+
+
+def shard_of(relpath, count):
+    """Shard (1-based) a repo-relative path belongs to; the same on every machine and run"""
+    digest = hashlib.blake2b(relpath.replace(os.sep, '/').encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % count + 1
+
+
+class KeyIndex:
+    """Inverted index {key: {relpath: [(line, column), ...]}} plus the file hashes it reflects"""
+
+    def __init__(self):
+        self.files = {}
+        self.postings = {}
+        self.sites = {}
+
+    @classmethod
+    def load(cls, filepath=None):
+        index = cls()
+        try:
+            with open(filepath or index_path(), 'rb') as f:
+                data = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return index
+        if data.get('version') == INDEX_VERSION:
+            index.files = data['files']
+            index.postings = data['postings']
+            index.sites = data['sites']
+        return index
+
+    def save(self, filepath=None):
+        filepath = filepath or index_path()
+        tmp_path = filepath + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(
+                {'version': INDEX_VERSION, 'files': self.files, 'postings': self.postings, 'sites': self.sites},
+                f, protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp_path, filepath)
+
+    def remove_file(self, relpath):
+        for key in self.postings.pop(relpath, ()):
+            files = self.sites.get(key)
+            if files is not None:
+                files.pop(relpath, None)
+                if not files:
+                    del self.sites[key]
+        self.files.pop(relpath, None)
+
+    def add_file(self, relpath, digest, keys):
+        """keys is the scan cache's [(key, line, column), ...] for the file"""
+        self.remove_file(relpath)
+        self.files[relpath] = digest
+        for key, line, column in keys:
+            self.sites.setdefault(key, {}).setdefault(relpath, []).append((line, column))
+        self.postings[relpath] = sorted({key for key, _, _ in keys})
+
+    def update(self, cache, paths, deleted=None):
+        """Reindex the files whose content hash changed; returns the relpaths reindexed
+
+        paths is the whole tree unless deleted is given: then only paths
+        and the deleted files are touched and every other entry is kept.
+        """
+        results = cache.scan_many(paths)
+        changed = []
+        for relpath, facts in results.items():
+            digest = cache.hash(relpath)
+            if self.files.get(relpath) != digest:
+                self.add_file(relpath, digest, facts['keys'])
+                changed.append(relpath)
+        if deleted is None:
+            gone = set(self.files) - set(results)
+        else:
+            gone = {os.path.relpath(path, REPO_ROOT) for path in deleted} & set(self.files)
+            cache.forget(deleted)
+        for relpath in gone:
+            self.remove_file(relpath)
+            changed.append(relpath)
+        return changed
+
+    def who(self, key):
+        """[(relpath, line, column)] for one key"""
+        return [
+            (relpath, line, column)
+            for relpath, positions in sorted(self.sites.get(key, {}).items())
+            for line, column in positions
+        ]
+
+    def keys(self):
+        return self.sites.keys()
+
+    def sorted_sites(self):
+        """[(key, relpath, line, column)] sorted, the form partial indexes are stored in"""
+        return sorted(
+            (key, relpath, line, column)
+            for key, files in self.sites.items()
+            for relpath, positions in files.items()
+            for line, column in positions
+        )
+
+    @classmethod
+    def from_sorted_sites(cls, files, sites):
+        """Build an index in one pass from sites already sorted by key"""
+        index = cls()
+        index.files = dict(files)
+        index.postings = {relpath: [] for relpath in files}
+        for key, relpath, line, column in sites:
+            index.sites.setdefault(key, {}).setdefault(relpath, []).append((line, column))
+            postings = index.postings[relpath]
+            if not postings or postings[-1] != key:
+                postings.append(key)
+        return index
+
+    def digest(self):
+        hasher = hashlib.blake2b(digest_size=16)
+        for relpath in sorted(self.files):
+            hasher.update(f'{relpath}\0{self.files[relpath]}\n'.encode('utf-8'))
+        return hasher.hexdigest()
+
+    def export(self, filepath=None):
+        """Write a binary catalog: key → newline-separated 'file:line:column' sites"""
+        flat = {
+            key: '\n'.join(f'{relpath}:{line}:{column}' for relpath, line, column in self.who(key))
+            for key in self.sites
+        }
+        write_binary(filepath or export_path(), flat, self.digest())
+
+
+def build_index(paths=None, since=None):
+    """Load the persisted index, update it from changed files, save and export it
+
+    With since (a git ref) only the files git reports as changed are rescanned;
+    an empty index is still built from the whole tree.
+    """
+    cache = ScanCache()
+    index = KeyIndex.load()
+    if since and index.files:
+        paths, deleted = changed_since(since, ('.ts', '.tsx'), SRC_DIR)
+        changed = index.update(cache, paths, deleted)
+    else:
+        changed = index.update(cache, paths if paths is not None else find_source_files())
+    cache.save()
+    if changed or not os.path.exists(export_path()):
+        index.save()
+        index.export()
+    return index, changed
+
+
+def write_partial(index, shard, count, filepath=None):
+    filepath = filepath or partial_path(shard, count)
+    tmp_path = filepath + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(
+            {'version': PARTIAL_VERSION, 'shard': shard, 'count': count,
+             'files': index.files, 'sites': index.sorted_sites()},
+            f, protocol=pickle.HIGHEST_PROTOCOL,
+        )
+    os.replace(tmp_path, filepath)
+    return filepath
+
+
+def load_partials(filepaths=None):
+    """Partial indexes of one complete set of shards; exits if any is missing or mismatched"""
+    filepaths = filepaths or sorted(glob.glob(os.path.join(os.path.dirname(partial_path(1, 1)), 'key_index-*.pickle')))
+    partials = {}
+    counts = set()
+    for filepath in filepaths:
+        with open(filepath, 'rb') as f:
+            data = pickle.load(f)
+        if data.get('version') != PARTIAL_VERSION:
+            raise SystemExit(f"Unsupported partial index: {filepath}")
+        if data['shard'] in partials:
+            raise SystemExit(f"Shard {data['shard']}/{data['count']} given twice: {filepath}")
+        partials[data['shard']] = data
+        counts.add(data['count'])
+    if len(counts) != 1:
+        raise SystemExit(f"Partial indexes are from different shard counts: {sorted(counts) or 'none found'}")
+    count = counts.pop()
+    missing = [str(shard) for shard in range(1, count + 1) if shard not in partials]
+    if missing:
+        raise SystemExit(f"Missing shards of {count}: {', '.join(missing)}")
+    return [partials[shard] for shard in range(1, count + 1)]
+
+
+def merge_partials(partials):
+    """Global index from partial indexes: a k-way merge of their sorted sites"""
+    files = {}
+    for partial in partials:
+        files.update(partial['files'])
+    return KeyIndex.from_sorted_sites(files, heapq.merge(*(partial['sites'] for partial in partials)))
+
+
+def open_export():
+    """Open the exported index for lookups without loading it"""
+    return BinaryCatalog(export_path())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Translation key call-site index')
+    sub = parser.add_subparsers(dest='command', required=True)
+    build = sub.add_parser('build', help='update the index from changed files')
+    build.add_argument('--since', metavar='REF', help='only rescan files changed since this git ref')
+    who = sub.add_parser('who', help='list call sites of a key')
+    who.add_argument('key')
+    who.add_argument('--prefix', action='store_true', help='treat key as a prefix')
+    args = parser.parse_args()
+
+    index, changed = build_index(since=getattr(args, 'since', None))
+    if args.command == 'build':
+        print(f"Reindexed {len(changed)} files; {len(index.sites)} keys in {len(index.files)} files")
+        return
+
+    keys = sorted(key for key in index.keys() if key.startswith(args.key)) if args.prefix else [args.key]
+    found = False
+    for key in keys:
+        for relpath, line, column in index.who(key):
+            print(f"{relpath}:{line}:{column}\t{key}")
+            found = True
+    if not found:
+        print(f"No call sites for: {args.key}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+语言文件的键级 diff：新增 / 删除 / 修改的键，输出 JSON
+
+两个版本都展平成 {键路径: 值}，以旧版本建哈希表、用新版本逐键探测（hash join），O(n)。
+可以比较工作区与某个 git 版本（默认 HEAD），或直接比较两个文件。
+build_bundles 用同样的 diff 决定哪些分块需要重新生成。
+
+用法:
+    python scripts/locale_diff.py de                   # HEAD 与工作区
+    python scripts/locale_diff.py de ja --rev main
+    python scripts/locale_diff.py old/de.ts src/i18n/locales/de.ts
+"""
+
+import argparse
+import json
+import os
+import subprocess
+
+from i18n_config import LANGUAGES, REPO_ROOT, locale_path
+from locale_parser import parse_locale, read_locale
+
+
+def diff_flats(old, new):
+    """{'added': {path: value}, 'removed': {path: value}, 'changed': {path: {'old', 'new'}}}"""
+    added = {}
+    changed = {}
+    seen = set()
+    for path, value in new.items():
+        before = old.get(path)
+        if before is None:
+            added[path] = value
+        else:
+            seen.add(path)
+            if before != value:
+                changed[path] = {'old': before, 'new': value}
+    removed = {path: value for path, value in old.items() if path not in seen}
+    return {'added': added, 'removed': removed, 'changed': changed}
+
+
+def is_empty(diff):
+    return not (diff['added'] or diff['removed'] or diff['changed'])
+
+
+def changed_paths(diff):
+    return diff['added'].keys() | diff['removed'].keys() | diff['changed'].keys()
+
+
+def read_revision(filepath, rev='HEAD'):
+    """Content of a file at a git revision, or None if it does not exist there"""
+    relpath = os.path.relpath(os.path.abspath(filepath), REPO_ROOT).replace(os.sep, '/')
+    result = subprocess.run(
+        ['git', 'show', f'{rev}:{relpath}'], cwd=REPO_ROOT, capture_output=True,
+    )
+    if result.returncode != 0:
+        return None
+    return result.stdout.decode('utf-8')
+
+
+def flat_at(filepath, rev=None):
+    """Flattened locale at a git revision, or in the working tree when rev is None"""
+    if rev is None:
+        return read_locale(filepath).flat() if os.path.exists(filepath) else {}
+    content = read_revision(filepath, rev)
+    return parse_locale(content).flat() if content is not None else {}
+
+
+def summary(diff):
+    return f"+{len(diff['added'])} -{len(diff['removed'])} ~{len(diff['changed'])}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Key-level diff of locale files')
+    parser.add_argument('targets', nargs='*', help='languages (default: all), or two locale files')
+    parser.add_argument('--rev', default='HEAD', help='git revision to compare the working tree with')
+    parser.add_argument('--summary', action='store_true', help='print counts instead of JSON')
+    args = parser.parse_args()
+
+    if len(args.targets) == 2 and all(os.path.isfile(target) for target in args.targets):
+        diff = diff_flats(read_locale(args.targets[0]).flat(), read_locale(args.targets[1]).flat())
+        print(summary(diff) if args.summary else json.dumps(diff, ensure_ascii=False, indent=2))
+        return
+
+    diffs = {}
+    for lang in args.targets or LANGUAGES:
+        if lang not in LANGUAGES:
+            raise SystemExit(f"Unknown language or file: {lang}")
+        filepath = locale_path(lang)
+        diff = diff_flats(flat_at(filepath, args.rev), flat_at(filepath))
+        if not is_empty(diff):
+            diffs[lang] = diff
+
+    if args.summary:
+        for lang, diff in diffs.items():
+            print(f"{lang}: {summary(diff)}")
+        if not diffs:
+            print(f"No key changes since {args.rev}")
+        return
+    print(json.dumps(diffs, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
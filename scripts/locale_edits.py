@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+基于 locale_parser 偏移量的语言文件编辑：删除键、追加键、原地改名、替换值，
+所有修改先收集成 (start, end, text) 再一次性应用，每个文件只读写一次。
+"""
+
+from locale_parser import IDENTIFIER, quote_ts, render_properties, unflatten
+
+
+def line_start(content, pos):
+    return content.rfind('\n', 0, pos) + 1
+
+
+def removal_span(content, start, end):
+    """Span that removes a property from its key (start) to its value end, with the trailing comma
+
+    If the property is alone on its line(s), the whole line is removed; when it
+    sat between blank lines (or right after the opening brace and before a blank
+    line), the blank line after it goes too, so no double blank line is left.
+    """
+    pos = end
+    while pos < len(content) and content[pos] in ' \t':
+        pos += 1
+    if pos < len(content) and content[pos] == ',':
+        pos += 1
+    line_end = content.find('\n', pos)
+    if line_end == -1:
+        line_end = len(content)
+    first = line_start(content, start)
+    if not content[pos:line_end].strip() and not content[first:start].strip():
+        end = min(line_end + 1, len(content))
+        next_end = content.find('\n', end)
+        previous = content[line_start(content, first - 1):first].strip() if first else ''
+        if next_end != -1 and not content[end:next_end].strip() and (not previous or previous.endswith('{')):
+            end = next_end + 1
+        return first, end
+    return start, pos
+
+
+def remove_entry_edit(parsed, path):
+    entry = parsed.entries[path]
+    start, end = removal_span(parsed.content, entry.key_start, entry.value_end)
+    return start, end, ''
+
+
+def remove_object_edit(parsed, path):
+    obj = parsed.objects[path]
+    start, end = removal_span(parsed.content, obj.key_start, obj.close + 1)
+    return start, end, ''
+
+
+def replace_value_edit(parsed, path, value):
+    """Replace the string literal of an existing entry"""
+    entry = parsed.entries[path]
+    return entry.value_start, entry.value_end, quote_ts(value)
+
+
+def rename_key_edit(parsed, path, new_name):
+    """Replace only the property name of an entry or object"""
+    node = parsed.entries.get(path) or parsed.objects[path]
+    return node.key_start, node.key_end, new_name if IDENTIFIER.match(new_name) else quote_ts(new_name)
+
+
+def _children_end(parsed, parent, removed):
+    """End offset of the last direct child of parent that is not being removed"""
+    last = None
+    for path, entry in parsed.entries.items():
+        if path.rpartition('.')[0] == parent and path not in removed:
+            last = max(last or 0, entry.value_end)
+    for path, obj in parsed.objects.items():
+        if path.rpartition('.')[0] == parent and path not in removed:
+            last = max(last or 0, obj.close + 1)
+    return last
+
+
+def nearest_object(parsed, path):
+    """(existing ancestor object path, remaining relative path) for a new key path"""
+    parts = path.split('.')
+    for cut in range(len(parts) - 1, 0, -1):
+        ancestor = '.'.join(parts[:cut])
+        if ancestor in parsed.objects:
+            return ancestor, '.'.join(parts[cut:])
+    return '', path
+
+
+def insertion_edits(parsed, additions, removed=()):
+    """Edits that append {path: value} additions to their nearest existing sections
+
+    Missing intermediate sections are created. removed lists paths deleted in
+    the same batch, so trailing-comma fixes never land inside a removed span.
+    """
+    content = parsed.content
+    groups = {}
+    for path, value in additions.items():
+        ancestor, relative = nearest_object(parsed, path)
+        groups.setdefault(ancestor, {})[relative] = value
+
+    edits = []
+    for ancestor, relative in groups.items():
+        obj = parsed.objects[ancestor] if ancestor else parsed.root
+        close = obj.close
+        first = line_start(content, close)
+        own_line = not content[first:close].strip()
+        close_indent = content[first:close] if own_line else ''
+        lines = render_properties(unflatten(relative), close_indent + '  ')
+
+        last = _children_end(parsed, ancestor, removed)
+        if last is not None and not content[last:close].lstrip().startswith(','):
+            edits.append((last, last, ','))
+
+        if own_line:
+            edits.append((first, first, '\n'.join(lines) + '\n'))
+        else:
+            edits.append((close, close, '\n' + '\n'.join(lines) + '\n' + close_indent))
+    return edits
+
+
+def apply_edits(content, edits):
+    """Apply non-overlapping (start, end, text) edits in one pass"""
+    pieces = []
+    pos = 0
+    for start, end, text in sorted(edits, key=lambda edit: (edit[0], edit[1])):
+        if start < pos:
+            raise ValueError(f"overlapping edits at offset {start}")
+        pieces.append(content[pos:start])
+        pieces.append(text)
+        pos = end
+    pieces.append(content[pos:])
+    return ''.join(pieces)
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+解析 src/i18n/locales/*.ts 语言文件，得到扁平的键路径 → 值，以及每个键在源文件中的偏移量
+"""
+
+import hashlib
+import os
+import re
+import sys
+
+from i18n_config import LANGUAGES, LOCALES_DIR
+
+IDENTIFIER = re.compile(r'^[A-Za-z_$][\w$]*$')
+ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0'}
+
+
+class LocaleEntry:
+    """One string value in a locale file and where it sits in the source
+
+    key_start/key_end cover the property name (quotes included),
+    value_start/value_end cover the string literal (quotes included).
+    """
+
+    __slots__ = ('path', 'value', 'key_start', 'key_end', 'value_start', 'value_end')
+
+    def __init__(self, path, value, key_start, key_end, value_start, value_end):
+        self.path = path
+        self.value = value
+        self.key_start = key_start
+        self.key_end = key_end
+        self.value_start = value_start
+        self.value_end = value_end
+
+    def __repr__(self):
+        return f"LocaleEntry({self.path!r}, {self.value!r})"
+
+
+class LocaleObject:
+    """A nested object (section) in a locale file: key span plus its braces"""
+
+    __slots__ = ('path', 'key_start', 'key_end', 'open', 'close')
+
+    def __init__(self, path, key_start, key_end, open, close):
+        self.path = path
+        self.key_start = key_start
+        self.key_end = key_end
+        self.open = open
+        self.close = close
+
+
+class ParsedLocale:
+    """Result of parse_locale: entries and objects keyed by dotted path, in file order
+
+    root is the exported object literal itself (path ''). shadowed lists
+    entries overridden by a later duplicate key in the same object; they
+    are never visible at runtime.
+    """
+
+    def __init__(self, content, entries, objects, root, shadowed=()):
+        self.content = content
+        self.entries = entries
+        self.objects = objects
+        self.root = root
+        self.shadowed = list(shadowed)
+
+    def flat(self):
+        return {path: entry.value for path, entry in self.entries.items()}
+
+
+class LocaleParseError(ValueError):
+    pass
+
+
+class _Parser:
+    def __init__(self, content):
+        self.content = content
+        self.pos = 0
+        self.entries = {}
+        self.objects = {}
+        self.shadowed = []
+
+    def error(self, message):
+        line = self.content.count('\n', 0, self.pos) + 1
+        raise LocaleParseError(f"line {line}: {message}")
+
+    def skip(self):
+        content = self.content
+        length = len(content)
+        while self.pos < length:
+            char = content[self.pos]
+            if char in ' \t\r\n':
+                self.pos += 1
+            elif content.startswith('//', self.pos):
+                end = content.find('\n', self.pos)
+                self.pos = length if end == -1 else end + 1
+            elif content.startswith('/*', self.pos):
+                end = content.find('*/', self.pos + 2)
+                if end == -1:
+                    self.error("unterminated comment")
+                self.pos = end + 2
+            else:
+                break
+
+    def peek(self):
+        self.skip()
+        return self.content[self.pos] if self.pos < len(self.content) else ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            self.error(f"expected {char!r}")
+        self.pos += 1
+
+    def string(self):
+        content = self.content
+        quote = content[self.pos]
+        self.pos += 1
+        chars = []
+        while True:
+            if self.pos >= len(content):
+                self.error("unterminated string")
+            char = content[self.pos]
+            if char == quote:
+                self.pos += 1
+                return ''.join(chars)
+            if char == '\\':
+                nxt = content[self.pos + 1]
+                if nxt == 'u':
+                    chars.append(chr(int(content[self.pos + 2:self.pos + 6], 16)))
+                    self.pos += 6
+                    continue
+                chars.append(ESCAPES.get(nxt, nxt))
+                self.pos += 2
+                continue
+            if char == '\n':
+                self.error("newline in string")
+            chars.append(char)
+            self.pos += 1
+
+    def key(self):
+        char = self.peek()
+        start = self.pos
+        if char in '\'"':
+            name = self.string()
+        else:
+            content = self.content
+            while self.pos < len(content) and (content[self.pos].isalnum() or content[self.pos] in '_$'):
+                self.pos += 1
+            name = content[start:self.pos]
+            if not name:
+                self.error("expected property name")
+        return name, start, self.pos
+
+    def obj(self, prefix):
+        self.expect('{')
+        while True:
+            if self.peek() == '}':
+                self.pos += 1
+                return
+            name, key_start, key_end = self.key()
+            path = f'{prefix}.{name}' if prefix else name
+            self.expect(':')
+            char = self.peek()
+            if char == '{':
+                open_pos = self.pos
+                self.obj(path)
+                self.objects[path] = LocaleObject(path, key_start, key_end, open_pos, self.pos - 1)
+            elif char in '\'"':
+                value_start = self.pos
+                value = self.string()
+                if path in self.entries:
+                    self.shadowed.append(self.entries[path])
+                self.entries[path] = LocaleEntry(path, value, key_start, key_end, value_start, self.pos)
+            else:
+                self.error(f"unsupported value for {path}")
+            char = self.peek()
+            if char == ',':
+                self.pos += 1
+            elif char != '}':
+                self.error("expected ',' or '}'")
+
+
+def parse_locale(content):
+    """Parse the exported object literal of a locale .ts file"""
+    start = content.find('export ')
+    start = content.find('{', 0 if start == -1 else start)
+    if start == -1:
+        raise LocaleParseError("no object literal found")
+    parser = _Parser(content)
+    parser.pos = start
+    parser.obj('')
+    root = LocaleObject('', start, start, start, parser.pos - 1)
+    return ParsedLocale(content, parser.entries, parser.objects, root, parser.shadowed)
+
+
+def read_locale(filepath):
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return parse_locale(f.read())
+
+
+def file_hash(filepath):
+    """blake2b hex digest of a file's bytes"""
+    with open(filepath, 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+
+def load_locales(languages=LANGUAGES, base_path=LOCALES_DIR):
+    """Parse every existing locale file: {lang: ParsedLocale}"""
+    locales = {}
+    for lang in languages:
+        filepath = os.path.join(base_path, f'{lang}.ts')
+        if os.path.exists(filepath):
+            locales[lang] = read_locale(filepath)
+    return locales
+
+
+def quote_ts(value):
+    """Render a Python string as a single-quoted TS string literal"""
+    escaped = value.replace('\\', '\\\\').replace("'", "\\'").replace('\n', '\\n')
+    return f"'{escaped}'"
+
+
+def unflatten(flat):
+    """Turn {'a.b.c': value} back into nested dicts, keeping first-seen order"""
+    tree = {}
+    for path, value in flat.items():
+        node = tree
+        *parents, leaf = path.split('.')
+        for part in parents:
+            node = node.setdefault(part, {})
+        node[leaf] = value
+    return tree
+
+
+def render_properties(tree, indent):
+    """Render nested {key: value | dict} as TS property lines at the given indent"""
+    lines = []
+    for key, value in tree.items():
+        name = key if IDENTIFIER.match(key) else quote_ts(key)
+        if isinstance(value, dict):
+            lines.append(f"{indent}{name}: {{")
+            lines.extend(render_properties(value, indent + '  '))
+            lines.append(f"{indent}}},")
+        else:
+            lines.append(f"{indent}{name}: {quote_ts(value)},")
+    return lines
+
+
+def render_locale(lang, flat):
+    """Render a flat {path: value} map as a locale .ts module (named and default export)"""
+    lines = [f"export const {lang} = {{"]
+    lines.extend(render_properties(unflatten(flat), '  '))
+    lines.append("};")
+    lines.append("")
+    lines.append(f"export default {lang};")
+    return '\n'.join(lines) + '\n'
+
+
+def main():
+    languages = sys.argv[1:] or LANGUAGES
+    for lang, parsed in load_locales(languages).items():
+        print(f"{lang}: {len(parsed.entries)} keys, {len(parsed.objects)} sections")
+
+
+if __name__ == '__main__':
+    main()
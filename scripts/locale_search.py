@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+全文搜索所有语言文件中的键路径和值（SQLite FTS5 trigram 索引）
+
+trigram 分词不依赖空格，中文、日文、阿拉伯文等都能做子串搜索。
+索引按语言文件哈希增量更新：只有内容变化的语言会被重新写入。
+
+用法: python scripts/locale_search.py Recompensa
+"""
+
+import argparse
+import os
+import sqlite3
+
+from i18n_config import LANGUAGES, cache_path, locale_path
+from locale_parser import file_hash, read_locale
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    lang TEXT PRIMARY KEY,
+    hash TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS strings USING fts5(
+    lang UNINDEXED, path, value, tokenize = 'trigram'
+);
+"""
+
+# trigram 索引只能匹配至少 3 个字符的查询，更短的查询退回 LIKE 扫描
+MIN_TRIGRAM = 3
+
+
+def connect(db_path=None):
+    conn = sqlite3.connect(db_path or cache_path('search.sqlite3'), timeout=30)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def update_index(conn, languages=LANGUAGES):
+    """Reindex the locales whose file hash changed; returns the languages reindexed"""
+    known = dict(conn.execute('SELECT lang, hash FROM files'))
+    changed = []
+    with conn:
+        for lang in languages:
+            filepath = locale_path(lang)
+            if not os.path.exists(filepath):
+                if lang in known:
+                    conn.execute('DELETE FROM strings WHERE lang = ?', (lang,))
+                    conn.execute('DELETE FROM files WHERE lang = ?', (lang,))
+                continue
+            digest = file_hash(filepath)
+            if known.get(lang) == digest:
+                continue
+            flat = read_locale(filepath).flat()
+            conn.execute('DELETE FROM strings WHERE lang = ?', (lang,))
+            conn.executemany(
+                'INSERT INTO strings(lang, path, value) VALUES (?, ?, ?)',
+                ((lang, path, value) for path, value in flat.items()),
+            )
+            conn.execute('INSERT OR REPLACE INTO files(lang, hash) VALUES (?, ?)', (lang, digest))
+            changed.append(lang)
+    return changed
+
+
+def search(conn, query, column='value', lang=None, limit=50):
+    """Return (lang, path, value) rows whose column contains query (case-insensitive)"""
+    if len(query) >= MIN_TRIGRAM:
+        phrase = '"' + query.replace('"', '""') + '"'
+        sql = f'SELECT lang, path, value FROM strings WHERE {column} MATCH ?'
+        params = [phrase]
+    else:
+        escaped = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        sql = f"SELECT lang, path, value FROM strings WHERE {column} LIKE ? ESCAPE '\\'"
+        params = [f'%{escaped}%']
+    if lang:
+        sql += ' AND lang = ?'
+        params.append(lang)
+    sql += ' ORDER BY path, lang LIMIT ?'
+    params.append(limit)
+    return conn.execute(sql, params).fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Search every locale string')
+    parser.add_argument('query')
+    parser.add_argument('--lang', help='only search this language')
+    parser.add_argument('--keys', action='store_true', help='search key paths instead of values')
+    parser.add_argument('--limit', type=int, default=50)
+    args = parser.parse_args()
+
+    conn = connect()
+    changed = update_index(conn)
+    if changed:
+        print(f"Reindexed: {', '.join(changed)}")
+
+    rows = search(conn, args.query, 'path' if args.keys else 'value', args.lang, args.limit)
+    for lang, path, value in rows:
+        print(f"{lang}\t{path}\t{value}")
+    if not rows:
+        print(f"No matches for: {args.query}")
+    conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+机器翻译阶段：把各语言缺失的键批量送去翻译后端
+
+1. 对比英文与各语言文件，收集缺失的 (键, 语言)
+2. 同一语言内相同的英文原文只翻译一次
+3. 按批次交给可插拔的后端，asyncio 工作池 + 并发上限 + 令牌桶限速，失败按退避重试
+4. 占位符与英文不一致的结果丢弃，其余一次性写入各语言文件（记入回滚日志）
+
+翻译记忆（translation_memory）中已有的原文不再请求后端，新结果写回记忆；
+其余原文附带 fuzzy_memory 找到的最接近的已有译文作为参考（hints）。
+--stale 会把 source_fingerprints 标记为过期的译文一并重译（原地替换），写入后更新指纹。
+
+后端: 内置 http（POST JSON），或 module:Class 形式的自定义类。
+本地测试可先启动 scripts/mt_stub_server.py。
+
+用法:
+    python scripts/machine_translate.py --url http://127.0.0.1:8765/translate --dry-run
+    python scripts/machine_translate.py --backend my_backends:DeepL --concurrency 8 --rate 5
+"""
+
+import abc
+import argparse
+import asyncio
+import contextlib
+import importlib
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+
+from fuzzy_memory import FuzzyMemory
+from glossary_check import DO_NOT_TRANSLATE
+from i18n_config import LANGUAGES, REPO_ROOT, SOURCE_LANG, locale_path
+from locale_edits import apply_edits, insertion_edits, replace_value_edit
+from locale_parser import load_locales, parse_locale
+from refactor_keys import read_file, write_file, write_journal
+from source_fingerprints import FingerprintIndex
+from translation_memory import TranslationMemory
+from validate_placeholders import placeholders
+
+
+class RetryableError(Exception):
+    """Backend failure worth retrying (rate limited, temporarily unavailable)"""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class Backend(abc.ABC):
+    """Translate a batch of source strings into one target language
+
+    Subclasses implement translate(); it must return one translation per
+    input text, in order, and raise RetryableError for transient failures.
+    hints, when given, holds one entry per text: the closest existing
+    (source, translation) pair from translation memory, or None.
+    """
+
+    @abc.abstractmethod
+    async def translate(self, texts, source, target, hints=None):
+        """[translation] for texts, in order"""
+
+    async def close(self):
+        pass
+
+
+class HttpBackend(Backend):
+    """POST {"source", "target", "texts", "glossary", "hints"} → {"translations": [...]}"""
+
+    def __init__(self, url, api_key=None, timeout=30, glossary=DO_NOT_TRANSLATE):
+        self.url = url
+        self.api_key = api_key
+        self.timeout = timeout
+        self.glossary = list(glossary)
+
+    def _post(self, payload):
+        headers = {'Content-Type': 'application/json'}
+        if self.api_key:
+            headers['Authorization'] = f'Bearer {self.api_key}'
+        request = urllib.request.Request(
+            self.url, json.dumps(payload, ensure_ascii=False).encode('utf-8'), headers,
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read().decode('utf-8'))
+        except urllib.error.HTTPError as error:
+            if error.code == 429 or error.code >= 500:
+                retry_after = error.headers.get('Retry-After')
+                raise RetryableError(f"HTTP {error.code}", float(retry_after) if retry_after else None)
+            raise
+        except urllib.error.URLError as error:
+            raise RetryableError(str(error.reason))
+
+    async def translate(self, texts, source, target, hints=None):
+        payload = {'source': source, 'target': target, 'texts': texts, 'glossary': self.glossary}
+        if hints and any(hints):
+            payload['hints'] = [{'source': hint[0], 'translation': hint[1]} if hint else None for hint in hints]
+        result = await asyncio.to_thread(self._post, payload)
+        translations = result.get('translations')
+        if not isinstance(translations, list) or len(translations) != len(texts):
+            raise ValueError(f"backend returned {len(translations or [])} translations for {len(texts)} texts")
+        return translations
+
+
+BACKENDS = {
+    'http': HttpBackend,
+}
+
+
+def load_backend(spec, **options):
+    """Instantiate a backend by registry name or 'module:Class'"""
+    if spec in BACKENDS:
+        return BACKENDS[spec](**options)
+    module_name, sep, class_name = spec.partition(':')
+    if not sep:
+        raise SystemExit(f"Unknown backend: {spec} (use one of {', '.join(BACKENDS)} or module:Class)")
+    return getattr(importlib.import_module(module_name), class_name)(**options)
+
+
+class TokenBucket:
+    """Allow `rate` acquisitions per second on average, bursts up to `capacity`"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self, tokens=1):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+
+
+class Batch:
+    __slots__ = ('target', 'texts', 'hints')
+
+    def __init__(self, target, texts):
+        self.target = target
+        self.texts = texts
+        self.hints = None
+
+
+def missing_pairs(flats, languages=LANGUAGES, source_lang=SOURCE_LANG):
+    """{lang: {path: source text}} for every key the source has and lang lacks (or has empty)"""
+    source = flats.get(source_lang, {})
+    missing = {}
+    for lang in languages:
+        if lang == source_lang:
+            continue
+        flat = flats.get(lang, {})
+        entries = {path: value for path, value in source.items() if value and not flat.get(path)}
+        if entries:
+            missing[lang] = entries
+    return missing
+
+
+def plan_batches(missing, batch_size=50, max_chars=4000):
+    """Deduplicate source texts per target language and split them into batches"""
+    batches = []
+    for lang, entries in missing.items():
+        texts = list(dict.fromkeys(entries.values()))
+        current = []
+        size = 0
+        for text in texts:
+            if current and (len(current) >= batch_size or size + len(text) > max_chars):
+                batches.append(Batch(lang, current))
+                current, size = [], 0
+            current.append(text)
+            size += len(text)
+        if current:
+            batches.append(Batch(lang, current))
+    return batches
+
+
+async def run_batches(backend, batches, source_lang=SOURCE_LANG, concurrency=4, rate=2.0, retries=4):
+    """Translate batches with a bounded worker pool; returns ({lang: {text: translation}}, failed batches)"""
+    queue = asyncio.Queue()
+    for batch in batches:
+        queue.put_nowait(batch)
+    bucket = TokenBucket(rate)
+    results = {}
+    failed = []
+
+    async def worker():
+        while True:
+            try:
+                batch = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            for attempt in range(retries + 1):
+                await bucket.acquire()
+                try:
+                    translations = await backend.translate(batch.texts, source_lang, batch.target, batch.hints)
+                except RetryableError as error:
+                    if attempt == retries:
+                        failed.append((batch, str(error)))
+                        break
+                    await asyncio.sleep(error.retry_after or min(30, 0.5 * 2 ** attempt))
+                    continue
+                except Exception as error:
+                    failed.append((batch, str(error)))
+                    break
+                results.setdefault(batch.target, {}).update(zip(batch.texts, translations))
+                break
+
+    try:
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    finally:
+        await backend.close()
+    return results, failed
+
+
+def recall(memory, missing, stale=None):
+    """{lang: {text: translation}} already in translation memory for the missing texts
+
+    Texts of stale entries are always sent to the backend, never recalled.
+    """
+    stale = stale or {}
+    known = {}
+    for lang, entries in missing.items():
+        fresh = {text for path, text in entries.items() if path not in stale.get(lang, {})}
+        outdated = {text for path, text in entries.items() if path in stale.get(lang, {})}
+        known[lang] = {text: value for text, value in memory.get_many(fresh, lang).items() if text not in outdated}
+    return known
+
+
+def attach_hints(fuzzy, batches, threshold=0.6):
+    """Give every batch the closest translation-memory match for each of its texts"""
+    for batch in batches:
+        hints = []
+        for text in batch.texts:
+            best = fuzzy.suggest(text, batch.target, k=1, threshold=threshold)
+            hints.append((best[0][1], best[0][2]) if best else None)
+        batch.hints = hints
+
+
+def remember(memory, missing, additions, known):
+    """Store the backend translations that were accepted and written; recalled ones are already stored"""
+    for lang, entries in additions.items():
+        recalled = known.get(lang, {})
+        pairs = {missing[lang][path]: value for path, value in entries.items() if missing[lang][path] not in recalled}
+        if pairs:
+            memory.put_many(lang, pairs.items())
+
+
+def expand(missing, results):
+    """Map translated texts back onto every key that needed them, dropping placeholder mismatches"""
+    additions = {}
+    rejected = []
+    for lang, entries in missing.items():
+        translated = results.get(lang, {})
+        for path, text in entries.items():
+            value = translated.get(text)
+            if not value:
+                continue
+            if placeholders(value) != placeholders(text):
+                rejected.append((lang, path, value))
+                continue
+            additions.setdefault(lang, {})[path] = value
+    return additions, rejected
+
+
+def write_additions(additions, source):
+    """Write {lang: {path: value}} into the locale files, one batched edit per file
+
+    Existing entries (stale retranslations) are replaced in place, new ones
+    appended; the fingerprint index then records the source they came from.
+    """
+    changes = {}
+    for lang, entries in additions.items():
+        filepath = locale_path(lang)
+        original = read_file(filepath)
+        parsed = parse_locale(original)
+        edits = [replace_value_edit(parsed, path, value) for path, value in entries.items() if path in parsed.entries]
+        new = {path: value for path, value in entries.items() if path not in parsed.entries}
+        if new:
+            edits.extend(insertion_edits(parsed, new))
+        changes[filepath] = (original, apply_edits(original, edits))
+    if not changes:
+        return None
+    journal = write_journal({}, changes)
+    for filepath, (_, updated) in changes.items():
+        write_file(filepath, updated)
+
+    index = FingerprintIndex.load()
+    for lang, entries in additions.items():
+        index.record(lang, source, entries)
+    index.save()
+    return journal
+
+
+def translate_batches(args, batches):
+    options = {'url': args.url, 'api_key': args.api_key} if args.backend == 'http' else {}
+    if args.backend == 'http' and not args.url:
+        raise SystemExit("--url is required for the http backend")
+    backend = load_backend(args.backend, **options)
+
+    started = time.monotonic()
+    results, failed = asyncio.run(run_batches(
+        backend, batches, concurrency=args.concurrency, rate=args.rate, retries=args.retries,
+    ))
+    print(f"Translated {sum(map(len, results.values()))} texts in {time.monotonic() - started:.1f}s")
+    for batch, error in failed:
+        print(f"  failed: {batch.target} batch of {len(batch.texts)}: {error}")
+
+    return results
+
+
+def run(args, memory=None):
+    """Collect, translate and (unless args.dry_run) write the missing keys"""
+    flats = {lang: parsed.flat() for lang, parsed in load_locales().items()}
+    missing = missing_pairs(flats, args.lang or LANGUAGES)
+    stale = {}
+    if args.stale:
+        for lang, entries in FingerprintIndex.load().stale(flats).items():
+            if lang in (args.lang or LANGUAGES):
+                stale[lang] = entries
+                missing.setdefault(lang, {}).update(entries)
+    known = recall(memory, missing, stale) if memory else {}
+    pending = {
+        lang: {path: text for path, text in entries.items() if text not in known.get(lang, {})}
+        for lang, entries in missing.items()
+    }
+    batches = plan_batches(pending, args.batch_size)
+    pairs = sum(len(entries) for entries in missing.values())
+    unique = sum(len(batch.texts) for batch in batches)
+    print(f"{pairs} missing (key, locale) pairs, {unique} unique texts to request in {len(batches)} batches")
+    if memory:
+        print(memory.report())
+        if batches:
+            attach_hints(FuzzyMemory(memory), batches)
+            hinted = sum(1 for batch in batches for hint in batch.hints if hint)
+            print(f"{hinted} texts sent with a fuzzy translation-memory hint")
+
+    results = translate_batches(args, batches) if batches else {}
+    for lang, translated in known.items():
+        results.setdefault(lang, {}).update(translated)
+
+    additions, rejected = expand(missing, results)
+    for lang, path, value in rejected:
+        print(f"  rejected (placeholders differ): {lang}: {path}: {value}")
+    for lang, entries in additions.items():
+        print(f"  {lang}: {len(entries)} keys")
+
+    # 只有通过占位符检查并真正写入的译文才进入翻译记忆，dry-run 不写
+    if not args.dry_run:
+        journal = write_additions(additions, flats[SOURCE_LANG])
+        if memory:
+            remember(memory, missing, additions, known)
+        if journal:
+            print(f"Updated {len(additions)} locale files (journal: {os.path.relpath(journal, REPO_ROOT)})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Machine-translate keys missing from locale files')
+    parser.add_argument('--backend', default='http', help="backend name or module:Class (default: http)")
+    parser.add_argument('--url', help='endpoint for the http backend')
+    parser.add_argument('--api-key', default=os.environ.get('MT_API_KEY'))
+    parser.add_argument('--lang', action='append', help='only these target languages (repeatable)')
+    parser.add_argument('--batch-size', type=int, default=50)
+    parser.add_argument('--concurrency', type=int, default=4, help='requests in flight')
+    parser.add_argument('--rate', type=float, default=2.0, help='requests per second')
+    parser.add_argument('--retries', type=int, default=4)
+    parser.add_argument('--stale', action='store_true', help='also retranslate entries whose English source changed')
+    parser.add_argument('--no-memory', action='store_true', help='ignore the translation memory')
+    parser.add_argument('--dry-run', action='store_true', help='translate and report without writing')
+    args = parser.parse_args()
+
+    with (contextlib.nullcontext() if args.no_memory else TranslationMemory()) as memory:
+        run(args, memory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+本地机器翻译替身服务，供 machine_translate.py 的 http 后端测试使用
+
+返回 "[目标语言] 原文" 形式的伪翻译（占位符和术语原样保留），
+可模拟延迟和限流（超过每秒请求数时返回 429 + Retry-After）。
+
+用法:
+    python scripts/mt_stub_server.py --port 8765 --latency 0.2 --max-rps 5
+    python scripts/machine_translate.py --url http://127.0.0.1:8765/translate --dry-run
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubState:
+    def __init__(self, latency=0.0, max_rps=0):
+        self.latency = latency
+        self.max_rps = max_rps
+        self.lock = threading.Lock()
+        self.window = 0
+        self.count = 0
+        self.requests = 0
+        self.texts = 0
+
+    def admit(self):
+        """False when this request exceeds max_rps for the current second"""
+        with self.lock:
+            self.requests += 1
+            if not self.max_rps:
+                return True
+            second = int(time.monotonic())
+            if second != self.window:
+                self.window, self.count = second, 0
+            self.count += 1
+            return self.count <= self.max_rps
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    state = StubState()
+
+    def send_json(self, status, body, headers=()):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        if self.path != '/translate':
+            self.send_json(404, {'error': 'not found'})
+            return
+        if not self.state.admit():
+            self.send_json(429, {'error': 'rate limited'}, [('Retry-After', '1')])
+            return
+        length = int(self.headers.get('Content-Length', 0))
+        try:
+            payload = json.loads(self.rfile.read(length).decode('utf-8'))
+            texts = payload['texts']
+            target = payload['target']
+        except (ValueError, KeyError):
+            self.send_json(400, {'error': 'expected {"source", "target", "texts"}'})
+            return
+        if self.state.latency:
+            time.sleep(self.state.latency)
+        with self.state.lock:
+            self.state.texts += len(texts)
+        self.send_json(200, {'translations': [f'[{target}] {text}' for text in texts]})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(host='127.0.0.1', port=0, latency=0.0, max_rps=0):
+    """Start the stub in a background thread; returns (server, translate URL)"""
+    handler = type('Handler', (StubHandler,), {'state': StubState(latency, max_rps)})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://{host}:{server.server_address[1]}/translate'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stand-in machine-translation server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds per request')
+    parser.add_argument('--max-rps', type=int, default=0, help='answer 429 above this many requests/second')
+    args = parser.parse_args()
+
+    server, url = serve(args.host, args.port, args.latency, args.max_rps)
+    print(f"Serving {url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        state = server.RequestHandlerClass.state
+        print(f"\n{state.requests} requests, {state.texts} texts")
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+近似重复键检测：MinHash 签名 + LSH 分桶
+
+每个键的"跨语言值向量"（各语言的值）切成 语言:字符三元组 的集合，计算 MinHash 签名，
+按 band 分桶，只比较落进同一桶的键对，再用精确 Jaccard 确认。
+复杂度与键数近似线性，10 万级键也不需要两两比较。
+结果按连通分量聚成簇，作为合并候选（合并后可用 refactor_keys.py 改调用点）。
+
+用法:
+    python scripts/near_duplicates.py
+    python scripts/near_duplicates.py --threshold 0.9 --bands 16 --rows 4
+"""
+
+import argparse
+import hashlib
+import itertools
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 是可选依赖
+    np = None
+
+from i18n_config import SOURCE_LANG
+from locale_parser import load_locales
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+# 桶内成员不超过这个数时两两配对；更大的桶只与第一个成员配对
+FULL_PAIRING_LIMIT = 32
+
+
+def shingles(values):
+    """{lang: value} → set of 'lang:trigram' strings"""
+    result = set()
+    for lang, value in values.items():
+        padded = f'  {" ".join(value.lower().split())} '
+        result.update(f'{lang}:{padded[i:i + 3]}' for i in range(len(padded) - 2))
+    return result
+
+
+def base_hash(shingle):
+    return int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=4).digest(), 'little')
+
+
+class MinHasher:
+    """num_perm universal hash functions (a·x + b mod p) applied to 32-bit shingle hashes
+
+    a and b are kept below 2**32 so a·x + b fits in 64 bits for the NumPy path.
+    """
+
+    def __init__(self, num_perm, seed=1):
+        digest = hashlib.blake2b(str(seed).encode('utf-8'), digest_size=64)
+        coefficients = []
+        counter = 0
+        while len(coefficients) < 2 * num_perm:
+            block = hashlib.blake2b(digest.digest() + counter.to_bytes(4, 'little'), digest_size=64).digest()
+            coefficients.extend(int.from_bytes(block[i:i + 8], 'little') % MERSENNE_PRIME for i in range(0, 64, 8))
+            counter += 1
+        self.a = [(value & MAX_HASH) or 1 for value in coefficients[:num_perm]]
+        self.b = [value & MAX_HASH for value in coefficients[num_perm:2 * num_perm]]
+        if np is not None:
+            self.a_array = np.asarray(self.a, dtype=np.uint64)
+            self.b_array = np.asarray(self.b, dtype=np.uint64)
+
+    def signature(self, items):
+        hashes = [base_hash(item) for item in items]
+        if np is not None:
+            values = np.asarray(hashes, dtype=np.uint64)[:, None]
+            products = (values * self.a_array[None, :] + self.b_array[None, :]) % MERSENNE_PRIME
+            return tuple(int(value) for value in (products & MAX_HASH).min(axis=0))
+        return tuple(
+            min((a * value + b) % MERSENNE_PRIME & MAX_HASH for value in hashes)
+            for a, b in zip(self.a, self.b)
+        )
+
+
+def key_vectors(flats, source_lang=SOURCE_LANG):
+    """{path: {lang: value}} for every key the source language has"""
+    vectors = {}
+    for path in flats.get(source_lang, {}):
+        vectors[path] = {lang: flat[path] for lang, flat in flats.items() if flat.get(path)}
+    return vectors
+
+
+def candidate_pairs(signatures, bands, rows):
+    """Pairs of keys that share at least one LSH band bucket
+
+    Buckets of up to FULL_PAIRING_LIMIT members contribute every pair. Larger
+    buckets only pair their first member with the others, so n members cost n
+    rather than n²; two members of such a bucket that are similar to each other
+    but not to the first are only found if another band pairs them.
+    """
+    pairs = set()
+    for band in range(bands):
+        buckets = {}
+        start = band * rows
+        for path, signature in signatures.items():
+            buckets.setdefault(signature[start:start + rows], []).append(path)
+        for members in buckets.values():
+            if len(members) <= FULL_PAIRING_LIMIT:
+                pairs.update(itertools.combinations(members, 2))
+            else:
+                first, *others = members
+                pairs.update((first, other) for other in others)
+    return pairs
+
+
+def jaccard(left, right):
+    return len(left & right) / len(left | right) if left or right else 1.0
+
+
+def clusters_of(pairs):
+    """Connected components of the candidate graph (union-find)"""
+    parent = {}
+
+    def find(node):
+        parent.setdefault(node, node)
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for left, right in pairs:
+        parent[find(left)] = find(right)
+    groups = {}
+    for node in parent:
+        groups.setdefault(find(node), []).append(node)
+    return sorted((sorted(members) for members in groups.values()), key=lambda members: (-len(members), members))
+
+
+def find_near_duplicates(flats, threshold=0.8, bands=16, rows=4, min_languages=2):
+    """[[path, ...]] clusters of keys whose cross-language values are near-identical"""
+    vectors = {path: values for path, values in key_vectors(flats).items() if len(values) >= min_languages}
+    sets = {path: shingles(values) for path, values in vectors.items()}
+    hasher = MinHasher(bands * rows)
+    signatures = {path: hasher.signature(items) for path, items in sets.items() if items}
+
+    confirmed = [
+        (left, right)
+        for left, right in candidate_pairs(signatures, bands, rows)
+        if jaccard(sets[left], sets[right]) >= threshold
+    ]
+    return clusters_of(confirmed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find keys with near-identical values in every language')
+    parser.add_argument('--threshold', type=float, default=0.8, help='minimum Jaccard similarity')
+    parser.add_argument('--bands', type=int, default=16)
+    parser.add_argument('--rows', type=int, default=4)
+    parser.add_argument('--min-languages', type=int, default=2, help='ignore keys translated in fewer languages')
+    args = parser.parse_args()
+
+    flats = {lang: parsed.flat() for lang, parsed in load_locales().items()}
+    clusters = find_near_duplicates(flats, args.threshold, args.bands, args.rows, args.min_languages)
+    source = flats.get(SOURCE_LANG, {})
+    for members in clusters:
+        print(f"{len(members)} keys ~ {source[members[0]]!r}")
+        for path in members:
+            print(f"  {path}")
+    print(f"\n{len(clusters)} merge candidates covering {sum(map(len, clusters))} keys")
+
+
+if __name__ == '__main__':
+    main()
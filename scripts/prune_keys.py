@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+删除 src 中没有任何地方使用的翻译键
+
+存活的键 = 所有 t('…') 字面量 + dynamic_keys 解析出的动态键/前缀 + 白名单前缀。
+其余键从全部语言文件中删除，每个文件一次批量编辑；整段都不再使用的对象直接整段删除。
+被后面同名键覆盖的重复条目运行时读不到，也一并删除，报告里单独计数。
+删掉的键追加到 src/i18n/pruned-keys.json（需要提交），同步脚本不会再把它们加回其他语言。
+写入前记入 refactor_keys 的回滚日志，可用 `python scripts/refactor_keys.py rollback` 撤销。
+
+用法:
+    python scripts/prune_keys.py --dry-run
+    python scripts/prune_keys.py --keep errors. --keep legal.
+"""
+
+import argparse
+import os
+
+from dynamic_keys import is_live, live_keys
+from i18n_config import LANGUAGES, PRUNED_KEYS_PATH, REPO_ROOT, SRC_DIR, locale_path
+from locale_edits import apply_edits, remove_entry_edit, remove_object_edit, removal_span
+from locale_parser import parse_locale
+from refactor_keys import read_file, write_file, write_journal
+from scan_cache import ScanCache, find_source_files
+from translation_sources import load_pruned_keys, render_pruned_keys
+
+# 只在运行时拼接、静态分析看不到的键前缀（如来自接口数据的 key）
+KEEP_PREFIXES = []
+
+
+def dead_key_edits(parsed, keys, prefixes):
+    """(edits, dead keys, shadowed count) deleting every entry that is not live
+
+    An object whose leaves are all dead is removed as a whole, so no empty
+    sections are left behind. Entries shadowed by a later duplicate key are
+    unreachable at runtime and always removed.
+    """
+    dead = {path for path in parsed.entries if not is_live(path, keys, prefixes)}
+    if not dead and not parsed.shadowed:
+        return [], set(), 0
+
+    dead_objects = set()
+    for path in parsed.objects:
+        leaves = [entry for entry in parsed.entries if entry.startswith(path + '.')]
+        if all(leaf in dead for leaf in leaves):
+            dead_objects.add(path)
+
+    edits = []
+    for path in sorted(dead_objects):
+        if not any(path.startswith(outer + '.') for outer in dead_objects):
+            edits.append(remove_object_edit(parsed, path))
+    for path in sorted(dead):
+        if not any(path.startswith(obj + '.') for obj in dead_objects):
+            edits.append(remove_entry_edit(parsed, path))
+    for entry in parsed.shadowed:
+        if not any(entry.path.startswith(obj + '.') for obj in dead_objects):
+            start, end = removal_span(parsed.content, entry.key_start, entry.value_end)
+            edits.append((start, end, ''))
+    return edits, dead, len(parsed.shadowed)
+
+
+def plan(keys, prefixes):
+    """{filepath: (original, updated)}, a per-locale report and the set of dead keys"""
+    changes = {}
+    report = []
+    pruned = set()
+    for lang in LANGUAGES:
+        filepath = locale_path(lang)
+        if not os.path.exists(filepath):
+            continue
+        original = read_file(filepath)
+        parsed = parse_locale(original)
+        edits, dead, shadowed = dead_key_edits(parsed, keys, prefixes)
+        if not edits:
+            report.append((lang, 0, 0, len(parsed.entries), 0))
+            continue
+        pruned |= dead
+        updated = apply_edits(original, edits)
+        changes[filepath] = (original, updated)
+        saved = len(original.encode('utf-8')) - len(updated.encode('utf-8'))
+        report.append((lang, len(dead), shadowed, len(parsed.entries), saved))
+    return changes, report, pruned
+
+
+def record_pruned(changes, pruned, filepath=PRUNED_KEYS_PATH):
+    """Add the pruned-keys file to changes so it is journaled with the locale files"""
+    known = load_pruned_keys(filepath)
+    if pruned <= known:
+        return
+    original = read_file(filepath) if os.path.exists(filepath) else ''
+    changes[filepath] = (original, render_pruned_keys(known | pruned))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Remove translation keys unused anywhere in src')
+    parser.add_argument('--keep', action='append', default=[], metavar='PREFIX',
+                        help='key prefix to keep even if unused (repeatable)')
+    parser.add_argument('--dry-run', action='store_true', help='report without writing')
+    parser.add_argument('--force', action='store_true', help='prune even with unresolved dynamic t() calls')
+    args = parser.parse_args()
+
+    cache = ScanCache()
+    results = cache.scan_many(find_source_files(SRC_DIR))
+    cache.save()
+    keys, prefixes, unresolved = live_keys(results)
+    prefixes |= set(KEEP_PREFIXES) | set(args.keep)
+
+    if unresolved:
+        for relpath, line, column, source in unresolved:
+            print(f"  {relpath}:{line}:{column} t({source})")
+        if not args.force:
+            raise SystemExit(f"{len(unresolved)} dynamic t() calls could not be resolved; "
+                             "add --keep prefixes for them or pass --force")
+
+    changes, report, pruned = plan(keys, prefixes)
+    total = 0
+    for lang, removed, shadowed, count, saved in report:
+        print(f"  {lang}: {removed}/{count} keys unused, {shadowed} shadowed duplicates, {saved} bytes saved")
+        total += saved
+
+    if args.dry_run or not changes:
+        print(f"{'Would save' if changes else 'Nothing to prune;'} {total} bytes")
+        return
+    locale_files = len(changes)
+    record_pruned(changes, pruned)
+    journal = write_journal({}, changes)
+    for path, (_, updated) in changes.items():
+        write_file(path, updated)
+    print(f"Pruned {locale_files} locale files, {total} bytes saved "
+          f"(journal: {os.path.relpath(journal, REPO_ROOT)})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+批量重命名/移动翻译键：同时改写所有语言文件和所有 t() 调用点
+
+语言文件通过 locale_parser 的偏移量修改，调用点通过 key_index 定位，
+每个文件只读一次、写一次。写入前把原始内容记入回滚日志。
+动态键（labelKey: 'a.b' 这类字面量、t(`a.${x}`) 的模板头）按 dynamic_keys 的分析一并改写，
+无法改写的会给出警告。
+
+用法:
+    python scripts/refactor_keys.py apply home.weeklyDigest=newsletter.title --dry-run
+    python scripts/refactor_keys.py apply --map mappings.json
+    python scripts/refactor_keys.py rollback
+"""
+
+import argparse
+import difflib
+import glob
+import hashlib
+import json
+import os
+import time
+
+from dynamic_keys import resolve_sites
+from i18n_config import LANGUAGES, REPO_ROOT, cache_dir, locale_path
+from key_index import build_index
+from locale_edits import (
+    apply_edits, insertion_edits, removal_span, remove_entry_edit, remove_object_edit, rename_key_edit,
+)
+from locale_parser import parse_locale
+from scan_cache import ScanCache, find_source_files
+from tsx_scanner import LineIndex, string_value, template_parts, tokenize
+
+
+def read_file(filepath):
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def write_file(filepath, content):
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+def text_hash(content):
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def parent(path):
+    return path.rpartition('.')[0]
+
+
+def ancestors(path):
+    parts = path.split('.')
+    return ['.'.join(parts[:cut]) for cut in range(1, len(parts))]
+
+
+def mapped(key, mappings):
+    """Where key ends up under the mappings (directly or via a moved section), or None"""
+    new = mappings.get(key)
+    if new is not None:
+        return new
+    for old, new in mappings.items():
+        if key.startswith(old + '.'):
+            return new + key[len(old):]
+    return None
+
+
+def locale_edits_for(parsed, mappings):
+    """Edits that apply old → new mappings to one parsed locale; returns (edits, moved, conflicts)
+
+    A target conflicts when it, or one of its ancestors, already exists as a
+    key that is not being moved away. Entries shadowed by a later duplicate
+    key are removed together with the key they duplicate.
+    """
+    edits = []
+    additions = {}
+    removed = set()
+    moved = 0
+    conflicts = []
+    moving_away = set()
+    shadowed = {}
+    for entry in parsed.shadowed:
+        shadowed.setdefault(entry.path, []).append(entry)
+
+    for old in mappings:
+        if old in parsed.entries:
+            moving_away.add(old)
+        elif old in parsed.objects:
+            moving_away.update(path for path in parsed.entries if path.startswith(old + '.'))
+
+    for old, new in mappings.items():
+        if old in parsed.entries:
+            leaves = {old: new}
+        elif old in parsed.objects:
+            leaves = {path: new + path[len(old):] for path in parsed.entries if path.startswith(old + '.')}
+        else:
+            continue
+
+        clashes = [
+            target for target in leaves.values()
+            if (target in parsed.entries and target not in moving_away) or target in parsed.objects
+            or any(ancestor in parsed.entries and ancestor not in moving_away for ancestor in ancestors(target))
+        ]
+        if clashes or new in parsed.objects:
+            conflicts.append((old, new))
+            continue
+
+        moved += len(leaves)
+        same_parent = parent(old) == parent(new) and (not parent(new) or parent(new) in parsed.objects)
+        if not same_parent and old in parsed.objects:
+            # 整个对象被删除，里面被覆盖的重复键随之删除
+            edits.append(remove_object_edit(parsed, old))
+            removed.add(old)
+        else:
+            for path in leaves:
+                for entry in shadowed.get(path, ()):
+                    start, end = removal_span(parsed.content, entry.key_start, entry.value_end)
+                    edits.append((start, end, ''))
+        if same_parent:
+            # 同一层级内改名：只替换键名，保留位置和注释
+            edits.append(rename_key_edit(parsed, old, new.rpartition('.')[2]))
+            continue
+
+        if old in parsed.entries:
+            edits.append(remove_entry_edit(parsed, old))
+        removed.update(leaves)
+        for path, target in leaves.items():
+            additions[target] = parsed.entries[path].value
+
+    if additions:
+        edits.extend(insertion_edits(parsed, additions, removed))
+    return edits, moved, conflicts
+
+
+def line_starts(content):
+    starts = [0]
+    pos = content.find('\n')
+    while pos != -1:
+        starts.append(pos + 1)
+        pos = content.find('\n', pos + 1)
+    return starts
+
+
+def call_site_edits(content, sites, mappings):
+    """Edits rewriting the string literal of each t() call site
+
+    sites are (line, column, key) of the key literal; keys under a mapped
+    section are rewritten by prefix.
+    """
+    starts = line_starts(content)
+    edits = []
+    for line, column, key in sites:
+        new_key = mapped(key, mappings)
+        if new_key is None:
+            continue
+        offset = starts[line - 1] + column - 1
+        quote = content[offset]
+        literal = f'{quote}{key}{quote}'
+        if content.startswith(literal, offset):
+            edits.append((offset, offset + len(literal), f'{quote}{new_key}{quote}'))
+    return edits
+
+
+def template_head(raw):
+    parts = template_parts(raw)
+    return parts[0][1] if parts and not parts[0][0] else ''
+
+
+def touches(dynamic, mappings):
+    """Whether a file's dynamic keys may involve a mapped key"""
+    return bool(dynamic['unresolved']) or any(mapped(key, mappings) for key in dynamic['keys']) or any(
+        prefix.startswith(old + '.') or old.startswith(prefix) for prefix in dynamic['prefixes'] for old in mappings
+    )
+
+
+def dynamic_edits(content, jsx, dynamic, mappings, known_keys=()):
+    """(edits, warnings) for keys the file builds dynamically
+
+    String literals that dynamic_keys resolved as keys (e.g. labelKey:
+    'tasksPage.allTasks') are rewritten, and so are templates whose static
+    head lies inside a moved section (`tasksPage.${x}`). A call site that
+    can still build a mapped key afterwards cannot be fixed here and is
+    reported: a template like `tasksPage.${difficulty}` when one difficulty
+    key is renamed, or a prefix that covers a mapped key among known_keys.
+    """
+    keys = {key: mapped(key, mappings) for key in dynamic['keys']}
+    keys = {key: new for key, new in keys.items() if new is not None}
+    tokens = tokenize(content, jsx)
+    edits = []
+    covered = set()
+    rewritten = {}
+    for token in tokens:
+        if token.kind == 'string' and string_value(token.value) in keys:
+            quote = token.value[0]
+            edits.append((token.start, token.end, f'{quote}{keys[string_value(token.value)]}{quote}'))
+            covered.add(string_value(token.value))
+        elif token.kind == 'template':
+            head = template_head(token.value)
+            static = len(template_parts(token.value)) == 1
+            for old, new in mappings.items():
+                if head.startswith(old + '.') or (static and head == old):
+                    edits.append((token.start + 1, token.start + 1 + len(old), new))
+                    rewritten[token.start] = head
+                    break
+
+    def handled(key, arg):
+        # 模板参数只有自身被改写才算处理；变量取到的键可以来自已改写的字面量或模板
+        if arg.kind == 'template':
+            return arg.start in rewritten
+        return key in covered or any(key.startswith(head) for head in rewritten.values())
+
+    warnings = []
+    lines = LineIndex(content)
+    for _, arg, resolved in resolve_sites(tokens):
+        if not resolved:
+            continue
+        line, column = lines.line_col(arg.start)
+        moved = sorted(key for key in resolved.values if key in keys and not handled(key, arg))
+        if moved:
+            warnings.append(f"{line}:{column}: builds {moved[0]!r} dynamically and the mappings move it; update it by hand")
+        for prefix in sorted(resolved.prefixes):
+            # 前缀可能拼出的键里有被移动的才需要手改
+            moved = sorted(
+                key for key in known_keys
+                if key.startswith(prefix) and mapped(key, mappings) and not handled(key, arg)
+            )
+            if moved:
+                warnings.append(
+                    f"{line}:{column}: builds keys starting with {prefix!r}, which may include {moved[0]!r} "
+                    "that the mappings move; update it by hand"
+                )
+    for line, column, source in dynamic['unresolved']:
+        warnings.append(f"{line}:{column}: cannot tell which key t({source}) uses")
+    return edits, warnings
+
+
+def plan(mappings):
+    """{filepath: (original, updated)} for every locale and component the mappings touch"""
+    changes = {}
+    known_keys = set()
+
+    for lang in LANGUAGES:
+        filepath = locale_path(lang)
+        if not os.path.exists(filepath):
+            continue
+        original = read_file(filepath)
+        parsed = parse_locale(original)
+        known_keys.update(parsed.entries)
+        edits, moved, conflicts = locale_edits_for(parsed, mappings)
+        for old, new in conflicts:
+            print(f"  {lang}: cannot move {old} → {new}: the target or one of its parents already exists")
+        if edits:
+            changes[filepath] = (original, apply_edits(original, edits))
+            print(f"  {lang}: {moved} keys")
+
+    index, _ = build_index()
+    by_file = {}
+    for key in index.keys():
+        if mapped(key, mappings) is not None:
+            for relpath, line, column in index.who(key):
+                by_file.setdefault(relpath, []).append((line, column, key))
+
+    # t(`tasksPage.${x}`)、t(tab.labelKey) 这类调用不在索引里，按扫描出的动态键处理
+    cache = ScanCache()
+    results = cache.scan_many(find_source_files())
+    cache.save()
+
+    dynamic = {relpath: facts['dynamic'] for relpath, facts in results.items() if touches(facts['dynamic'], mappings)}
+
+    for relpath in sorted(set(by_file) | set(dynamic)):
+        filepath = os.path.join(REPO_ROOT, relpath)
+        original = read_file(filepath)
+        edits = {edit[0]: edit for edit in call_site_edits(original, by_file.get(relpath, ()), mappings)}
+        sites = len(edits)
+        if relpath in dynamic:
+            extra, warnings = dynamic_edits(
+                original, relpath.endswith('.tsx'), dynamic[relpath], mappings, known_keys,
+            )
+            for edit in extra:
+                edits.setdefault(edit[0], edit)
+            for warning in warnings:
+                print(f"  Warning: {relpath}: {warning}")
+        if edits:
+            changes[filepath] = (original, apply_edits(original, list(edits.values())))
+            print(f"  {relpath}: {sites} call sites, {len(edits) - sites} dynamic")
+
+    return changes
+
+
+def journal_dir():
+    return cache_dir('refactor-journal')
+
+
+def write_journal(mappings, changes):
+    filepath = os.path.join(journal_dir(), f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.json")
+    journal = {
+        'mappings': mappings,
+        'files': {
+            os.path.relpath(path, REPO_ROOT): {'original': original, 'written': text_hash(updated)}
+            for path, (original, updated) in changes.items()
+        },
+    }
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(journal, f, ensure_ascii=False)
+    return filepath
+
+
+def rollback(force=False):
+    """Restore the files recorded in the most recent journal"""
+    journals = sorted(glob.glob(os.path.join(journal_dir(), '*.json')))
+    if not journals:
+        print("Nothing to roll back")
+        return
+    filepath = journals[-1]
+    with open(filepath, 'r', encoding='utf-8') as f:
+        journal = json.load(f)
+
+    for relpath, record in journal['files'].items():
+        path = os.path.join(REPO_ROOT, relpath)
+        current = read_file(path) if os.path.exists(path) else ''
+        if text_hash(current) != record['written'] and not force:
+            print(f"Skipped (modified since refactor): {relpath}")
+            continue
+        write_file(path, record['original'])
+        print(f"Restored: {relpath}")
+    os.remove(filepath)
+
+
+def parse_mappings(pairs, map_file):
+    mappings = {}
+    if map_file:
+        with open(map_file, 'r', encoding='utf-8') as f:
+            mappings.update(json.load(f))
+    for pair in pairs:
+        old, sep, new = pair.partition('=')
+        if not sep or not old or not new:
+            raise SystemExit(f"Invalid mapping (expected old=new): {pair}")
+        mappings[old] = new
+    return mappings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rename translation keys in locales and components')
+    sub = parser.add_subparsers(dest='command', required=True)
+    apply = sub.add_parser('apply', help='apply old=new key mappings')
+    apply.add_argument('pairs', nargs='*', metavar='old=new')
+    apply.add_argument('--map', help='JSON file with {"old.path": "new.path"} mappings')
+    apply.add_argument('--dry-run', action='store_true', help='print a diff instead of writing')
+    undo = sub.add_parser('rollback', help='undo the last applied refactor')
+    undo.add_argument('--force', action='store_true', help='restore even files modified since')
+    args = parser.parse_args()
+
+    if args.command == 'rollback':
+        rollback(args.force)
+        return
+
+    mappings = parse_mappings(args.pairs, args.map)
+    if not mappings:
+        raise SystemExit("No mappings given")
+
+    changes = plan(mappings)
+    if args.dry_run:
+        for path, (original, updated) in changes.items():
+            relpath = os.path.relpath(path, REPO_ROOT)
+            print(''.join(difflib.unified_diff(
+                original.splitlines(True), updated.splitlines(True), f'a/{relpath}', f'b/{relpath}',
+            )))
+        return
+
+    if not changes:
+        print("Nothing to change")
+        return
+    journal = write_journal(mappings, changes)
+    for path, (_, updated) in changes.items():
+        write_file(path, updated)
+    print(f"Updated {len(changes)} files (journal: {os.path.relpath(journal, REPO_ROOT)})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+组件扫描缓存 - 所有扫描器（组件改写、键索引、硬编码文字提取）共用
+
+每个文件按 (路径, 大小, mtime, blake2 哈希) 缓存一次扫描得到的事实：
+是否导入 useLanguage、用到的 t() 键（含动态键分析结果）、组件范围、硬编码文字。
+大小和 mtime 没变就直接命中；变了再比较内容哈希，内容没变只刷新 stat。
+--since <ref> 时只重新扫描 git 记录的改动文件。
+"""
+
+import argparse
+import hashlib
+import os
+import pickle
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from dynamic_keys import analyze_dynamic_keys
+from git_changes import changed_since
+from i18n_config import REPO_ROOT, SRC_DIR, cache_path
+from tsx_scanner import (
+    LineIndex, calls_t, component_at, find_components, has_translator,
+    match_brackets, string_value, t_calls, tokenize,
+)
+
+# 缓存格式版本，扫描规则改变时递增
+CACHE_VERSION = 6
+
+USE_LANGUAGE_IMPORT = re.compile(r"import\s*\{[^}]*\buseLanguage\b")
+TEXT_PROPS = frozenset(['placeholder', 'title', 'aria-label', 'alt'])
+HAS_LETTER = re.compile(r'[^\W\d_]')
+
+# 少于这么多文件未命中时不启动进程池
+PARALLEL_THRESHOLD = 16
+
+
+def find_source_files(root=SRC_DIR, extensions=('.ts', '.tsx')):
+    files = []
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            if filename.endswith(extensions) and not filename.endswith('.d.ts'):
+                files.append(os.path.join(dirpath, filename))
+    return sorted(files)
+
+
+def content_hash(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def find_hardcoded_strings(tokens, components, lines):
+    """JSX text nodes and text-bearing string props: dicts of component, kind, text, line, column"""
+    found = []
+    for index, token in enumerate(tokens):
+        if token.kind == 'jsx_text':
+            kind, text = 'text', token.value
+        elif token.kind == 'jsx_attr' and token.value in TEXT_PROPS and index + 1 < len(tokens) \
+                and tokens[index + 1].kind == 'string' and tokens[index + 1].start > token.end:
+            kind, text = token.value, string_value(tokens[index + 1].value)
+        else:
+            continue
+        if not HAS_LETTER.search(text):
+            continue
+        component = component_at(components, index)
+        line, column = lines.line_col(token.start)
+        found.append({
+            'component': component.name if component else None,
+            'kind': kind,
+            'text': text,
+            'line': line,
+            'column': column,
+        })
+    return found
+
+
+def scan_source(content, jsx=True):
+    """Extract every fact the i18n tools need from one source file"""
+    tokens = tokenize(content, jsx)
+    matches = match_brackets(tokens)
+    components = find_components(tokens, matches)
+    lines = LineIndex(content)
+
+    keys = []
+    templates = []
+    stray = []
+    for index, arg in t_calls(tokens):
+        line, column = lines.line_col(arg.start)
+        if component_at(components, index) is None:
+            stray.append(line)
+        if arg.kind == 'string':
+            keys.append((string_value(arg.value), line, column))
+        elif arg.kind == 'template':
+            templates.append((arg.value, line, column))
+
+    return {
+        'imports_use_language': bool(USE_LANGUAGE_IMPORT.search(content)),
+        'keys': keys,
+        'templates': templates,
+        'components': [
+            {
+                'name': component.name,
+                'exported': component.exported,
+                'start': tokens[component.start].start,
+                'end': tokens[component.end].end,
+                'line': lines.line_col(tokens[component.start].start)[0],
+                'calls_t': calls_t(tokens, component.start, component.end),
+                'needs_hook': calls_t(tokens, component.start, component.end)
+                and not has_translator(tokens, component),
+            }
+            for component in components
+        ],
+        # 不在任何可识别组件里的 t( 调用所在行，codemod 无法为它们注入 hook
+        'stray_t': stray,
+        'strings': find_hardcoded_strings(tokens, components, lines) if jsx else [],
+        'dynamic': analyze_dynamic_keys(tokens, lines, matches),
+    }
+
+
+def _scan_worker(job):
+    relpath, content = job
+    return relpath, scan_source(content, relpath.endswith('.tsx'))
+
+
+class ScanCache:
+    """Persistent per-file scan results, stored in .i18n-cache/scan.pickle"""
+
+    def __init__(self, filepath=None):
+        self.filepath = filepath or cache_path('scan.pickle')
+        self.entries = {}
+        self.dirty = False
+        try:
+            with open(self.filepath, 'rb') as f:
+                data = pickle.load(f)
+            if data.get('version') == CACHE_VERSION:
+                self.entries = data['entries']
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            pass
+
+    def save(self):
+        if not self.dirty:
+            return
+        tmp_path = self.filepath + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'version': CACHE_VERSION, 'entries': self.entries}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.filepath)
+        self.dirty = False
+
+    def _lookup(self, path):
+        """Return (relpath, cached facts or None, pending (size, mtime, hash, content))"""
+        relpath = os.path.relpath(path, REPO_ROOT)
+        stat = os.stat(path)
+        entry = self.entries.get(relpath)
+        if entry and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime_ns:
+            return relpath, entry['facts'], None
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest = content_hash(data)
+        if entry and entry['hash'] == digest:
+            entry['size'], entry['mtime'] = stat.st_size, stat.st_mtime_ns
+            self.dirty = True
+            return relpath, entry['facts'], None
+        return relpath, None, (stat.st_size, stat.st_mtime_ns, digest, data.decode('utf-8'))
+
+    def _store(self, relpath, pending, facts):
+        size, mtime, digest, _ = pending
+        self.entries[relpath] = {'size': size, 'mtime': mtime, 'hash': digest, 'facts': facts}
+        self.dirty = True
+
+    def facts(self, path):
+        """Scan facts for one file, rescanning only if it changed"""
+        relpath, facts, pending = self._lookup(path)
+        if facts is None:
+            facts = scan_source(pending[3], relpath.endswith('.tsx'))
+            self._store(relpath, pending, facts)
+        return facts
+
+    def scan_many(self, paths, workers=None):
+        """{relpath: facts} for every path; misses are scanned in a process pool"""
+        results = {}
+        misses = {}
+        for path in paths:
+            relpath, facts, pending = self._lookup(path)
+            if facts is None:
+                misses[relpath] = pending
+            else:
+                results[relpath] = facts
+
+        jobs = [(relpath, pending[3]) for relpath, pending in misses.items()]
+        if len(jobs) >= PARALLEL_THRESHOLD:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                scanned = list(executor.map(_scan_worker, jobs, chunksize=8))
+        else:
+            scanned = [_scan_worker(job) for job in jobs]
+
+        for relpath, facts in scanned:
+            self._store(relpath, misses[relpath], facts)
+            results[relpath] = facts
+        return results
+
+    def hash(self, relpath):
+        entry = self.entries.get(relpath)
+        return entry['hash'] if entry else None
+
+    def forget(self, paths):
+        """Drop entries for the given (deleted) files"""
+        for path in paths:
+            if self.entries.pop(os.path.relpath(path, REPO_ROOT), None) is not None:
+                self.dirty = True
+
+    def forget_missing(self):
+        """Drop entries for files that no longer exist"""
+        for relpath in list(self.entries):
+            if not os.path.exists(os.path.join(REPO_ROOT, relpath)):
+                del self.entries[relpath]
+                self.dirty = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Update the shared scan cache for src')
+    parser.add_argument('--since', metavar='REF', help='only rescan files changed since this git ref')
+    args = parser.parse_args()
+
+    cache = ScanCache()
+    if args.since:
+        changed, deleted = changed_since(args.since, ('.ts', '.tsx'), SRC_DIR)
+        results = cache.scan_many(changed)
+        cache.forget(deleted)
+    else:
+        results = cache.scan_many(find_source_files())
+        cache.forget_missing()
+    cache.save()
+    keys = sum(len(facts['keys']) for facts in results.values())
+    print(f"{len(results)} files, {keys} t() calls")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+跨语言结构检查：每个语言文件的键结构应与 en 一致
+
+对每个语言文件的每个子树计算 Merkle 式哈希（只看键名和层级，不看值），
+从根开始与 en 比较：哈希相同的子树直接跳过，只有不同的子树才继续向下，
+比较成本与差异大小成正比。子树哈希按文件内容哈希缓存，未改动的语言不用重算。
+
+用法:
+    python scripts/shape_check.py
+    python scripts/shape_check.py ja ko
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+
+from i18n_config import LANGUAGES, SOURCE_LANG, cache_path, locale_path
+from locale_parser import file_hash, read_locale
+
+CACHE_VERSION = 1
+LEAF = 'leaf'
+
+
+class Shape:
+    """Subtree hashes, children and leaf counts of one locale, keyed by dotted path ('' is the root)"""
+
+    __slots__ = ('hashes', 'children', 'sizes')
+
+    def __init__(self, hashes, children, sizes):
+        self.hashes = hashes
+        self.children = children
+        self.sizes = sizes
+
+
+def build_shape(parsed):
+    children = {'': {}}
+    for path in parsed.objects:
+        children.setdefault(path, {})
+    for path in parsed.objects:
+        parent, _, name = path.rpartition('.')
+        children.setdefault(parent, {})[name] = path
+    for path in parsed.entries:
+        parent, _, name = path.rpartition('.')
+        children.setdefault(parent, {})[name] = LEAF
+
+    hashes = {}
+    sizes = {}
+    # 深的路径先算，父节点用到的子节点哈希都已就绪
+    for path in sorted(children, key=lambda path: -path.count('.') if path else 1):
+        hasher = hashlib.blake2b(digest_size=16)
+        size = 0
+        for name in sorted(children[path]):
+            child = children[path][name]
+            if child == LEAF:
+                hasher.update(f'{name}\0{LEAF}\n'.encode('utf-8'))
+                size += 1
+            else:
+                hasher.update(f'{name}\0'.encode('utf-8') + hashes[child] + b'\n')
+                size += sizes[child]
+        hashes[path] = hasher.digest()
+        sizes[path] = size
+    return Shape(hashes, children, sizes)
+
+
+class ShapeCache:
+    """Shapes of locale files, reused while the file's content hash is unchanged"""
+
+    def __init__(self):
+        self.filepath = cache_path('shapes.pickle')
+        self.entries = {}
+        try:
+            with open(self.filepath, 'rb') as f:
+                data = pickle.load(f)
+            if data.get('version') == CACHE_VERSION:
+                self.entries = data['entries']
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            pass
+        self.dirty = False
+
+    def shape(self, lang):
+        filepath = locale_path(lang)
+        digest = file_hash(filepath)
+        cached = self.entries.get(lang)
+        if cached and cached[0] == digest:
+            return cached[1]
+        shape = build_shape(read_locale(filepath))
+        self.entries[lang] = (digest, shape)
+        self.dirty = True
+        return shape
+
+    def save(self):
+        if not self.dirty:
+            return
+        tmp_path = self.filepath + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'version': CACHE_VERSION, 'entries': self.entries}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.filepath)
+
+
+def compare_shapes(source, other):
+    """[(kind, path, leaf count or None for a single key)] where other's structure differs from source's
+
+    kind is 'missing', 'extra' or 'kind' (a key is a section in one file and a
+    string in the other). Subtrees with equal hashes are never visited.
+    """
+    diffs = []
+    stack = [''] if source.hashes[''] != other.hashes[''] else []
+    while stack:
+        path = stack.pop()
+        ours = source.children[path]
+        theirs = other.children[path]
+        for name in sorted(ours.keys() | theirs.keys()):
+            child = f'{path}.{name}' if path else name
+            mine = ours.get(name)
+            found = theirs.get(name)
+            if found is None:
+                diffs.append(('missing', child, None if mine == LEAF else source.sizes[mine]))
+            elif mine is None:
+                diffs.append(('extra', child, None if found == LEAF else other.sizes[found]))
+            elif (mine == LEAF) != (found == LEAF):
+                diffs.append(('kind', child, None))
+            elif mine != LEAF and source.hashes[mine] != other.hashes[found]:
+                stack.append(child)
+    return sorted(diffs, key=lambda diff: diff[1])
+
+
+def main():
+    languages = [lang for lang in (sys.argv[1:] or LANGUAGES) if lang != SOURCE_LANG]
+    cache = ShapeCache()
+    source = cache.shape(SOURCE_LANG)
+
+    total = 0
+    for lang in languages:
+        if not os.path.exists(locale_path(lang)):
+            print(f"File not found: {locale_path(lang)}")
+            continue
+        diffs = compare_shapes(source, cache.shape(lang))
+        for kind, path, size in diffs:
+            if kind == 'kind':
+                print(f"{lang}: section/string mismatch: {path}")
+            else:
+                print(f"{lang}: {kind} {'key' if size is None else f'section ({size} keys)'}: {path}")
+        print(f"{lang}: {'same shape as ' + SOURCE_LANG if not diffs else f'{len(diffs)} differences'}")
+        total += len(diffs)
+    cache.save()
+    sys.exit(1 if total else 0)
+
+
+if __name__ == '__main__':
+    main()
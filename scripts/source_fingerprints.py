@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+过期译文检测：记录每条译文对应的英文原文指纹
+
+指纹存放在旁路索引 FINGERPRINTS_PATH（JSON，不写进 .ts），结构为 {语言: {键: 指纹}}。
+英文改动后，只有指纹对不上的译文被标记为过期并进入重译队列，
+machine_translate --stale 只重译这些条目，工作量与改动量成正比。
+
+用法:
+    python scripts/source_fingerprints.py check
+    python scripts/source_fingerprints.py record              # 为尚未记录的译文建立基线
+    python scripts/source_fingerprints.py accept de tasks.unlockMessage   # 人工确认译文已更新
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+from i18n_config import FINGERPRINTS_PATH, SOURCE_LANG, cache_path
+from locale_parser import load_locales
+
+INDEX_VERSION = 1
+
+
+def fingerprint(text):
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def queue_path():
+    return cache_path('retranslate-queue.json')
+
+
+class FingerprintIndex:
+    """{lang: {path: fingerprint of the source text the translation was made from}}"""
+
+    def __init__(self, locales=None):
+        self.locales = locales or {}
+
+    @classmethod
+    def load(cls, filepath=FINGERPRINTS_PATH):
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return cls()
+        return cls(data.get('locales', {}) if data.get('version') == INDEX_VERSION else {})
+
+    def save(self, filepath=FINGERPRINTS_PATH):
+        data = {'version': INDEX_VERSION, 'source': SOURCE_LANG, 'locales': self.locales}
+        tmp_path = filepath + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2, sort_keys=True)
+            f.write('\n')
+        os.replace(tmp_path, filepath)
+
+    def record(self, lang, source, paths):
+        """Mark the translations at paths as made from the current source text"""
+        recorded = self.locales.setdefault(lang, {})
+        for path in paths:
+            if path in source:
+                recorded[path] = fingerprint(source[path])
+
+    def record_untracked(self, flats, source_lang=SOURCE_LANG):
+        """Baseline every translation that has no fingerprint yet; returns how many were added"""
+        source = flats.get(source_lang, {})
+        added = 0
+        for lang, flat in flats.items():
+            if lang == source_lang:
+                continue
+            recorded = self.locales.get(lang, {})
+            untracked = [path for path in flat if path in source and path not in recorded]
+            self.record(lang, source, untracked)
+            added += len(untracked)
+        return added
+
+    def forget_missing(self, flats, source_lang=SOURCE_LANG):
+        """Drop fingerprints of keys that no longer exist in the locale or the source
+
+        Languages absent from flats are left alone.
+        """
+        source = flats.get(source_lang, {})
+        for lang, recorded in self.locales.items():
+            if lang not in flats:
+                continue
+            flat = flats[lang]
+            for path in [path for path in recorded if path not in flat or path not in source]:
+                del recorded[path]
+
+    def stale(self, flats, source_lang=SOURCE_LANG):
+        """{lang: {path: current source text}} for translations whose source changed since recorded"""
+        source = flats.get(source_lang, {})
+        result = {}
+        for lang, recorded in self.locales.items():
+            flat = flats.get(lang, {})
+            entries = {
+                path: source[path]
+                for path, digest in recorded.items()
+                if path in flat and path in source and fingerprint(source[path]) != digest
+            }
+            if entries:
+                result[lang] = entries
+        return result
+
+
+def load_queue():
+    try:
+        with open(queue_path(), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def write_queue(stale, languages=None):
+    """Write the retranslation queue
+
+    With languages (the ones stale was computed for), entries already queued
+    for other languages are kept.
+    """
+    if languages is not None:
+        kept = {lang: entries for lang, entries in load_queue().items() if lang not in languages}
+        stale = {**kept, **stale}
+    with open(queue_path(), 'w', encoding='utf-8') as f:
+        json.dump(stale, f, ensure_ascii=False, indent=2)
+    return stale
+
+
+def load_flats():
+    return {lang: parsed.flat() for lang, parsed in load_locales().items()}
+
+
+def sync_report(flats=None):
+    """Baseline new translations, flag stale ones and queue them; used after syncing locales"""
+    flats = flats or load_flats()
+    index = FingerprintIndex.load()
+    added = index.record_untracked(flats)
+    index.forget_missing(flats)
+    index.save()
+
+    # 只加载了部分语言时（sync_translations --since），其余语言已排队的条目保留
+    stale = index.stale(flats)
+    queued = write_queue(stale, set(flats))
+    for lang, entries in stale.items():
+        for path in entries:
+            print(f"  stale: {lang}: {path}")
+    count = sum(len(entries) for entries in queued.values())
+    print(f"{added} new fingerprints recorded, {count} stale translations queued for retranslation")
+    return stale
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Track which translations are out of date with en')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('check', help='list stale translations (exit 1 if any)')
+    sub.add_parser('record', help='fingerprint translations that have none yet and queue stale ones')
+    accept = sub.add_parser('accept', help='mark translations as up to date with the current source')
+    accept.add_argument('lang')
+    accept.add_argument('paths', nargs='*', help='key paths (default: every stale key of lang)')
+    args = parser.parse_args()
+
+    flats = load_flats()
+    if args.command == 'record':
+        sync_report(flats)
+        return
+
+    index = FingerprintIndex.load()
+    stale = index.stale(flats)
+    if args.command == 'accept':
+        paths = args.paths or list(stale.get(args.lang, {}))
+        index.record(args.lang, flats.get(SOURCE_LANG, {}), paths)
+        index.save()
+        print(f"Accepted {len(paths)} translations in {args.lang}")
+        return
+
+    for lang, entries in stale.items():
+        for path, text in entries.items():
+            print(f"{lang}: {path}: source is now {text!r}")
+    count = sum(len(entries) for entries in stale.values())
+    print(f"\n{count} stale translations")
+    sys.exit(1 if count else 0)
+
+
+if __name__ == '__main__':
+    main()
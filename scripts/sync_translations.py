@@ -1,12 +1,22 @@
 #!/usr/bin/env python3
 """
 同步所有语言文件的翻译键，确保所有语言都有相同的键结构
+
+英文是键结构的准绳：英文文件里没有的键（包括 prune_keys.py 删掉的）不会被加进其他语言。
 """
 
+import argparse
 import os
 import re
 import json
 
+from git_changes import changed_since
+from i18n_config import LOCALES_DIR, SOURCE_LANG
+from locale_parser import load_locales
+from source_fingerprints import sync_report
+from translation_sources import group_by_section, source_keys, transpose_key_major
+from validate_placeholders import report, validate_locale_dir
+
 # 翻译映射表 - 从英语到其他语言
 TRANSLATIONS = {
     # whyDifferent section
@@ -526,20 +536,22 @@ def write_file(filepath, content):
     with open(filepath, 'w', encoding='utf-8') as f:
         f.write(content)
 
-def add_translations_to_file(filepath, lang):
-    """Add missing translations to a language file"""
+def add_translations_to_file(filepath, lang, entries):
+    """Add missing translations to a language file
+
+    entries is this language's flat {'section.key': value} slice.
+    """
     content = read_file(filepath)
     
-    for section, keys in TRANSLATIONS.items():
+    for section, keys in group_by_section(entries).items():
         # Check if section exists
         section_pattern = rf'{section}:\s*\{{'
         if not re.search(section_pattern, content):
             # Add section before the closing brace
             section_content = f"\n  // {section.title()}\n  {section}: {{\n"
-            for key, translations in keys.items():
-                if lang in translations:
-                    value = translations[lang].replace("'", "\\'")
-                    section_content += f"    {key}: '{value}',\n"
+            for key, value in keys.items():
+                value = value.replace("'", "\\'")
+                section_content += f"    {key}: '{value}',\n"
             section_content += "  },\n"
             
             # Insert before the last closing brace
@@ -548,33 +560,61 @@ def add_translations_to_file(filepath, lang):
                 content = content[:-1] + section_content + "};\n"
         else:
             # Section exists, add missing keys
-            for key, translations in keys.items():
-                if lang in translations:
-                    key_pattern = rf'{section}:\s*\{{[^}}]*{key}:'
-                    if not re.search(key_pattern, content, re.DOTALL):
-                        # Find the section and add the key
-                        value = translations[lang].replace("'", "\\'")
-                        new_key = f"    {key}: '{value}',\n"
-                        
-                        # Find the section opening brace and add after it
-                        section_match = re.search(rf'({section}:\s*\{{)', content)
-                        if section_match:
-                            insert_pos = section_match.end()
-                            content = content[:insert_pos] + '\n' + new_key + content[insert_pos:]
+            for key, value in keys.items():
+                key_pattern = rf'{section}:\s*\{{[^}}]*{key}:'
+                if not re.search(key_pattern, content, re.DOTALL):
+                    # Find the section and add the key
+                    value = value.replace("'", "\\'")
+                    new_key = f"    {key}: '{value}',\n"
+                    
+                    # Find the section opening brace and add after it
+                    section_match = re.search(rf'({section}:\s*\{{)', content)
+                    if section_match:
+                        insert_pos = section_match.end()
+                        content = content[:insert_pos] + '\n' + new_key + content[insert_pos:]
     
     write_file(filepath, content)
     print(f"Updated: {filepath}")
 
+def changed_languages(since, base_path, languages):
+    """Languages whose locale file changed since the git ref; all of them if en or this script changed"""
+    changed, deleted = changed_since(since, ('.ts', '.py'))
+    changed += deleted
+    if os.path.abspath(__file__) in changed or os.path.join(base_path, f'{SOURCE_LANG}.ts') in changed:
+        return languages
+    return [lang for lang in languages if os.path.join(base_path, f'{lang}.ts') in changed]
+
 def main():
-    base_path = '/home/ubuntu/follow-ai-source/follow.ai/src/i18n/locales'
+    parser = argparse.ArgumentParser(description='Sync TRANSLATIONS into the locale files')
+    parser.add_argument('--since', metavar='REF', help='only locales changed since this git ref')
+    args = parser.parse_args()
+    
+    base_path = LOCALES_DIR
     languages = ['zh', 'ja', 'ko', 'es', 'fr', 'de', 'pt', 'ru', 'ar']
+    if args.since:
+        languages = changed_languages(args.since, base_path, languages)
+        print(f"Languages changed since {args.since}: {', '.join(languages) or 'none'}")
+    
+    # 一次遍历 TRANSLATIONS，每个语言只处理自己的切片
+    slices = transpose_key_major(TRANSLATIONS)
+    present = source_keys(os.path.join(base_path, f'{SOURCE_LANG}.ts'))
     
     for lang in languages:
         filepath = os.path.join(base_path, f'{lang}.ts')
         if os.path.exists(filepath):
-            add_translations_to_file(filepath, lang)
+            entries = slices.get(lang, {})
+            kept = {path: value for path, value in entries.items() if path in present}
+            if len(kept) < len(entries):
+                print(f"Skipped (not in {SOURCE_LANG}): {len(entries) - len(kept)} keys for {lang}")
+            add_translations_to_file(filepath, lang, kept)
         else:
             print(f"File not found: {filepath}")
+    
+    # 同步后检查占位符是否与英文一致
+    report(validate_locale_dir(base_path, [SOURCE_LANG] + languages))
+
+    # 记录新译文的英文指纹，英文已改动的旧译文进入重译队列
+    sync_report({lang: parsed.flat() for lang, parsed in load_locales([SOURCE_LANG] + languages, base_path).items()})
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 脚本之间按模块名互相导入，测试时把 scripts/ 放进 sys.path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
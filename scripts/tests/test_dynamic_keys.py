@@ -0,0 +1,136 @@
+from dynamic_keys import analyze_dynamic_keys, is_live, live_keys
+from tsx_scanner import LineIndex, tokenize
+
+
+def analyze(source):
+    return analyze_dynamic_keys(tokenize(source), LineIndex(source))
+
+
+def test_template_over_type_union():
+    result = analyze("""
+type Cat = 'food' | 'drink';
+const Row = (cat: Cat) => t(`reviews.${cat}`);
+""")
+    assert result == {'keys': ['reviews.drink', 'reviews.food'], 'prefixes': [], 'unresolved': []}
+
+
+def test_same_name_parameter_elsewhere_falls_back_to_prefix():
+    result = analyze("""
+const Other = () => { const status = 'open'; return t(`badge.${status}`); };
+const Badge = ({ status }: { status: string }) => t(`badge.${status}`);
+""")
+    assert result['keys'] == []
+    assert result['prefixes'] == ['badge.']
+
+
+def test_reassignment_adds_a_value_source():
+    result = analyze("""
+function F({ mode }) { let key = 'x.default'; if (mode) key = `x.${mode}`; return t(key); }
+""")
+    assert result['keys'] == ['x.default']
+    assert result['prefixes'] == ['x.']
+
+
+def test_compound_assignment_is_unresolved():
+    result = analyze("let key = 'a.b'; key += '.c'; t(key);")
+    assert [source for _, _, source in result['unresolved']] == ['key']
+
+
+def test_non_literal_array_element_is_unresolved():
+    result = analyze("""
+const tabs = [{labelKey: 'tabs.a'}, {labelKey: extra}];
+tabs.map((tab) => t(tab.labelKey));
+""")
+    assert result['keys'] == []
+    assert len(result['unresolved']) == 1
+
+
+def test_member_of_local_array_of_objects():
+    result = analyze("""
+const tabs = [{ id: 'a', labelKey: 'tabs.a' }, { id: 'b', labelKey: 'tabs.b' }];
+tabs.map((tab) => t(tab.labelKey));
+[{ labelKey: 'tabs.c' }].map((tab) => t(tab.labelKey));
+""")
+    assert result['keys'] == ['tabs.a', 'tabs.b', 'tabs.c']
+    assert result['unresolved'] == []
+
+
+def test_member_is_not_matched_by_property_name_alone():
+    # 同名属性出现在别的对象里，不能当作 n.type 的取值
+    result = analyze("""
+const DEFAULT = { type: 'info' };
+const List = ({ items }) => items.map((n) => t(`notifications.${n.type}`));
+""")
+    assert result['keys'] == []
+    assert result['prefixes'] == ['notifications.']
+
+
+def test_member_of_spread_array_is_unresolved():
+    result = analyze("""
+const LOCAL = [{ labelKey: 'tabs.local' }];
+[...LOCAL, ...EXTRA].map(tab => t(tab.labelKey));
+""")
+    assert result['keys'] == []
+    assert len(result['unresolved']) == 1
+
+
+def test_member_of_parameter_typed_by_interface():
+    result = analyze("""
+interface P { status: string }
+const ok = { status: 'ok' };
+const Row = (p: P) => t(`s.${p.status}`);
+""")
+    assert result['keys'] == []
+    assert result['prefixes'] == ['s.']
+
+
+def test_member_declared_as_literal_union():
+    result = analyze("""
+interface Task { difficulty: 'beginner' | 'advanced'; title?: string }
+const Row = ({ tasks }) => tasks.map((task) => t(`tasksPage.${task.difficulty}`));
+""")
+    assert result['keys'] == ['tasksPage.advanced', 'tasksPage.beginner']
+
+
+def test_member_union_with_another_declaration_stays_a_prefix():
+    result = analyze("""
+interface Task { difficulty: 'beginner' | 'advanced' }
+interface Legacy { difficulty: string }
+const Row = ({ tasks }) => tasks.map((task) => t(`tasksPage.${task.difficulty}`));
+""")
+    assert result['keys'] == []
+    assert result['prefixes'] == ['tasksPage.']
+
+
+def test_ternary_needs_every_branch():
+    result = analyze("""
+const A = ({ on }) => t(on ? 'a.on' : other);
+const B = ({ on }) => t(on ? 'a.on' : 'a.off');
+""")
+    assert result['keys'] == ['a.off', 'a.on']
+    assert len(result['unresolved']) == 1
+
+
+def test_concatenation_is_not_a_literal():
+    result = analyze("const k = 'a.' + suffix; t(k);")
+    assert result['keys'] == []
+    assert len(result['unresolved']) == 1
+
+
+def test_for_of_element():
+    result = analyze("const KEYS = ['f.a', 'f.b']; for (const k of KEYS) { t(k); }")
+    assert result['keys'] == ['f.a', 'f.b']
+
+
+def test_live_keys_and_is_live():
+    facts = {
+        'src/a.tsx': {
+            'keys': [('home.title', 1, 3)],
+            'dynamic': {'keys': ['tabs.a'], 'prefixes': ['badge.'], 'unresolved': [(4, 2, 'x')]},
+        },
+    }
+    keys, prefixes, unresolved = live_keys(facts)
+    assert keys == {'home.title', 'tabs.a'}
+    assert unresolved == [('src/a.tsx', 4, 2, 'x')]
+    assert is_live('badge.open', keys, prefixes)
+    assert not is_live('home.subtitle', keys, prefixes)
@@ -0,0 +1,55 @@
+import pytest
+
+import fuzzy_memory
+from fuzzy_memory import FuzzyIndex, FuzzyMemory
+
+TEXTS = ['Start task', 'Start Task now', '{count} minutes ago', '{count} min ago', 'Settings', 'Sign out']
+
+try:
+    import numpy
+except ImportError:  # NumPy 是可选依赖
+    numpy = None
+
+MODES = [
+    pytest.param(numpy, id='numpy', marks=pytest.mark.skipif(numpy is None, reason='NumPy not installed')),
+    pytest.param(None, id='pure-python'),
+]
+
+
+class Memory:
+    def entries(self):
+        yield 'Start task', 'de', 'Aufgabe starten'
+        yield '{count} minutes ago', 'de', 'vor {count} Minuten'
+        yield '{count} min ago', 'pt', 'há {count} min'
+        yield 'Settings', 'ja', '設定'
+
+
+def search_all(monkeypatch, np):
+    monkeypatch.setattr(fuzzy_memory, 'np', np)
+    index = FuzzyIndex(TEXTS)
+    return [
+        index.search(query, k, threshold, allowed)
+        for query in ('Start Task', '{count} minutes ago', 'zzz')
+        for k in (1, 2, 10)
+        for threshold in (-1.0, 0.0, 0.3, 0.9)
+        for allowed in (None, {0, 2}, {5})
+    ]
+
+
+@pytest.mark.parametrize('np', MODES)
+def test_numpy_and_pure_python_agree(monkeypatch, np):
+    expected = search_all(monkeypatch, None)
+    results = search_all(monkeypatch, np)
+    assert [[(round(score, 6), text) for score, text in found] for found in results] == \
+        [[(round(score, 6), text) for score, text in found] for found in expected]
+
+
+@pytest.mark.parametrize('np', MODES)
+def test_suggest_ignores_sources_without_the_target_at_any_threshold(monkeypatch, np):
+    monkeypatch.setattr(fuzzy_memory, 'np', np)
+    fuzzy = FuzzyMemory(Memory())
+
+    suggestions = fuzzy.suggest('{count} minutes ago', 'de', k=5, threshold=0.0)
+
+    assert [source for _, source, _ in suggestions] == ['{count} minutes ago']
+    assert suggestions[0][2] == 'vor {count} Minuten'
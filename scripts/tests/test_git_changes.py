@@ -0,0 +1,42 @@
+import os
+import subprocess
+
+import git_changes
+from git_changes import changed_since
+
+
+def git(repo, *args):
+    subprocess.run(
+        ['git', *args], cwd=repo, capture_output=True, check=True,
+        env={**os.environ, 'GIT_AUTHOR_NAME': 't', 'GIT_AUTHOR_EMAIL': 't@t', 'GIT_COMMITTER_NAME': 't',
+             'GIT_COMMITTER_EMAIL': 't@t'},
+    )
+
+
+def commit(repo, name, text):
+    with open(os.path.join(repo, name), 'w', encoding='utf-8') as f:
+        f.write(text)
+    git(repo, 'add', '-A')
+    git(repo, 'commit', '-q', '-m', name)
+
+
+def test_only_this_branch_and_the_working_tree_count_as_changed(tmp_path, monkeypatch):
+    repo = str(tmp_path)
+    monkeypatch.setattr(git_changes, 'REPO_ROOT', repo)
+    git(repo, 'init', '-q', '-b', 'main')
+    commit(repo, 'base.ts', 'base')
+    git(repo, 'checkout', '-q', '-b', 'feature')
+    commit(repo, 'feature.ts', 'feature')
+    git(repo, 'checkout', '-q', 'main')
+    commit(repo, 'main.ts', 'main')
+    git(repo, 'checkout', '-q', 'feature')
+    with open(os.path.join(repo, 'base.ts'), 'w', encoding='utf-8') as f:
+        f.write('edited')
+    with open(os.path.join(repo, 'new.ts'), 'w', encoding='utf-8') as f:
+        f.write('untracked')
+
+    changed, deleted = changed_since('main', ('.ts',))
+
+    # main.ts 只在 main 上新增，不算本分支的改动（直接 diff main 会把它当成已删除）
+    assert sorted(os.path.basename(path) for path in changed) == ['base.ts', 'feature.ts', 'new.ts']
+    assert deleted == []
@@ -0,0 +1,60 @@
+import os
+import subprocess
+
+from key_history import build_history
+
+LOCALE = "export const en = {\n%s};\n"
+
+
+def git(repo, *args):
+    return subprocess.run(
+        ['git', *args], cwd=repo, capture_output=True, check=True, text=True,
+        env={**os.environ, 'GIT_AUTHOR_NAME': 't', 'GIT_AUTHOR_EMAIL': 't@t', 'GIT_COMMITTER_NAME': 't',
+             'GIT_COMMITTER_EMAIL': 't@t'},
+    ).stdout.strip()
+
+
+def commit(repo, entries, message):
+    path = os.path.join(repo, 'src', 'i18n', 'locales', 'en.ts')
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(LOCALE % ''.join(f"  {key}: '{value}',\n" for key, value in entries.items()))
+    git(repo, 'add', '-A')
+    git(repo, 'commit', '-q', '-m', message)
+    return git(repo, 'rev-parse', 'HEAD')
+
+
+def test_changes_on_two_branches_belong_to_their_own_commits(tmp_path):
+    repo = str(tmp_path)
+    git(repo, 'init', '-q', '-b', 'main')
+    # 两个分支改动的行之间隔开几行，合并时不冲突
+    base = {'a': 'A', 'c': 'C', 'd': 'D', 'e': 'E', 'b': 'B'}
+    commit(repo, base, 'base')
+    git(repo, 'checkout', '-q', '-b', 'feature')
+    feature = commit(repo, {**base, 'b': 'B2'}, 'feature changes b')
+    git(repo, 'checkout', '-q', 'main')
+    main = commit(repo, {**base, 'a': 'A2'}, 'main changes a')
+    git(repo, 'merge', '-q', '--no-edit', 'feature')
+
+    history, commits = build_history('HEAD', repo=repo)
+
+    # 只有三个提交改动了语言文件，合并提交没有自己的 raw 记录
+    assert commits == 3
+    assert history['a']['en'].commit == main
+    assert history['b']['en'].commit == feature
+    assert history['c']['en'].subject == 'base'
+    assert history['c']['en'].action == 'added'
+
+
+def test_max_count_window_does_not_mark_old_keys_as_added(tmp_path):
+    repo = str(tmp_path)
+    git(repo, 'init', '-q', '-b', 'main')
+    commit(repo, {'a': 'A', 'b': 'B'}, 'base')
+    latest = commit(repo, {'a': 'A', 'b': 'B2'}, 'change b')
+
+    history, commits = build_history('HEAD', max_count=1, repo=repo)
+
+    assert commits == 1
+    assert set(history) == {'b'}
+    assert history['b']['en'].commit == latest
+    assert history['b']['en'].action == 'changed'
@@ -0,0 +1,38 @@
+import os
+
+import scan_cache
+from key_index import KeyIndex, load_partials, merge_partials, shard_of, write_partial
+from scan_cache import ScanCache
+
+COMPONENT = """export function Page%d() {
+  const { t } = useLanguage();
+  return <div title={t('common.title')}>{t('page.item%d')}{t('page.shared')}</div>;
+}
+"""
+
+
+def test_merged_shards_equal_a_full_build(tmp_path, monkeypatch):
+    monkeypatch.setattr(scan_cache, 'REPO_ROOT', str(tmp_path))
+    paths = []
+    for number in range(12):
+        path = tmp_path / f'Page{number}.tsx'
+        path.write_text(COMPONENT % (number, number), encoding='utf-8')
+        paths.append(str(path))
+    cache = ScanCache(str(tmp_path / 'scan.pickle'))
+
+    full = KeyIndex()
+    full.update(cache, paths)
+
+    count = 3
+    partials = []
+    for shard in range(1, count + 1):
+        index = KeyIndex()
+        index.update(cache, [path for path in paths if shard_of(os.path.relpath(path, tmp_path), count) == shard])
+        assert index.files
+        partials.append(write_partial(index, shard, count, str(tmp_path / f'part-{shard}.pickle')))
+    merged = merge_partials(load_partials(partials))
+
+    assert merged.files == full.files
+    assert merged.sites == full.sites
+    assert merged.postings == full.postings
+    assert merged.digest() == full.digest()
@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from machine_translate import Backend, HttpBackend, expand, plan_batches, recall, remember, run_batches
+from mt_stub_server import serve
+from translation_memory import TranslationMemory
+
+MISSING = {
+    'de': {'nav.home': 'Home', 'nav.tools': 'Tools', 'footer.home': 'Home', 'tasks.count': '{count} tasks'},
+    'fr': {'nav.home': 'Home', 'nav.tools': 'Tools'},
+}
+
+
+@pytest.fixture
+def stub():
+    # 每秒只放行一个请求，同时发出的批次里至少有一个会收到 429
+    server, url = serve(port=0, max_rps=1)
+    yield server, url
+    server.shutdown()
+
+
+def test_batches_retry_after_429_and_results_go_to_memory(stub, tmp_path):
+    server, url = stub
+    batches = plan_batches(MISSING, batch_size=2)
+    # 相同原文在同一语言里只请求一次
+    assert [(batch.target, batch.texts) for batch in batches] == [
+        ('de', ['Home', 'Tools']), ('de', ['{count} tasks']), ('fr', ['Home', 'Tools']),
+    ]
+
+    results, failed = asyncio.run(run_batches(HttpBackend(url), batches, concurrency=3, rate=100, retries=5))
+
+    state = server.RequestHandlerClass.state
+    assert not failed
+    assert state.requests > len(batches)
+    assert state.texts == 5
+    additions, rejected = expand(MISSING, results)
+    assert not rejected
+    assert additions['de'] == {
+        'nav.home': '[de] Home', 'nav.tools': '[de] Tools', 'footer.home': '[de] Home',
+        'tasks.count': '[de] {count} tasks',
+    }
+
+    with TranslationMemory(str(tmp_path / 'memory.sqlite3')) as memory:
+        remember(memory, MISSING, additions, {})
+        known = recall(memory, MISSING)
+    assert known['de'] == {'Home': '[de] Home', 'Tools': '[de] Tools', '{count} tasks': '[de] {count} tasks'}
+    assert known['fr'] == {'Home': '[fr] Home', 'Tools': '[fr] Tools'}
+
+
+def test_backend_requires_translate():
+    class Incomplete(Backend):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
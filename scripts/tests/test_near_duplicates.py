@@ -0,0 +1,21 @@
+from near_duplicates import FULL_PAIRING_LIMIT, candidate_pairs, find_near_duplicates
+
+
+def test_small_buckets_pair_every_member():
+    signatures = {'a': (1, 9), 'b': (1, 8), 'c': (1, 7)}
+    assert candidate_pairs(signatures, bands=1, rows=1) == {('a', 'b'), ('a', 'c'), ('b', 'c')}
+
+
+def test_large_buckets_pair_only_the_first_member():
+    signatures = {f'k{i:03}': (0,) for i in range(FULL_PAIRING_LIMIT + 1)}
+    pairs = candidate_pairs(signatures, bands=1, rows=1)
+    assert len(pairs) == FULL_PAIRING_LIMIT
+    assert all(left == 'k000' for left, _ in pairs)
+
+
+def test_near_duplicate_keys_are_clustered():
+    flats = {
+        'en': {'a.save': 'Save changes', 'b.save': 'Save changes', 'c.cancel': 'Cancel'},
+        'de': {'a.save': 'Änderungen speichern', 'b.save': 'Änderungen speichern', 'c.cancel': 'Abbrechen'},
+    }
+    assert find_near_duplicates(flats) == [['a.save', 'b.save']]
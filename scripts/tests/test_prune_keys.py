@@ -0,0 +1,52 @@
+import prune_keys
+from locale_parser import parse_locale
+from prune_keys import dead_key_edits, plan, record_pruned
+from translation_sources import load_pruned_keys, skip_pruned
+
+LOCALE = """export const de = {
+  tasks: {
+    reward: 'Prämie',
+    reward: 'Belohnung',
+    other: 'Andere',
+  },
+  legacy: {
+    old: 'Alt',
+  },
+};
+"""
+
+
+def test_shadowed_duplicates_are_counted_apart_from_unused_keys():
+    edits, dead, shadowed = dead_key_edits(parse_locale(LOCALE), {'tasks.reward', 'tasks.other'}, set())
+    assert dead == {'legacy.old'}
+    assert shadowed == 1
+    assert len(edits) == 2
+
+
+def test_dry_run_plan_leaves_locale_files_untouched(tmp_path, monkeypatch):
+    monkeypatch.setattr(prune_keys, 'LANGUAGES', ['de'])
+    monkeypatch.setattr(prune_keys, 'locale_path', lambda lang: str(tmp_path / f'{lang}.ts'))
+    (tmp_path / 'de.ts').write_text(LOCALE, encoding='utf-8')
+
+    changes, report, pruned = plan({'tasks.reward'}, set())
+
+    original, updated = changes[str(tmp_path / 'de.ts')]
+    assert (tmp_path / 'de.ts').read_text(encoding='utf-8') == LOCALE == original
+    assert report == [('de', 2, 1, 3, len(original.encode()) - len(updated.encode()))]
+    assert pruned == {'tasks.other', 'legacy.old'}
+    assert parse_locale(updated).flat() == {'tasks.reward': 'Belohnung'}
+
+
+def test_pruned_keys_are_recorded_and_skipped_until_en_has_them_again(tmp_path):
+    filepath = str(tmp_path / 'pruned-keys.json')
+    changes = {}
+    record_pruned(changes, {'legacy.old'}, filepath)
+    original, updated = changes[filepath]
+    assert original == ''
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(updated)
+    assert load_pruned_keys(filepath) == {'legacy.old'}
+
+    tree = {'old': 'Alt', 'new': 'Neu'}
+    assert skip_pruned(tree, 'legacy', {'legacy.old'}, set()) == {'new': 'Neu'}
+    assert skip_pruned(tree, 'legacy', {'legacy.old'}, {'legacy.old'}) == tree
@@ -0,0 +1,102 @@
+import os
+
+import refactor_keys
+from locale_edits import apply_edits
+from locale_parser import parse_locale
+from refactor_keys import dynamic_edits, locale_edits_for, rollback, write_journal
+from scan_cache import scan_source
+
+LOCALE = """export const de = {
+  tasks: {
+    reward: 'Prämie',
+
+    other: 'Andere',
+
+    reward: 'Belohnung',
+  },
+};
+"""
+
+
+def test_rename_removes_shadowed_duplicates_without_leaving_blank_lines():
+    edits, moved, conflicts = locale_edits_for(parse_locale(LOCALE), {'tasks.reward': 'tasks.rewardLabel'})
+    updated = apply_edits(LOCALE, edits)
+
+    assert (moved, conflicts) == (1, [])
+    assert '\n\n\n' not in updated
+    assert parse_locale(updated).flat() == {'tasks.other': 'Andere', 'tasks.rewardLabel': 'Belohnung'}
+    assert not parse_locale(updated).shadowed
+
+
+def test_round_trip_restores_the_original_file():
+    parsed = parse_locale(LOCALE)
+    forward = apply_edits(LOCALE, locale_edits_for(parsed, {'tasks.other': 'misc.other'})[0])
+    back = apply_edits(forward, locale_edits_for(parse_locale(forward), {'misc.other': 'tasks.other'})[0])
+
+    assert parse_locale(back).flat() == parsed.flat()
+
+
+def test_move_under_an_existing_string_is_a_conflict():
+    edits, moved, conflicts = locale_edits_for(parse_locale(LOCALE), {'tasks.other': 'tasks.reward.other'})
+    assert conflicts == [('tasks.other', 'tasks.reward.other')]
+    assert not edits
+
+
+COMPONENT = """const TABS = [{ id: 'all', labelKey: 'tasksPage.allTasks' }, { id: 'easy', labelKey: 'tasksPage.easy' }];
+interface Task { difficulty: 'easy' | 'hard' }
+export function Tasks({ tasks }) {
+  const { t } = useLanguage();
+  return <div>{TABS.map((tab) => t(tab.labelKey))}{tasks.map((task) => t(`tasksPage.${task.difficulty}`))}</div>;
+}
+"""
+
+
+def rename(mappings):
+    dynamic = scan_source(COMPONENT)['dynamic']
+    edits, warnings = dynamic_edits(COMPONENT, True, dynamic, mappings, {'tasksPage.allTasks', 'tasksPage.easy'})
+    return apply_edits(COMPONENT, edits), warnings
+
+
+def test_literal_keys_are_rewritten_without_warning_about_unrelated_templates():
+    updated, warnings = rename({'tasksPage.allTasks': 'tasksPage.everything'})
+    assert "labelKey: 'tasksPage.everything'" in updated
+    assert warnings == []
+
+
+def test_template_that_still_builds_a_moved_key_is_reported():
+    updated, warnings = rename({'tasksPage.easy': 'tasksPage.beginner'})
+    assert "labelKey: 'tasksPage.beginner'" in updated
+    assert len(warnings) == 1 and "'tasksPage.easy'" in warnings[0]
+
+
+def test_moved_section_rewrites_templates():
+    updated, warnings = rename({'tasksPage': 'tasksView'})
+    assert 't(`tasksView.${task.difficulty}`)' in updated
+    assert 'tasksPage' not in updated
+    assert warnings == []
+
+
+def test_rollback_restores_written_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(refactor_keys, 'REPO_ROOT', str(tmp_path))
+    monkeypatch.setattr(refactor_keys, 'journal_dir', lambda: str(tmp_path))
+    filepath = str(tmp_path / 'de.ts')
+    updated = apply_edits(LOCALE, locale_edits_for(parse_locale(LOCALE), {'tasks.other': 'misc.other'})[0])
+    write_journal({'tasks.other': 'misc.other'}, {filepath: (LOCALE, updated)})
+    refactor_keys.write_file(filepath, updated)
+
+    rollback()
+
+    assert refactor_keys.read_file(filepath) == LOCALE
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.json')]
+
+
+def test_rollback_skips_files_modified_since(tmp_path, monkeypatch):
+    monkeypatch.setattr(refactor_keys, 'REPO_ROOT', str(tmp_path))
+    monkeypatch.setattr(refactor_keys, 'journal_dir', lambda: str(tmp_path))
+    filepath = str(tmp_path / 'de.ts')
+    write_journal({}, {filepath: (LOCALE, 'written')})
+    refactor_keys.write_file(filepath, 'edited by hand')
+
+    rollback()
+
+    assert refactor_keys.read_file(filepath) == 'edited by hand'
@@ -0,0 +1,10 @@
+from translation_store import TranslationStore
+
+
+def test_file_import_drops_removed_keys_and_script_values_do_not_overwrite(tmp_path):
+    with TranslationStore(str(tmp_path / 'store.sqlite3')) as store:
+        store.import_slices({'de': {'tasks.bounty': 'Prämie', 'tasks.old': 'Alt'}}, replace=True)
+        store.import_slices({'de': {'tasks.bounty': 'Prämie'}}, replace=True)
+        store.import_slices({'de': {'tasks.bounty': 'Kopfgeld', 'tasks.new': 'Neu'}}, overwrite=False)
+
+        assert store.export_locale('de') == {'tasks.bounty': 'Prämie', 'tasks.new': 'Neu'}
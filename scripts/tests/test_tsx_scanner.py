@@ -0,0 +1,69 @@
+import pytest
+
+from scan_cache import scan_source
+from tsx_scanner import find_components, has_translator, match_brackets, t_calls, template_parts, tokenize
+
+
+def components(content):
+    tokens = tokenize(content)
+    return tokens, find_components(tokens, match_brackets(tokens))
+
+
+def test_tokens_skip_strings_comments_and_jsx_text():
+    tokens = tokenize("const a = 'x // y'; // t('no')\nconst b = <p>t('no') {t('yes')}</p>;\n")
+    assert [arg.value for _, arg in t_calls(tokens)] == ["'yes'"]
+
+
+def test_template_parts():
+    assert template_parts('`tasksPage.${key}.title`') == [(False, 'tasksPage.'), (True, 'key'), (False, '.title')]
+
+
+@pytest.mark.parametrize('source, name', [
+    ("export function Card() {\n  return <b>{t('a')}</b>;\n}\n", 'Card'),
+    ("const Card = async () => {\n  return t('a');\n};\n", 'Card'),
+    ("const Card = memo(({ a }: P) => {\n  return <b>{t('a')}</b>;\n});\n", 'Card'),
+    ("const Card = React.memo(function Card(p) {\n  return t('a');\n});\n", 'Card'),
+    ("export const Input = React.forwardRef<HTMLInputElement, P>((props, ref) => (\n"
+     "  <input ref={ref} placeholder={t('a')} />\n));\n", 'Input'),
+    ("export const List = <T,>(props: P<T>) => {\n  return <div>{t('a')}</div>;\n};\n", 'List'),
+    ("const Card = memo(forwardRef((props, ref) => {\n  return t('a');\n}));\n", 'Card'),
+])
+def test_find_components_sees_wrapped_and_generic_components(source, name):
+    tokens, found = components(source)
+    assert [component.name for component in found] == [name]
+    assert not has_translator(tokens, found[0])
+
+
+def test_helpers_and_lowercase_functions_are_not_components():
+    _, found = components("const format = (n) => n;\nfunction helper() {}\nconst LIMIT = 3;\n")
+    assert found == []
+
+
+@pytest.mark.parametrize('body', [
+    "const { t } = useLanguage();",
+    "const { t, lang } = useTranslation();",
+    "const { i18n: { t } } = ctx;",
+    "const t = makeTranslator(lang);",
+])
+def test_local_t_declaration_counts_as_translator(body):
+    tokens, found = components(f"function Card() {{\n  {body}\n  return t('a');\n}}\n")
+    assert has_translator(tokens, found[0])
+
+
+def test_t_parameter_counts_as_translator_but_object_shorthand_does_not():
+    tokens, found = components("function Card({ t }) {\n  return t('a');\n}\n")
+    assert has_translator(tokens, found[0])
+    tokens, found = components("function Card() {\n  f({ t });\n  return t('a');\n}\n")
+    assert not has_translator(tokens, found[0])
+
+
+def test_scan_facts_report_stray_calls_and_components_without_t():
+    facts = scan_source(
+        "const title = t('outside');\n"
+        "export function Plain() {\n  return <p />;\n}\n"
+        "export function Uses() {\n  return <p>{t('inside')}</p>;\n}\n"
+    )
+    assert facts['stray_t'] == [1]
+    assert [(c['name'], c['calls_t'], c['needs_hook']) for c in facts['components']] == [
+        ('Plain', False, False), ('Uses', True, True),
+    ]
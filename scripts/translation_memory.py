@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+翻译记忆：(英文原文哈希, 目标语言, 术语表版本) → 译文
+
+持久化在 SQLite，前面加一层进程内 LRU。machine_translate 先查这里，
+只把没命中的原文送去后端，结果再写回；术语表变化后版本号随之改变，旧结果自然失效。
+也可以从现有语言文件导入人工译文（seed）。
+
+用法:
+    python scripts/translation_memory.py seed
+    python scripts/translation_memory.py lookup "Reward" --lang pt
+    python scripts/translation_memory.py stats
+"""
+
+import argparse
+import hashlib
+import sqlite3
+import time
+from collections import OrderedDict
+
+from glossary_check import DO_NOT_TRANSLATE
+from i18n_config import SOURCE_LANG, cache_path
+from locale_parser import load_locales
+from source_fingerprints import FingerprintIndex
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS memory (
+    source_hash TEXT NOT NULL,
+    target TEXT NOT NULL,
+    glossary_version TEXT NOT NULL,
+    source TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    origin TEXT NOT NULL,
+    updated REAL NOT NULL,
+    PRIMARY KEY (source_hash, target, glossary_version)
+) WITHOUT ROWID;
+"""
+
+# SQLite 单条语句的参数个数有上限，批量查询时分块
+LOOKUP_CHUNK = 500
+
+
+def default_db_path():
+    return cache_path('translation_memory.sqlite3')
+
+
+def source_hash(text):
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def glossary_version(terms=DO_NOT_TRANSLATE):
+    return hashlib.blake2b('\n'.join(sorted(terms)).encode('utf-8'), digest_size=8).hexdigest()
+
+
+class TranslationMemory:
+    def __init__(self, db_path=None, capacity=4096, glossary=DO_NOT_TRANSLATE):
+        self.conn = sqlite3.connect(db_path or default_db_path(), timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self.version = glossary_version(glossary)
+        self.capacity = capacity
+        self.lru = OrderedDict()
+        self.hits_lru = 0
+        self.hits_db = 0
+        self.misses = 0
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _remember(self, key, translation):
+        self.lru[key] = translation
+        self.lru.move_to_end(key)
+        if len(self.lru) > self.capacity:
+            self.lru.popitem(last=False)
+
+    def get_many(self, texts, target):
+        """{text: translation} for the texts already in memory"""
+        found = {}
+        pending = {}
+        for text in dict.fromkeys(texts):
+            key = (source_hash(text), target)
+            translation = self.lru.get(key)
+            if translation is not None:
+                self.lru.move_to_end(key)
+                self.hits_lru += 1
+                found[text] = translation
+            else:
+                pending[key[0]] = text
+
+        hashes = list(pending)
+        hits = 0
+        for start in range(0, len(hashes), LOOKUP_CHUNK):
+            chunk = hashes[start:start + LOOKUP_CHUNK]
+            rows = self.conn.execute(
+                f"SELECT source_hash, translation FROM memory WHERE target = ? AND glossary_version = ? "
+                f"AND source_hash IN ({','.join('?' * len(chunk))})",
+                [target, self.version, *chunk],
+            )
+            for digest, translation in rows:
+                hits += 1
+                self._remember((digest, target), translation)
+                found[pending[digest]] = translation
+
+        self.hits_db += hits
+        self.misses += len(pending) - hits
+        return found
+
+    def get(self, text, target):
+        return self.get_many([text], target).get(text)
+
+    def put_many(self, target, pairs, origin='mt'):
+        """Store (source text, translation) pairs for one target language"""
+        now = time.time()
+        rows = []
+        for text, translation in pairs:
+            digest = source_hash(text)
+            self._remember((digest, target), translation)
+            rows.append((digest, target, self.version, text, translation, origin, now))
+        with self.conn:
+            self.conn.executemany('INSERT OR REPLACE INTO memory VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+        return len(rows)
+
+    def entries(self):
+        """Iterate (source, target, translation) for the current glossary version"""
+        return self.conn.execute(
+            "SELECT source, target, translation FROM memory WHERE glossary_version = ?", (self.version,),
+        )
+
+    def seed_from_locales(self, source_lang=SOURCE_LANG):
+        """Import every existing (source value → translated value) pair from the locale files
+
+        Translations made from an older source text (stale fingerprints) are
+        skipped, so they are never recalled as the translation of the new text.
+        """
+        flats = {lang: parsed.flat() for lang, parsed in load_locales().items()}
+        stale = FingerprintIndex.load().stale(flats, source_lang)
+        source = flats.pop(source_lang, {})
+        total = 0
+        for lang, flat in flats.items():
+            outdated = stale.get(lang, {})
+            pairs = [
+                (source[path], value) for path, value in flat.items()
+                if source.get(path) and value and path not in outdated
+            ]
+            total += self.put_many(lang, pairs, origin='locale')
+        return total
+
+    def hit_rate(self):
+        lookups = self.hits_lru + self.hits_db + self.misses
+        return (self.hits_lru + self.hits_db) / lookups if lookups else 0.0
+
+    def report(self):
+        return (f"memory: {self.hits_lru} LRU hits, {self.hits_db} SQLite hits, {self.misses} misses "
+                f"({self.hit_rate():.0%} hit rate)")
+
+    def counts(self):
+        """[(target, origin, entries)] for the current glossary version"""
+        return self.conn.execute(
+            "SELECT target, origin, COUNT(*) FROM memory WHERE glossary_version = ? "
+            "GROUP BY target, origin ORDER BY target, origin",
+            (self.version,),
+        ).fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Persistent translation memory')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('seed', help='import translations from the locale files')
+    lookup = sub.add_parser('lookup', help='look up one source text')
+    lookup.add_argument('text')
+    lookup.add_argument('--lang', required=True)
+    sub.add_parser('stats', help='entries per language and origin')
+    args = parser.parse_args()
+
+    with TranslationMemory() as memory:
+        if args.command == 'seed':
+            print(f"Stored {memory.seed_from_locales()} translations (glossary {memory.version})")
+        elif args.command == 'lookup':
+            translation = memory.get(args.text, args.lang)
+            print(translation if translation is not None else f"Not in memory: {args.text}")
+        else:
+            for target, origin, count in memory.counts():
+                print(f"  {target}: {count} ({origin})")
+
+
+if __name__ == '__main__':
+    main()
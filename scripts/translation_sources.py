@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+翻译源数据加载器 - 一次遍历把各脚本里的翻译字典转置为按语言划分的扁平映射
+
+sync_translations.py 的 TRANSLATIONS 是 section → key → lang，
+add_translations.py / add_new_translations.py 的字典是 section → lang → key。
+这里把两种结构都转成 {lang: {'section.key': value}}，每个语言只拿到自己的那一份。
+
+prune_keys.py 删掉的键记在 PRUNED_KEYS_PATH；英文重新有这个键之前，各脚本跳过它，
+不会把删掉的键从字典里再加回语言文件。
+"""
+
+import json
+
+from i18n_config import PRUNED_KEYS_PATH
+from locale_parser import LocaleParseError, parse_locale
+
+
+def transpose_key_major(translations, slices=None):
+    """Transpose section → key → lang into {lang: {'section.key': value}}"""
+    if slices is None:
+        slices = {}
+
+    for section, keys in translations.items():
+        for key, values in keys.items():
+            path = f'{section}.{key}'
+            for lang, value in values.items():
+                slices.setdefault(lang, {})[path] = value
+
+    return slices
+
+
+def transpose_lang_major(translations, slices=None):
+    """Transpose section → lang → key (values may nest) into {lang: {'section.key': value}}"""
+    if slices is None:
+        slices = {}
+
+    for section, langs in translations.items():
+        for lang, keys in langs.items():
+            flatten_into(slices.setdefault(lang, {}), keys, section)
+
+    return slices
+
+
+def flatten_into(target, tree, prefix):
+    """Flatten a nested dict of strings into dotted key paths"""
+    for key, value in tree.items():
+        path = f'{prefix}.{key}' if prefix else key
+        if isinstance(value, dict):
+            flatten_into(target, value, path)
+        else:
+            target[path] = value
+    return target
+
+
+def group_by_section(entries):
+    """Regroup a flat {'section.key': value} map into {section: {key: value}}"""
+    sections = {}
+    for path, value in entries.items():
+        section, _, key = path.partition('.')
+        sections.setdefault(section, {})[key] = value
+    return sections
+
+
+def load_pruned_keys(filepath=PRUNED_KEYS_PATH):
+    """Set of keys prune_keys.py removed"""
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return set()
+    return set(json.loads(data)) if data.strip() else set()
+
+
+def render_pruned_keys(keys):
+    return json.dumps(sorted(keys), ensure_ascii=False, indent=2) + '\n'
+
+
+def source_keys(filepath):
+    """Flat key paths of the source-language file at filepath (empty if missing or unparsable)"""
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return set(parse_locale(f.read()).flat())
+    except (FileNotFoundError, LocaleParseError):
+        return set()
+
+
+def skip_pruned(tree, prefix, pruned, present):
+    """Copy of a nested {key: value} tree without the pruned keys that present (en) lacks"""
+    kept = {}
+    for key, value in tree.items():
+        path = f'{prefix}.{key}' if prefix else key
+        if isinstance(value, dict):
+            value = skip_pruned(value, path, pruned, present)
+            if value:
+                kept[key] = value
+        elif path not in pruned or path in present:
+            kept[key] = value
+    return kept
+
+
+def load_language_slices():
+    """Load every script's translation data into one language-major view"""
+    # 延迟导入：这三个脚本在顶层 from translation_sources import 过滤已删除键的函数，
+    # 本模块顶层导入它们会形成循环导入；而且它们的字典很大，只有需要时才加载
+    import sync_translations
+    import add_translations
+    import add_new_translations
+
+    slices = transpose_key_major(sync_translations.TRANSLATIONS)
+    transpose_lang_major(add_translations.TRANSLATIONS, slices)
+    transpose_lang_major(add_new_translations.NEW_TRANSLATIONS, slices)
+    return slices
+
+
+def main():
+    slices = load_language_slices()
+    for lang in sorted(slices):
+        print(f"{lang}: {len(slices[lang])} keys")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+可选的 SQLite 翻译存储（WAL 模式）
+
+表结构：keys(键路径)、locales(语言)、translations(键 × 语言 → 值)。
+支持从脚本里的 TRANSLATIONS / NEW_TRANSLATIONS 字典和 .ts 语言文件批量导入，
+以及批量导出回 TS / JSON，多个工具可以同时查询和更新，而不必整文件重写。
+
+语言文件是准绳：导入文件时该语言里文件已没有的键会被删除；
+脚本字典只补充缺少的值，不覆盖已有翻译。import all 先导入文件再导入脚本。
+
+用法:
+    python scripts/translation_store.py import all
+    python scripts/translation_store.py export --format json
+    python scripts/translation_store.py get de tasks.bounty
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+
+from i18n_config import CACHE_DIR, LANGUAGES, cache_path
+from locale_parser import load_locales, render_locale
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS keys (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS locales (
+    id INTEGER PRIMARY KEY,
+    code TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS translations (
+    key_id INTEGER NOT NULL REFERENCES keys(id),
+    locale_id INTEGER NOT NULL REFERENCES locales(id),
+    value TEXT NOT NULL,
+    PRIMARY KEY (key_id, locale_id)
+) WITHOUT ROWID;
+"""
+
+
+def default_db_path():
+    return cache_path('translations.sqlite3')
+
+
+class TranslationStore:
+    def __init__(self, db_path=None):
+        self.conn = sqlite3.connect(db_path or default_db_path(), timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA foreign_keys=ON')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def import_slices(self, slices, overwrite=True, replace=False):
+        """Bulk upsert a {lang: {path: value}} map; returns the number of values written
+
+        overwrite=False only inserts values that are missing; replace=True also deletes
+        the keys of each imported language that are not in its map.
+        """
+        paths = dict.fromkeys(path for entries in slices.values() for path in entries)
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO keys(path) VALUES (?)', ((path,) for path in paths)
+            )
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO locales(code) VALUES (?)', ((lang,) for lang in slices)
+            )
+            key_ids = dict(self.conn.execute('SELECT path, id FROM keys'))
+            locale_ids = dict(self.conn.execute('SELECT code, id FROM locales'))
+            rows = [
+                (key_ids[path], locale_ids[lang], value)
+                for lang, entries in slices.items()
+                for path, value in entries.items()
+            ]
+            conflict = 'DO UPDATE SET value = excluded.value' if overwrite else 'DO NOTHING'
+            before = self.conn.total_changes
+            self.conn.executemany(
+                'INSERT INTO translations(key_id, locale_id, value) VALUES (?, ?, ?) '
+                f'ON CONFLICT(key_id, locale_id) {conflict}',
+                rows,
+            )
+            written = self.conn.total_changes - before
+            if replace:
+                for lang, entries in slices.items():
+                    kept = {key_ids[path] for path in entries}
+                    stale = [
+                        (key_id, locale_ids[lang])
+                        for (key_id,) in self.conn.execute(
+                            'SELECT key_id FROM translations WHERE locale_id = ?', (locale_ids[lang],)
+                        )
+                        if key_id not in kept
+                    ]
+                    self.conn.executemany('DELETE FROM translations WHERE key_id = ? AND locale_id = ?', stale)
+                self.conn.execute('DELETE FROM keys WHERE id NOT IN (SELECT key_id FROM translations)')
+        return written
+
+    def import_sources(self):
+        """Add the dict literals from sync_translations / add_translations / add_new_translations
+
+        Values already in the store win: the dicts are pending additions, not the current text.
+        """
+        from translation_sources import load_language_slices
+        return self.import_slices(load_language_slices(), overwrite=False)
+
+    def import_locale_files(self, languages=LANGUAGES):
+        """Import the .ts locale files, dropping keys the files no longer have"""
+        locales = load_locales(languages)
+        return self.import_slices({lang: parsed.flat() for lang, parsed in locales.items()}, replace=True)
+
+    def set(self, path, lang, value):
+        self.import_slices({lang: {path: value}})
+
+    def get(self, path, lang):
+        row = self.conn.execute(
+            'SELECT t.value FROM translations t '
+            'JOIN keys k ON k.id = t.key_id JOIN locales l ON l.id = t.locale_id '
+            'WHERE k.path = ? AND l.code = ?',
+            (path, lang),
+        ).fetchone()
+        return row[0] if row else None
+
+    def languages(self):
+        return [code for (code,) in self.conn.execute('SELECT code FROM locales ORDER BY id')]
+
+    def export_locale(self, lang):
+        """{path: value} for one language, in key insertion order"""
+        return dict(self.conn.execute(
+            'SELECT k.path, t.value FROM translations t '
+            'JOIN keys k ON k.id = t.key_id JOIN locales l ON l.id = t.locale_id '
+            'WHERE l.code = ? ORDER BY k.id',
+            (lang,),
+        ))
+
+    def export_files(self, out_dir, fmt='ts'):
+        """Write every language to out_dir as <lang>.ts or <lang>.json"""
+        os.makedirs(out_dir, exist_ok=True)
+        written = []
+        for lang in self.languages():
+            flat = self.export_locale(lang)
+            filepath = os.path.join(out_dir, f'{lang}.{fmt}')
+            with open(filepath, 'w', encoding='utf-8') as f:
+                if fmt == 'json':
+                    json.dump(flat, f, ensure_ascii=False, indent=2)
+                    f.write('\n')
+                else:
+                    f.write(render_locale(lang, flat))
+            written.append(filepath)
+        return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SQLite translation store')
+    parser.add_argument('--db', help='database path (default: .i18n-cache/translations.sqlite3)')
+    sub = parser.add_subparsers(dest='command', required=True)
+    imp = sub.add_parser('import', help='bulk import translations')
+    imp.add_argument('source', choices=['files', 'scripts', 'all'])
+    exp = sub.add_parser('export', help='bulk export every language')
+    exp.add_argument('--format', choices=['ts', 'json'], default='ts')
+    exp.add_argument('--out', default=None, help='output directory (default: .i18n-cache/export)')
+    get = sub.add_parser('get', help='look up one value')
+    get.add_argument('lang')
+    get.add_argument('path')
+    args = parser.parse_args()
+
+    with TranslationStore(args.db) as store:
+        if args.command == 'import':
+            count = 0
+            if args.source in ('files', 'all'):
+                count += store.import_locale_files()
+            if args.source in ('scripts', 'all'):
+                count += store.import_sources()
+            print(f"Imported {count} values")
+        elif args.command == 'export':
+            out_dir = args.out or os.path.join(CACHE_DIR, 'export')
+            for filepath in store.export_files(out_dir, args.format):
+                print(f"Exported: {filepath}")
+        else:
+            value = store.get(args.path, args.lang)
+            print(value if value is not None else f"Missing: {args.path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,576 @@
+#!/usr/bin/env python3
+"""
+轻量的 .ts/.tsx 词法扫描器
+
+不做完整解析，只在一次线性扫描中区分 JS 代码、字符串、模板字符串、注释和 JSX，
+足够用来找 JSX 文本、字符串属性、t('…') 调用和组件函数体。
+"""
+
+import bisect
+import re
+
+IDENT_START = re.compile(r'[A-Za-z_$]')
+IDENT = re.compile(r'[\w$]+')
+JSX_NAME = re.compile(r'[\w$.:\-]*')
+NUMBER = re.compile(r'\d[\w.]*')
+GENERIC_PARAMS = re.compile(r'[\w$]+\s*(?:,|extends\s)')
+
+# 这些记号之后出现的 '<' 视为 JSX 开始，'/' 视为正则字面量
+EXPRESSION_PUNCT = frozenset('(,=:?[{};!&|+-*%~^') | {'=>'}
+EXPRESSION_KEYWORDS = frozenset(['return', 'yield', 'default', 'case', 'typeof', 'void', 'in', 'of', 'else', 'await'])
+
+OPENERS = {'(': ')', '[': ']', '{': '}'}
+
+
+class Token:
+    """kind is one of: name, number, punct, string, template, regex,
+    jsx_open (value = tag name), jsx_close, jsx_attr (value = attribute name),
+    jsx_text (value = stripped text)"""
+
+    __slots__ = ('kind', 'value', 'start', 'end')
+
+    def __init__(self, kind, value, start, end):
+        self.kind = kind
+        self.value = value
+        self.start = start
+        self.end = end
+
+    def __repr__(self):
+        return f"Token({self.kind}, {self.value!r}, {self.start})"
+
+
+class TsxScanError(ValueError):
+    pass
+
+
+def skip_string(content, pos):
+    """pos is at a quote; return the index after the closing quote"""
+    quote = content[pos]
+    pos += 1
+    length = len(content)
+    while pos < length:
+        char = content[pos]
+        if char == '\\':
+            pos += 2
+        elif char == quote or char == '\n':
+            return pos + 1
+        else:
+            pos += 1
+    return length
+
+
+def skip_regex(content, pos):
+    """pos is at '/'; return the index after the regex literal and its flags"""
+    pos += 1
+    in_class = False
+    length = len(content)
+    while pos < length:
+        char = content[pos]
+        if char == '\\':
+            pos += 2
+            continue
+        if char == '\n':
+            return pos
+        if char == '[':
+            in_class = True
+        elif char == ']':
+            in_class = False
+        elif char == '/' and not in_class:
+            pos += 1
+            match = IDENT.match(content, pos)
+            return match.end() if match else pos
+        pos += 1
+    return length
+
+
+def scan_template(content, pos, end=None, jsx=True):
+    """pos is at a backtick; scan to the closing backtick
+
+    Returns (end position, [(start, end) of each ${…} body], tokens of those bodies).
+    """
+    if end is None:
+        end = len(content)
+    spans = []
+    tokens = []
+    pos += 1
+    while pos < end:
+        char = content[pos]
+        if char == '\\':
+            pos += 2
+        elif char == '`':
+            return pos + 1, spans, tokens
+        elif content.startswith('${', pos):
+            # 表达式里可能有字符串、正则、嵌套模板，交给词法器处理到匹配的 '}'
+            lexer = _Lexer(content, pos + 2, end, jsx, container=True)
+            inner = lexer.run()
+            close = lexer.pos
+            if inner and inner[-1].kind == 'punct' and inner[-1].value == '}' and inner[-1].end == close:
+                inner.pop()
+            spans.append((pos + 2, close - 1))
+            tokens.extend(inner)
+            pos = close
+        else:
+            pos += 1
+    return end, spans, tokens
+
+
+def template_parts(raw):
+    """Split a template literal (backticks included) into static text and ${…} sources
+
+    Returns a list of (is_expression, text).
+    """
+    _, spans, _ = scan_template(raw, 0, len(raw), jsx=False)
+    parts = []
+    pos = 1
+    for start, end in spans:
+        if start - 2 > pos:
+            parts.append((False, raw[pos:start - 2]))
+        parts.append((True, raw[start:end].strip()))
+        pos = end + 1
+    tail_end = len(raw) - 1 if raw.endswith('`') and len(raw) > 1 else len(raw)
+    if pos < tail_end:
+        parts.append((False, raw[pos:tail_end]))
+    return parts
+
+
+def string_value(raw):
+    """Value of a quoted string token (simple escapes only)"""
+    body = raw[1:-1]
+    if '\\' not in body:
+        return body
+    return re.sub(r'\\(.)', lambda m: {'n': '\n', 't': '\t'}.get(m.group(1), m.group(1)), body)
+
+
+class _Lexer:
+    def __init__(self, content, start, end, jsx=True, container=False):
+        self.content = content
+        self.jsx = jsx
+        self.pos = start
+        self.end = end
+        self.tokens = []
+        # 每一帧: ['js', 花括号深度, 是否以 '}' 结束] / ['tag'] / ['children']
+        # container=True 时词法器在匹配的 '}' 处停止（用于模板里的 ${…}）
+        self.stack = [['js', 0, container]]
+
+    def emit(self, kind, value, start, end):
+        self.tokens.append(Token(kind, value, start, end))
+
+    def prev(self):
+        return self.tokens[-1] if self.tokens else None
+
+    def expression_expected(self):
+        prev = self.prev()
+        if prev is None:
+            return True
+        if prev.kind == 'punct':
+            return prev.value in EXPRESSION_PUNCT
+        if prev.kind == 'name':
+            return prev.value in EXPRESSION_KEYWORDS
+        return prev.kind in ('jsx_attr',)
+
+    def run(self):
+        while self.pos < self.end and self.stack:
+            mode = self.stack[-1][0]
+            if mode == 'js':
+                self.js()
+            elif mode == 'tag':
+                self.tag()
+            else:
+                self.children()
+        return self.tokens
+
+    def skip_space_and_comments(self):
+        content = self.content
+        while self.pos < self.end:
+            char = content[self.pos]
+            if char in ' \t\r\n':
+                self.pos += 1
+            elif content.startswith('//', self.pos):
+                newline = content.find('\n', self.pos)
+                self.pos = self.end if newline == -1 else newline + 1
+            elif content.startswith('/*', self.pos):
+                close = content.find('*/', self.pos + 2)
+                self.pos = self.end if close == -1 else close + 2
+            else:
+                return
+
+    def js(self):
+        self.skip_space_and_comments()
+        if self.pos >= self.end:
+            return
+        content = self.content
+        start = self.pos
+        char = content[start]
+        frame = self.stack[-1]
+
+        if char in '\'"':
+            self.pos = skip_string(content, start)
+            self.emit('string', content[start:self.pos], start, self.pos)
+        elif char == '`':
+            self.pos, _, inner = scan_template(content, start, self.end, self.jsx)
+            self.emit('template', content[start:self.pos], start, self.pos)
+            # 模板里 ${…} 的记号也要保留，否则其中的 t() 调用会被漏掉
+            self.tokens.extend(inner)
+        elif IDENT_START.match(char):
+            match = IDENT.match(content, start)
+            self.pos = match.end()
+            self.emit('name', match.group(), start, self.pos)
+        elif char.isdigit():
+            match = NUMBER.match(content, start)
+            self.pos = match.end()
+            self.emit('number', match.group(), start, self.pos)
+        elif char == '<' and self.jsx and self.expression_expected() and self.jsx_starts(start + 1):
+            self.open_tag(start)
+        elif char == '/' and self.expression_expected():
+            self.pos = skip_regex(content, start)
+            self.emit('regex', content[start:self.pos], start, self.pos)
+        elif content.startswith('=>', start):
+            self.pos = start + 2
+            self.emit('punct', '=>', start, self.pos)
+        else:
+            self.pos = start + 1
+            if char == '{':
+                frame[1] += 1
+            elif char == '}':
+                if frame[1] == 0 and frame[2]:
+                    self.stack.pop()
+                else:
+                    frame[1] -= 1
+            self.emit('punct', char, start, self.pos)
+
+    def jsx_starts(self, pos):
+        if pos >= self.end:
+            return False
+        char = self.content[pos]
+        if char == '>':
+            return True
+        if not char.isalpha():
+            return False
+        # <T,>(…) 和 <K extends …>(…) 是泛型箭头函数，不是 JSX
+        match = GENERIC_PARAMS.match(self.content, pos)
+        return match is None
+
+    def open_tag(self, start):
+        match = JSX_NAME.match(self.content, start + 1)
+        self.pos = match.end()
+        self.emit('jsx_open', match.group(), start, self.pos)
+        self.stack.append(['tag'])
+
+    def tag(self):
+        self.skip_space_and_comments()
+        if self.pos >= self.end:
+            return
+        content = self.content
+        start = self.pos
+        char = content[start]
+
+        if content.startswith('/>', start):
+            self.pos = start + 2
+            self.stack.pop()
+            self.emit('jsx_close', '', start, self.pos)
+        elif char == '>':
+            self.pos = start + 1
+            self.stack[-1] = ['children']
+        elif char == '{':
+            self.pos = start + 1
+            self.emit('punct', '{', start, self.pos)
+            self.stack.append(['js', 0, True])
+        elif char in '\'"':
+            self.pos = skip_string(content, start)
+            self.emit('string', content[start:self.pos], start, self.pos)
+        elif char == '=':
+            self.pos = start + 1
+        else:
+            match = JSX_NAME.match(content, start)
+            if match.end() == start:
+                raise TsxScanError(f"unexpected {char!r} in JSX tag at offset {start}")
+            self.pos = match.end()
+            self.emit('jsx_attr', match.group(), start, self.pos)
+
+    def children(self):
+        content = self.content
+        start = self.pos
+        char = content[start]
+
+        if char == '{':
+            self.pos = start + 1
+            self.emit('punct', '{', start, self.pos)
+            self.stack.append(['js', 0, True])
+        elif content.startswith('</', start):
+            close = content.find('>', start)
+            self.pos = self.end if close == -1 else close + 1
+            self.stack.pop()
+            self.emit('jsx_close', content[start + 2:self.pos - 1].strip(), start, self.pos)
+        elif char == '<':
+            self.open_tag(start)
+        else:
+            pos = start
+            while pos < self.end and content[pos] not in '<{':
+                pos += 1
+            self.pos = pos
+            text = content[start:pos]
+            stripped = text.strip()
+            if stripped:
+                offset = start + len(text) - len(text.lstrip())
+                self.emit('jsx_text', ' '.join(stripped.split()), offset, offset + len(stripped))
+
+
+def tokenize(content, jsx=True):
+    """Tokenize a .ts/.tsx source into a flat list of Tokens (pass jsx=False for .ts)"""
+    return _Lexer(content, 0, len(content), jsx).run()
+
+
+def match_brackets(tokens):
+    """Map the index of every opening bracket token to the index of its closer"""
+    matches = {}
+    stack = []
+    for index, token in enumerate(tokens):
+        if token.kind != 'punct':
+            continue
+        if token.value in OPENERS:
+            stack.append(index)
+        elif token.value in ')]}' and stack:
+            matches[stack.pop()] = index
+    return matches
+
+
+class LineIndex:
+    """Offset → (line, column), both 1-based"""
+
+    def __init__(self, content):
+        self.starts = [0]
+        pos = content.find('\n')
+        while pos != -1:
+            self.starts.append(pos + 1)
+            pos = content.find('\n', pos + 1)
+
+    def line_col(self, offset):
+        line = bisect.bisect_right(self.starts, offset)
+        return line, offset - self.starts[line - 1] + 1
+
+
+class Component:
+    """A top-level function whose name is capitalized
+
+    start/end are token indices of the whole declaration and body_start the
+    first token of the body. body_open/body_close are the body braces, or
+    None for expression-bodied arrows.
+    """
+
+    __slots__ = ('name', 'exported', 'start', 'end', 'body_start', 'body_open', 'body_close')
+
+    def __init__(self, name, exported, start, end, body_start, body_open=None, body_close=None):
+        self.name = name
+        self.exported = exported
+        self.start = start
+        self.end = end
+        self.body_start = body_start
+        self.body_open = body_open
+        self.body_close = body_close
+
+    def __repr__(self):
+        return f"Component({self.name!r}, exported={self.exported})"
+
+
+def _skip_to(tokens, index, values, matches):
+    """Advance from index to the first punct in values at bracket depth 0"""
+    while index < len(tokens):
+        token = tokens[index]
+        if token.kind == 'punct':
+            if token.value in values:
+                return index
+            if token.value in OPENERS:
+                index = matches.get(index, index)
+        index += 1
+    return None
+
+
+WRAPPERS = ('memo', 'forwardRef')
+
+
+def _skip_generic(tokens, index):
+    """Index after the type parameter list `<...>` opening at index, or None"""
+    depth = 0
+    while index < len(tokens):
+        if tokens[index].value == '<':
+            depth += 1
+        elif tokens[index].value == '>':
+            depth -= 1
+            if depth == 0:
+                return index + 1
+        index += 1
+    return None
+
+
+def _function_body(tokens, index, matches):
+    """Body token index of the function value starting at index, or None
+
+    Looks through memo(...) / forwardRef(...) (also React.memo, forwardRef<R, P>)
+    and generic arrows such as <T,>(props) => ...
+    """
+    while index is not None and index + 1 < len(tokens):
+        if tokens[index].value == 'React' and tokens[index + 1].value == '.':
+            index += 2
+        if tokens[index].kind != 'name' or tokens[index].value not in WRAPPERS:
+            break
+        index += 1
+        if index < len(tokens) and tokens[index].value == '<':
+            index = _skip_generic(tokens, index)
+        if index is None or index >= len(tokens) or tokens[index].value != '(':
+            return None
+        index += 1
+    if index is None or index >= len(tokens):
+        return None
+
+    if tokens[index].value == 'async':
+        index += 1
+    if index < len(tokens) and tokens[index].value == 'function':
+        paren = _skip_to(tokens, index + 1, ('(',), matches)
+        return _skip_to(tokens, matches.get(paren, paren) + 1, ('{',), matches) if paren is not None else None
+    if index < len(tokens) and tokens[index].value == '<':
+        index = _skip_generic(tokens, index)
+    if index is None or index >= len(tokens) or tokens[index].value != '(' or index not in matches:
+        return None
+    arrow = _skip_to(tokens, matches[index] + 1, ('=>', '{', ';'), matches)
+    if arrow is None or tokens[arrow].value != '=>' or arrow + 1 >= len(tokens):
+        return None
+    return arrow + 1
+
+
+def find_components(tokens, matches=None):
+    """Find top-level function declarations and arrow functions bound to capitalized names
+
+    Arrow and function values wrapped in memo() / forwardRef() and generic
+    arrows count as well.
+    """
+    if matches is None:
+        matches = match_brackets(tokens)
+
+    exported_names = set()
+    for index, token in enumerate(tokens[:-2]):
+        if token.kind == 'name' and token.value == 'export' and tokens[index + 1].value == 'default' \
+                and tokens[index + 2].kind == 'name':
+            exported_names.add(tokens[index + 2].value)
+
+    components = []
+    depth = 0
+    index = 0
+    while index < len(tokens):
+        token = tokens[index]
+        if token.kind == 'punct':
+            if token.value == '{':
+                depth += 1
+            elif token.value == '}':
+                depth -= 1
+            index += 1
+            continue
+        if depth != 0 or token.kind != 'name' or token.value not in ('function', 'const', 'let'):
+            index += 1
+            continue
+
+        start = index
+        while start > 0 and tokens[start - 1].kind == 'name' and tokens[start - 1].value in ('export', 'default', 'async'):
+            start -= 1
+        exported = tokens[start].value == 'export'
+
+        name_index = index + 1
+        if name_index >= len(tokens) or tokens[name_index].kind != 'name' or not tokens[name_index].value[:1].isupper():
+            index += 1
+            continue
+        name = tokens[name_index].value
+
+        if token.value == 'function':
+            paren = _skip_to(tokens, name_index + 1, ('(',), matches)
+            body = _skip_to(tokens, matches.get(paren, paren) + 1, ('{',), matches) if paren is not None else None
+        else:
+            assign = _skip_to(tokens, name_index + 1, ('=', ';'), matches)
+            if assign is None or tokens[assign].value != '=':
+                index += 1
+                continue
+            body = _function_body(tokens, assign + 1, matches)
+            if body is None:
+                index += 1
+                continue
+            if tokens[body].value != '{':
+                # 表达式体的箭头函数：记录到语句结束
+                end = _skip_to(tokens, body, (';',), matches)
+                end = len(tokens) - 1 if end is None else end - 1
+                components.append(Component(name, exported or name in exported_names, start, end, body))
+                index = end + 1
+                continue
+
+        if body is None or body not in matches:
+            index += 1
+            continue
+        components.append(Component(name, exported or name in exported_names, start, matches[body], body, body, matches[body]))
+        index = matches[body] + 1
+
+    return components
+
+
+def calls_t(tokens, start, end):
+    """True if tokens[start:end] contain a bare t( call"""
+    for index in range(start, end):
+        token = tokens[index]
+        if token.kind == 'name' and token.value == 't' and tokens[index + 1].value == '(' \
+                and not (index > 0 and tokens[index - 1].value in ('.', 'function')):
+            return True
+    return False
+
+
+DECLARATIONS = ('const', 'let', 'var')
+
+
+def _declares(tokens, index):
+    """True if the name at index is declared there: `const t`, or inside `const { t } =` / `const [t] =`"""
+    previous = tokens[index - 1].value if index > 0 else None
+    if previous in DECLARATIONS:
+        return True
+    if previous not in ('{', '[', ',', ':'):
+        return False
+    # 向外逐层找包住它的 { / [（嵌套解构时跨过 `key: {`），看最外层前面是不是 const / let / var
+    depth = 0
+    for back in range(index - 1, 0, -1):
+        value = tokens[back].value if tokens[back].kind == 'punct' else None
+        if value in ('}', ']', ')'):
+            depth += 1
+        elif value in ('{', '[', '('):
+            if depth:
+                depth -= 1
+                continue
+            before = tokens[back - 1].value
+            if value == '(' or before not in DECLARATIONS + ('{', '[', ',', ':'):
+                return False
+            if before in DECLARATIONS:
+                return True
+    return False
+
+
+def has_translator(tokens, component):
+    """True if the component already gets t from useLanguage, its parameters or a local declaration"""
+    for index in range(component.start, component.end + 1):
+        token = tokens[index]
+        if token.kind != 'name':
+            continue
+        if token.value == 'useLanguage':
+            return True
+        if token.value == 't' and (index < component.body_start or _declares(tokens, index)):
+            return True
+    return False
+
+
+def t_calls(tokens):
+    """Yield (token index of the t, first argument token) for every bare t( call"""
+    for index in range(len(tokens) - 2):
+        token = tokens[index]
+        if token.kind == 'name' and token.value == 't' and tokens[index + 1].value == '(' \
+                and not (index > 0 and tokens[index - 1].value in ('.', 'function')):
+            yield index, tokens[index + 2]
+
+
+def component_at(components, token_index):
+    """The component whose token range contains token_index, or None"""
+    for component in components:
+        if component.start <= token_index <= component.end:
+            return component
+    return None
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+检查所有语言的占位符（如 {level}、{xp}、{count}）是否与英文一致
+"""
+
+import re
+import sys
+
+from i18n_config import LANGUAGES, LOCALES_DIR, SOURCE_LANG
+from locale_parser import load_locales
+
+PLACEHOLDER = re.compile(r'\{(\w+)\}')
+
+
+class PlaceholderIssue:
+    __slots__ = ('lang', 'path', 'missing', 'extra')
+
+    def __init__(self, lang, path, missing, extra):
+        self.lang = lang
+        self.path = path
+        self.missing = missing
+        self.extra = extra
+
+    def __str__(self):
+        parts = []
+        if self.missing:
+            parts.append('missing ' + ', '.join(f'{{{name}}}' for name in sorted(self.missing)))
+        if self.extra:
+            parts.append('unexpected ' + ', '.join(f'{{{name}}}' for name in sorted(self.extra)))
+        return f"{self.lang}: {self.path}: {'; '.join(parts)}"
+
+
+def placeholders(value):
+    return frozenset(PLACEHOLDER.findall(value))
+
+
+def check_placeholders(flats, source_lang=SOURCE_LANG):
+    """Compare every locale's placeholders with source_lang's
+
+    flats is {lang: {path: value}}. Keys missing from a locale are not
+    reported here, only values whose placeholder set differs.
+    """
+    source = flats.get(source_lang, {})
+    others = [(lang, flat) for lang, flat in flats.items() if lang != source_lang]
+    issues = []
+
+    for path, value in source.items():
+        expected = placeholders(value)
+        for lang, flat in others:
+            translated = flat.get(path)
+            if translated is None:
+                continue
+            found = placeholders(translated)
+            if found != expected:
+                issues.append(PlaceholderIssue(lang, path, expected - found, found - expected))
+
+    return issues
+
+
+def validate_locale_dir(base_path=LOCALES_DIR, languages=LANGUAGES):
+    locales = load_locales(languages, base_path)
+    return check_placeholders({lang: parsed.flat() for lang, parsed in locales.items()})
+
+
+def report(issues):
+    for issue in issues:
+        print(f"Placeholder mismatch: {issue}")
+    if not issues:
+        print("Placeholders consistent across all locales")
+
+
+def main():
+    base_path = sys.argv[1] if len(sys.argv) > 1 else LOCALES_DIR
+    issues = validate_locale_dir(base_path)
+    report(issues)
+    sys.exit(1 if issues else 0)
+
+
+if __name__ == '__main__':
+    main()